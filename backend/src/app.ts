@@ -1,13 +1,12 @@
 import express from 'express';
 import cors from 'cors';
 import helmet from 'helmet';
-import morgan from 'morgan';
 import { errorHandler } from './middleware/errorHandler';
 import { authenticate } from './middleware/auth';
 import { sessionMiddleware } from './middleware/session';
 import { dataIsolationMiddleware } from './middleware/dataIsolation';
 import { bedrockRateLimitMiddleware } from './middleware/bedrockRateLimit';
-import { logger } from './utils/logger';
+import { requestLogMiddleware } from './middleware/requestLog';
 import './db/connection'; // Initialize database connection
 
 // Import routes
@@ -26,7 +25,7 @@ app.use(cors({
 }));
 
 // Logging middleware
-app.use(morgan('combined', { stream: { write: message => logger.info(message.trim()) } }));
+app.use(requestLogMiddleware);
 
 // Body parsing middleware
 app.use(express.json());
@@ -0,0 +1,21 @@
+import { Request, Response, NextFunction } from 'express';
+import { logger } from '../utils/logger';
+
+// One structured line per request; the CloudWatch metric filters read route, method, status and latency_ms
+export const requestLogMiddleware = (req: Request, res: Response, next: NextFunction) => {
+  const start = process.hrtime.bigint();
+
+  res.on('finish', () => {
+    // The route template rather than the raw path, so ids do not turn into metric dimensions
+    const route = req.route ? `${req.baseUrl}${req.route.path}` : 'unmatched';
+
+    logger.info('request', {
+      route,
+      method: req.method,
+      status: res.statusCode,
+      latency_ms: Number(process.hrtime.bigint() - start) / 1e6,
+    });
+  });
+
+  next();
+};
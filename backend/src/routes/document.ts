@@ -24,25 +24,6 @@ router.post('/', authenticate, async (req, res, next) => {
   }
 });
 
-// Get document by ID
-router.get('/:id', async (req, res, next) => {
-  try {
-    const document = await DocumentModel.findById(req.params.id);
-    if (!document) {
-      throw new AppError(404, 'Document not found');
-    }
-
-    // Check if document is public or user is the owner
-    if (!document.is_public && (!req.user || document.user_id !== req.user.id)) {
-      throw new AppError(403, 'Access denied');
-    }
-
-    res.json(document);
-  } catch (error) {
-    next(error);
-  }
-});
-
 // Update document
 router.put('/:id', authenticate, async (req, res, next) => {
   try {
@@ -145,4 +126,23 @@ router.get('/search', async (req, res, next) => {
   }
 });
 
+// Get document by ID; registered after the fixed paths above so they are not taken as an id
+router.get('/:id', async (req, res, next) => {
+  try {
+    const document = await DocumentModel.findById(req.params.id);
+    if (!document) {
+      throw new AppError(404, 'Document not found');
+    }
+
+    // Check if document is public or user is the owner
+    if (!document.is_public && (!req.user || document.user_id !== req.user.id)) {
+      throw new AppError(403, 'Access denied');
+    }
+
+    res.json(document);
+  } catch (error) {
+    next(error);
+  }
+});
+
 export default router; 
\ No newline at end of file
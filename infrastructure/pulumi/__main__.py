@@ -5,7 +5,16 @@ from modules.vpc import Vpc
 from modules.security import Security
 from modules.eks import Eks
 from modules.rds import Rds
+from modules.cache import Cache
+from modules.cdn import Cdn
+from modules.dns import Dns
+from modules.log_metrics import LogMetrics
+from modules.queues import Queues
+from modules.storage import Storage
+from modules.tables import Tables
 from modules.monitoring import Monitoring
+from modules.capacity import plan_capacity, sizing_report
+from modules.perf import Perf
 
 # Configuration
 config = pulumi.Config()
@@ -17,70 +26,409 @@ db_name = config.require("dbName")
 db_username = config.require("dbUsername")
 db_password = config.require_secret("dbPassword")
 alert_email = config.require("alertEmail")
+# "perf" builds a short-lived, production-sized copy of the environment with in-cluster load generators
+stack_mode = config.get("stackMode") or "standard"
+perf_mode = stack_mode == "perf"
+# A perf copy shares the account and region with the environment it copies, so it gets its own
+# environment name and with it its own physical names
+if perf_mode and not environment.endswith("-perf"):
+    environment = f"{environment}-perf"
+
+# Capacity plan from the declared load targets; explicit stack config wins over the plan,
+# which wins over the built-in defaults
+load_targets = config.get_object("loadTargets")
+capacity_plan = plan_capacity(load_targets, "prod" if perf_mode else environment) if load_targets else None
+
+
+def sized(value, key, default=None):
+    if value is not None:
+        return value
+    return capacity_plan[key] if capacity_plan else default
+
+
+az_count = sized(config.get_int("azCount"), "az_count", 2)
+public_subnet_prefix = config.get_int("publicSubnetPrefix") or 24
+private_subnet_prefix = config.get_int("privateSubnetPrefix") or 19
+availability_zones = config.get_object("availabilityZones")
+subnet_cidrs = config.get_object("subnetCidrs")
+single_nat_gateway = sized(config.get_bool("singleNatGateway"), "single_nat_gateway", False)
+vpc_endpoints_enabled = config.get_bool("vpcEndpointsEnabled") or False
+vpc_interface_endpoint_services = config.get_object("vpcInterfaceEndpointServices")
+eks_node_pools = sized(config.get_object("eksNodePools"), "eks_node_pools")
+eks_karpenter_enabled = config.get_bool("eksKarpenterEnabled") or False
+eks_karpenter_version = config.get("eksKarpenterVersion") or "1.0.6"
+eks_karpenter_cpu_limit = config.get_int("eksKarpenterCpuLimit") or 200
+eks_container_insights_enabled = config.get_bool("eksContainerInsightsEnabled")
+db_engine_mode = config.get("dbEngineMode") or "instance"
+db_instance_class = sized(config.get("dbInstanceClass"), "db_instance_class", "db.t3.medium")
+db_serverless_min_capacity = config.get_float("dbServerlessMinCapacity") or 0.5
+db_serverless_max_capacity = config.get_float("dbServerlessMaxCapacity") or 16
+db_parameter_overrides = config.get_object("dbParameterOverrides")
+db_storage_overrides = sized(config.get_object("dbStorage"), "db_storage")
+db_replica_count = sized(config.get_int("dbReplicaCount"), "db_replica_count", 0)
+db_replica_instance_class = config.get("dbReplicaInstanceClass")
+db_replica_availability_zones = config.get_object("dbReplicaAvailabilityZones")
+db_proxy_enabled = config.get_bool("dbProxyEnabled") or False
+cache_node_type = sized(config.get("cacheNodeType"), "cache_node_type", "cache.t4g.medium")
+cache_cluster_mode = sized(config.get_bool("cacheClusterMode"), "cache_cluster_mode", False)
+cache_num_shards = sized(config.get_int("cacheNumShards"), "cache_num_shards", 1)
+cache_replicas_per_shard = config.get_int("cacheReplicasPerShard")
+cache_eviction_policy = config.get("cacheEvictionPolicy") or "volatile-lru"
+cache_auth_token = config.get_secret("cacheAuthToken")
+cdn_enabled = config.get_bool("cdnEnabled") or False
+cdn_price_class = config.get("cdnPriceClass") or "PriceClass_100"
+api_origin_domain = config.get("apiOriginDomain")
+document_signing_public_key = config.get("documentSigningPublicKey")
+waf_rules = config.get_object("wafRules")
+monitoring_workload_namespaces = config.get_object("monitoringWorkloadNamespaces")
+bedrock_models = config.get_object("bedrockModels") or [{"model_id": "anthropic.claude-v2"}]
+log_metric_definitions = config.get_object("logMetricDefinitions")
+log_retention_days = config.get_int("logRetentionDays") or 30
+work_queues_enabled = config.get_bool("workQueuesEnabled") or False
+work_queue_definitions = config.get_object("workQueues")
+keda_version = config.get("kedaVersion") or "2.15.1"
+# A pinned bucket name belongs to the environment being copied, so perf copies always derive their own
+documents_bucket_name = None if perf_mode else config.get("documentsBucketName")
+documents_transfer_acceleration = config.get_bool("documentsTransferAcceleration") or False
+documents_cors_origins = config.get_object("documentsCorsOrigins")
+documents_intelligent_tiering_days = config.get_int("documentsIntelligentTieringDays") or 30
+documents_upload_queue = config.get("documentsUploadQueue") or "ingestion"
+dynamodb_enabled = config.get_bool("dynamodbEnabled") or False
+dynamodb_billing_mode = config.get("dynamodbBillingMode") or "PAY_PER_REQUEST"
+dynamodb_capacity = config.get_object("dynamodbCapacity")
+dax_enabled = config.get_bool("daxEnabled") or False
+dax_node_type = config.get("daxNodeType") or "dax.t3.medium"
+perf_release = config.get("perfRelease") or "adhoc"
+perf_target_url = config.get("perfTargetUrl")
+perf_scenarios = config.get_object("perfScenarios")
+perf_bedrock_mock = config.get_bool("perfBedrockMock")
+perf_user_email = config.get("perfUserEmail")
+perf_user_password = config.get_secret("perfUserPassword")
+perf_load_generator_pool = config.get_object("perfLoadGeneratorPool") or {}
+
+# Sizing report, shown in the preview output
+if capacity_plan and pulumi.runtime.is_dry_run():
+    pulumi.log.info(sizing_report(capacity_plan, load_targets, environment))
+
+# Regions: the first entry is the primary and owns the database writer, any further entries serve
+# reads from a cross-region copy of the database and take traffic through latency-based DNS records
+regions = [
+    entry if isinstance(entry, dict) else {"region": entry}
+    for entry in config.get_object("regions") or [region]
+]
+if regions[0]["region"] != region:
+    raise ValueError(f"The first entry in regions must be the stack region ({region})")
+dns_zone_id = config.get("dnsZoneId")
+api_domain_name = config.get("apiDomainName")
 
 # AWS Provider
 aws_provider = Provider("aws", region=region)
 
-# VPC
-vpc = Vpc(
-    "vpc",
-    project_name=project_name,
-    environment=environment,
-    vpc_cidr=vpc_cidr,
-    opts=pulumi.ResourceOptions(provider=aws_provider)
-)
 
-# Security
-security = Security(
-    "security",
-    project_name=project_name,
-    environment=environment,
-    vpc_id=vpc.vpc_id,
-    allowed_cidr_blocks=allowed_cidr_blocks,
-    opts=pulumi.ResourceOptions(provider=aws_provider)
-)
+# Build the VPC, EKS, database, cache, log metrics and monitoring set for one region.
+# Secondary regions pass the primary region's stack as source_stack; the primary region keeps the
+# original, unsuffixed resource names.
+def regional_stack(region_config, provider, source_stack=None):
+    region_name = region_config["region"]
+    is_primary = source_stack is None
+    suffix = "" if is_primary else f"-{region_name}"
+    opts = pulumi.ResourceOptions(provider=provider)
 
-# EKS
-eks = Eks(
-    "eks",
-    project_name=project_name,
-    environment=environment,
-    vpc_id=vpc.vpc_id,
-    subnet_ids=vpc.private_subnet_ids,
-    eks_node_iam_role_arn=security.eks_node_iam_role_arn,
-    opts=pulumi.ResourceOptions(provider=aws_provider)
-)
+    # VPC
+    vpc = Vpc(
+        f"vpc{suffix}",
+        project_name=project_name,
+        environment=environment,
+        vpc_cidr=region_config.get("vpc_cidr") or vpc_cidr,
+        az_count=az_count,
+        availability_zones=availability_zones if is_primary else None,
+        subnet_cidrs=subnet_cidrs if is_primary else None,
+        public_subnet_prefix=public_subnet_prefix,
+        private_subnet_prefix=private_subnet_prefix,
+        single_nat_gateway=single_nat_gateway,
+        enable_vpc_endpoints=vpc_endpoints_enabled,
+        interface_endpoint_services=vpc_interface_endpoint_services,
+        opts=opts
+    )
 
-# RDS
-rds = Rds(
-    "rds",
-    project_name=project_name,
-    environment=environment,
-    vpc_id=vpc.vpc_id,
-    subnet_ids=vpc.private_subnet_ids,
-    allowed_security_groups=[eks.cluster_security_group_id],
-    db_name=db_name,
-    db_username=db_username,
-    db_password=db_password,
-    opts=pulumi.ResourceOptions(provider=aws_provider)
-)
+    # Security
+    security = Security(
+        f"security{suffix}",
+        project_name=project_name,
+        environment=environment,
+        vpc_id=vpc.vpc_id,
+        allowed_cidr_blocks=allowed_cidr_blocks,
+        enable_cloudfront_waf=cdn_enabled and is_primary,
+        waf_rule_config=waf_rules,
+        opts=opts
+    )
+
+    # EKS
+    eks = Eks(
+        f"eks{suffix}",
+        project_name=project_name,
+        environment=environment,
+        vpc_id=vpc.vpc_id,
+        subnet_ids=vpc.private_subnet_ids,
+        eks_node_iam_role_arn=security.eks_node_iam_role_arn,
+        node_subnet_ids=vpc.routed_private_subnet_ids,
+        node_pools=eks_node_pools,
+        karpenter_enabled=eks_karpenter_enabled,
+        karpenter_version=eks_karpenter_version,
+        karpenter_cpu_limit=eks_karpenter_cpu_limit,
+        container_insights_enabled=True if eks_container_insights_enabled is None else eks_container_insights_enabled,
+        load_generator_pool=perf_load_generator_pool if perf_mode and is_primary else None,
+        opts=opts
+    )
+
+    # RDS
+    rds = Rds(
+        f"rds{suffix}",
+        project_name=project_name,
+        environment=environment,
+        vpc_id=vpc.vpc_id,
+        subnet_ids=vpc.private_subnet_ids,
+        allowed_security_groups=[eks.managed_cluster_security_group_id],
+        db_name=db_name,
+        db_username=db_username,
+        db_password=db_password,
+        engine_mode=db_engine_mode,
+        instance_class=db_instance_class,
+        serverless_min_capacity=db_serverless_min_capacity,
+        serverless_max_capacity=db_serverless_max_capacity,
+        parameter_overrides=db_parameter_overrides,
+        storage_overrides=db_storage_overrides,
+        replica_count=db_replica_count,
+        replica_instance_class=db_replica_instance_class,
+        replica_availability_zones=db_replica_availability_zones if is_primary else None,
+        enable_proxy=db_proxy_enabled and is_primary,
+        global_database=len(regions) > 1 and is_primary,
+        source_db=None if is_primary else source_stack["rds"],
+        skip_final_snapshot=perf_mode,
+        opts=opts
+    )
+
+    # Cache
+    cache = Cache(
+        f"cache{suffix}",
+        project_name=project_name,
+        environment=environment,
+        vpc_id=vpc.vpc_id,
+        subnet_ids=vpc.private_subnet_ids,
+        allowed_security_groups=[eks.managed_cluster_security_group_id],
+        node_type=cache_node_type,
+        cluster_mode=cache_cluster_mode,
+        num_shards=cache_num_shards,
+        replicas_per_shard=1 if cache_replicas_per_shard is None else cache_replicas_per_shard,
+        eviction_policy=cache_eviction_policy,
+        auth_token=cache_auth_token,
+        opts=opts
+    )
+
+    # Log metrics
+    log_metrics = LogMetrics(
+        f"log-metrics{suffix}",
+        project_name=project_name,
+        environment=environment,
+        cluster_name=eks.cluster_name,
+        metric_definitions=log_metric_definitions,
+        retention_in_days=log_retention_days,
+        opts=opts
+    )
 
-# Monitoring
-monitoring = Monitoring(
-    "monitoring",
+    # Work queues for the long-running AI operations, drained by KEDA-scaled workers
+    queues = None
+    if work_queues_enabled:
+        queues = Queues(
+            f"queues{suffix}",
+            project_name=project_name,
+            environment=environment,
+            eks=eks,
+            queue_definitions=work_queue_definitions,
+            keda_version=keda_version,
+            opts=opts
+        )
+
+    # Monitoring
+    monitoring = Monitoring(
+        f"monitoring{suffix}",
+        project_name=project_name,
+        environment=environment,
+        aws_region=region_name,
+        alert_email=alert_email,
+        eks_cluster_name=eks.cluster_name,
+        eks_log_group_name=eks.cloudwatch_log_group_name,
+        workload_namespaces=monitoring_workload_namespaces,
+        rds=rds,
+        bedrock_models=bedrock_models,
+        log_metrics=log_metrics,
+        queues=queues,
+        # Dashboards are global, so only the primary keeps the plain name
+        dashboard_name=None if is_primary else f"{project_name}-{environment}-{region_name}-dashboard",
+        opts=opts
+    )
+
+    return {
+        "vpc": vpc,
+        "security": security,
+        "eks": eks,
+        "rds": rds,
+        "cache": cache,
+        "log_metrics": log_metrics,
+        "queues": queues,
+        "monitoring": monitoring
+    }
+
+
+primary = regional_stack(regions[0], aws_provider)
+secondaries = {
+    entry["region"]: regional_stack(entry, Provider(f"aws-{entry['region']}", region=entry["region"]), source_stack=primary)
+    for entry in regions[1:]
+}
+vpc = primary["vpc"]
+security = primary["security"]
+eks = primary["eks"]
+rds = primary["rds"]
+cache = primary["cache"]
+log_metrics = primary["log_metrics"]
+queues = primary["queues"]
+monitoring = primary["monitoring"]
+
+# Documents bucket; uploads are announced on EventBridge and queued for the ingestion workers
+storage = Storage(
+    "storage",
     project_name=project_name,
     environment=environment,
-    aws_region=region,
-    alert_email=alert_email,
+    bucket_name=documents_bucket_name,
+    transfer_acceleration=documents_transfer_acceleration,
+    cors_allowed_origins=documents_cors_origins,
+    intelligent_tiering_after_days=documents_intelligent_tiering_days,
+    upload_queue=queues.queues.get(documents_upload_queue) if queues else None,
+    force_destroy=perf_mode,
     opts=pulumi.ResourceOptions(provider=aws_provider)
 )
 
+# DynamoDB tables for the resource, collection and chat handlers; global tables when there are secondary regions
+tables = None
+if dynamodb_enabled:
+    tables = Tables(
+        "tables",
+        project_name=project_name,
+        environment=environment,
+        billing_mode=dynamodb_billing_mode,
+        capacity=dynamodb_capacity,
+        replica_regions=list(secondaries),
+        dax_enabled=dax_enabled,
+        vpc_id=vpc.vpc_id,
+        subnet_ids=vpc.private_subnet_ids,
+        allowed_security_groups=[eks.managed_cluster_security_group_id],
+        dax_node_type=dax_node_type,
+        opts=pulumi.ResourceOptions(provider=aws_provider)
+    )
+
+# Latency-based DNS in front of each region's ingress; the ingress load balancers are created by the
+# in-cluster controller, so their hostnames come from config
+dns = None
+if dns_zone_id and api_domain_name:
+    dns = Dns(
+        "dns",
+        project_name=project_name,
+        environment=environment,
+        zone_id=dns_zone_id,
+        domain_name=api_domain_name,
+        regional_endpoints={entry["region"]: entry["ingress_hostname"] for entry in regions if entry.get("ingress_hostname")},
+        opts=pulumi.ResourceOptions(provider=aws_provider)
+    )
+
+# CDN
+cdn = None
+if cdn_enabled:
+    cdn = Cdn(
+        "cdn",
+        project_name=project_name,
+        environment=environment,
+        api_origin_domain=api_origin_domain or (api_domain_name if dns else None),
+        web_acl_arn=security.cloudfront_waf_web_acl_arn,
+        document_signing_public_key=document_signing_public_key,
+        price_class=cdn_price_class,
+        documents_bucket=storage.bucket,
+        opts=pulumi.ResourceOptions(provider=aws_provider)
+    )
+
+# Load tests against the perf stack: k6 Jobs on the load-generator pool, results in S3 and a dashboard per release
+perf = None
+if perf_mode:
+    perf = Perf(
+        "perf",
+        project_name=project_name,
+        environment=environment,
+        eks=eks,
+        target_url=perf_target_url or (f"https://{api_domain_name}" if api_domain_name else config.require("perfTargetUrl")),
+        release=perf_release,
+        scenarios=perf_scenarios,
+        perf_user_email=perf_user_email,
+        perf_user_password=perf_user_password,
+        bedrock_mock=True if perf_bedrock_mock is None else perf_bedrock_mock,
+        opts=pulumi.ResourceOptions(provider=aws_provider)
+    )
+
 # Exports
 pulumi.export("vpc_id", vpc.vpc_id)
 pulumi.export("eks_cluster_id", eks.cluster_id)
 pulumi.export("eks_cluster_endpoint", eks.cluster_endpoint)
+pulumi.export("eks_oidc_provider_arn", eks.oidc_provider_arn)
+pulumi.export("eks_node_group_names", eks.node_group_names)
+pulumi.export("eks_node_group_arns", eks.node_group_arns)
 pulumi.export("rds_endpoint", rds.db_endpoint)
+pulumi.export("rds_reader_endpoint", rds.db_reader_endpoint)
+pulumi.export("db_writer_endpoint", rds.db_writer_endpoint)
+if rds.global_cluster:
+    pulumi.export("rds_global_cluster_id", rds.global_cluster_id)
+if rds.db_proxy_endpoint:
+    pulumi.export("rds_proxy_endpoint", rds.db_proxy_endpoint)
+pulumi.export("redis_primary_endpoint", cache.primary_endpoint)
+pulumi.export("redis_reader_endpoint", cache.reader_endpoint)
+# Set as the backend's REDIS_URL; the cache only accepts TLS connections
+pulumi.export("redis_url", cache.redis_url)
 pulumi.export("eks_node_security_group_id", security.eks_node_security_group_id)
 pulumi.export("eks_node_iam_role_arn", security.eks_node_iam_role_arn)
-pulumi.export("cloudwatch_log_group_name", security.cloudwatch_log_group_name)
+pulumi.export("cloudwatch_log_group_name", eks.cloudwatch_log_group_name)
 pulumi.export("waf_web_acl_id", security.waf_web_acl_id)
+pulumi.export("application_log_group_name", log_metrics.application_log_group_name)
+if capacity_plan:
+    pulumi.export("capacity_plan", capacity_plan)
+if queues:
+    pulumi.export("work_queue_urls", queues.queue_urls)
+    pulumi.export("work_queue_producer_policy_arn", queues.producer_policy_arn)
+    pulumi.export("work_queue_producer_role_arn", queues.producer_role_arn)
+    pulumi.export("work_queue_worker_role_arns", queues.worker_role_arns)
+pulumi.export("documents_bucket_name", storage.bucket_name)
+pulumi.export("documents_upload_endpoint", storage.upload_endpoint)
+pulumi.export("documents_access_policy_arn", storage.access_policy_arn)
+if tables:
+    pulumi.export("dynamodb_table_names", tables.table_names)
+    pulumi.export("dynamodb_index_names", tables.index_names)
+    if tables.dax_endpoint:
+        pulumi.export("dax_endpoint", tables.dax_endpoint)
+if cdn:
+    pulumi.export("cdn_distribution_id", cdn.distribution_id)
+    pulumi.export("cdn_domain_name", cdn.domain_name)
+    pulumi.export("frontend_bucket_name", cdn.frontend_bucket_name)
+if dns:
+    pulumi.export("api_domain_name", dns.domain_name)
+if secondaries:
+    pulumi.export("regions", {
+        region_name: {
+            "vpc_id": stack["vpc"].vpc_id,
+            "eks_cluster_endpoint": stack["eks"].cluster_endpoint,
+            "rds_reader_endpoint": stack["rds"].db_reader_endpoint,
+            "redis_primary_endpoint": stack["cache"].primary_endpoint,
+            "application_log_group_name": stack["log_metrics"].application_log_group_name
+        }
+        for region_name, stack in secondaries.items()
+    })
+if perf:
+    pulumi.export("perf_results_bucket_name", perf.results_bucket_name)
+    pulumi.export("perf_dashboard_name", perf.dashboard_name)
+    if perf.bedrock_mock_endpoint:
+        pulumi.export("perf_bedrock_mock_endpoint", perf.bedrock_mock_endpoint)
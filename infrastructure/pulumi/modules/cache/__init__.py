@@ -0,0 +1,3 @@
+from .cache import Cache
+
+__all__ = ['Cache']
\ No newline at end of file
@@ -0,0 +1,201 @@
+from urllib.parse import quote
+import pulumi
+from pulumi import ResourceOptions
+from pulumi_aws import elasticache, ec2, kms, cloudwatch
+
+class Cache(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, vpc_id, subnet_ids, allowed_security_groups,
+                 node_type="cache.t4g.medium", engine_version="7.0", cluster_mode=False, num_shards=1, replicas_per_shard=1,
+                 eviction_policy="volatile-lru", auth_token=None, opts=None):
+        super().__init__("aidocs:cache:Cache", name, None, opts)
+        self.name = name
+        self.project_name = project_name
+        self.environment = environment
+        self.vpc_id = vpc_id
+        self.subnet_ids = subnet_ids
+        self.allowed_security_groups = allowed_security_groups
+        self.node_type = node_type
+        self.cluster_mode = cluster_mode
+        self.num_shards = num_shards if cluster_mode else 1
+        self.replicas_per_shard = replicas_per_shard
+        self.auth_token = auth_token
+        # Resources predate the component, the alias keeps their original top-level URNs
+        self.opts = ResourceOptions(parent=self, aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)])
+
+        # Create cache subnet group
+        self.subnet_group = elasticache.SubnetGroup(
+            f"{name}-subnet-group",
+            name=f"{project_name}-{environment}-redis",
+            subnet_ids=subnet_ids,
+            tags={
+                "Name": f"{project_name}-{environment}-redis-subnet-group",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        # Create Redis security group; ingress rules are standalone so the replication group does not
+        # wait for the source groups
+        self.security_group = ec2.SecurityGroup(
+            f"{name}-sg",
+            vpc_id=vpc_id,
+            description="Security group for Redis",
+            tags={
+                "Name": f"{project_name}-{environment}-redis-sg",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        for i, source_security_group in enumerate(allowed_security_groups):
+            ec2.SecurityGroupRule(
+                f"{name}-sg-ingress" if i == 0 else f"{name}-sg-ingress-{i}",
+                type="ingress",
+                protocol="tcp",
+                from_port=6379,
+                to_port=6379,
+                security_group_id=self.security_group.id,
+                source_security_group_id=source_security_group,
+                opts=self.opts
+            )
+
+        # Create KMS key for Redis encryption
+        self.kms_key = kms.Key(
+            f"{name}-kms-key",
+            description="KMS key for Redis encryption",
+            deletion_window_in_days=7,
+            enable_key_rotation=True,
+            tags={
+                "Name": f"{project_name}-{environment}-redis-kms",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        # Create parameter group
+        parameters = [
+            {
+                "name": "maxmemory-policy",
+                "value": eviction_policy
+            }
+        ]
+        if cluster_mode:
+            parameters.append({
+                "name": "cluster-enabled",
+                "value": "yes"
+            })
+
+        self.parameter_group = elasticache.ParameterGroup(
+            f"{name}-parameter-group",
+            name=f"{project_name}-{environment}-redis{engine_version.split('.')[0]}",
+            family=f"redis{engine_version.split('.')[0]}",
+            description="Redis parameters",
+            parameters=parameters,
+            tags={
+                "Name": f"{project_name}-{environment}-redis-parameter-group",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        # Create CloudWatch log group for the slow log
+        self.cloudwatch_log_group = cloudwatch.LogGroup(
+            f"{name}-logs",
+            name=f"/aws/elasticache/{project_name}-{environment}",
+            retention_in_days=30,
+            tags={
+                "Name": f"{project_name}-{environment}-redis-logs",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        # Create Redis replication group
+        has_replicas = replicas_per_shard > 0
+        self.replication_group = elasticache.ReplicationGroup(
+            f"{name}-replication-group",
+            replication_group_id=f"{project_name}-{environment}",
+            description=f"Redis for {project_name}-{environment}",
+            engine="redis",
+            engine_version=engine_version,
+            node_type=node_type,
+            port=6379,
+            parameter_group_name=self.parameter_group.name,
+            subnet_group_name=self.subnet_group.name,
+            security_group_ids=[self.security_group.id],
+            num_node_groups=self.num_shards if cluster_mode else None,
+            replicas_per_node_group=replicas_per_shard if cluster_mode else None,
+            num_cache_clusters=None if cluster_mode else replicas_per_shard + 1,
+            automatic_failover_enabled=cluster_mode or has_replicas,
+            multi_az_enabled=has_replicas,
+            at_rest_encryption_enabled=True,
+            kms_key_id=self.kms_key.arn,
+            transit_encryption_enabled=True,
+            auth_token=auth_token,
+            snapshot_retention_limit=1,
+            snapshot_window="03:00-04:00",
+            maintenance_window="mon:04:00-mon:05:00",
+            log_delivery_configurations=[{
+                "destination": self.cloudwatch_log_group.name,
+                "destination_type": "cloudwatch-logs",
+                "log_format": "json",
+                "log_type": "slow-log"
+            }],
+            tags={
+                "Name": f"{project_name}-{environment}-redis",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        self.register_outputs({
+            "primary_endpoint": self.primary_endpoint,
+            "reader_endpoint": self.reader_endpoint,
+            "redis_url": self.redis_url
+        })
+
+    @property
+    def primary_endpoint(self):
+        if self.cluster_mode:
+            return self.replication_group.configuration_endpoint_address
+        return self.replication_group.primary_endpoint_address
+
+    @property
+    def reader_endpoint(self):
+        if self.cluster_mode:
+            return self.replication_group.configuration_endpoint_address
+        return self.replication_group.reader_endpoint_address
+
+    # In-transit encryption is always on, so clients must connect over TLS; ioredis does so for rediss:// URLs.
+    # With AUTH on, the URL carries the token and is a secret.
+    @property
+    def redis_url(self):
+        if not self.auth_token:
+            return pulumi.Output.concat("rediss://", self.primary_endpoint, ":6379")
+        return pulumi.Output.secret(pulumi.Output.all(self.auth_token, self.primary_endpoint).apply(
+            lambda args: f"rediss://:{quote(args[0], safe='')}@{args[1]}:6379"
+        ))
+
+    @property
+    def replication_group_id(self):
+        return self.replication_group.id
+
+    @property
+    def security_group_id(self):
+        return self.security_group.id
+
+    @property
+    def kms_key_arn(self):
+        return self.kms_key.arn
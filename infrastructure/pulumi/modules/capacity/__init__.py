@@ -0,0 +1,3 @@
+from .capacity import plan_capacity, sizing_report
+
+__all__ = ['plan_capacity', 'sizing_report']
@@ -0,0 +1,265 @@
+import math
+from modules.rds.rds import STORAGE_PRESETS
+
+# Pure sizing model: declared load targets in, the sizing inputs of the components out.
+# Nothing here talks to Pulumi, so the model can be unit tested and run on its own.
+
+PRODUCTION_ENVIRONMENTS = {"prod", "production"}
+
+# Load targets used for anything the stack does not declare
+DEFAULT_TARGETS = {
+    "peak_rps": 20,
+    "concurrent_chat_sessions": 50,
+    "document_count": 10000,
+    "average_document_mb": 1,
+    "p99_latency_ms": 1000,
+    # Extra capacity on top of the declared peak, for growth between re-plans
+    "headroom": 1.3
+}
+
+# API tier: measured throughput of one API vCPU, and what an open (streaming) chat session costs
+RPS_PER_VCPU = 40
+VCPU_PER_CHAT_SESSION = 0.02
+MEMORY_GIB_PER_VCPU = 2
+MEMORY_MB_PER_CHAT_SESSION = 25
+
+# Share of a node's vCPU and memory left for workloads after system pods and reserved resources
+NODE_ALLOCATABLE = 0.85
+
+# Node and database instance catalogs as (type, vCPU, memory GiB), smallest first; the first entry
+# of each is burstable and only used outside production
+NODE_TYPES = [
+    ("t3.medium", 2, 4),
+    ("m6i.large", 2, 8),
+    ("m6i.xlarge", 4, 16),
+    ("m6i.2xlarge", 8, 32),
+    ("m6i.4xlarge", 16, 64)
+]
+DB_INSTANCE_CLASSES = [
+    ("db.t4g.medium", 2, 4),
+    ("db.r6g.large", 2, 16),
+    ("db.r6g.xlarge", 4, 32),
+    ("db.r6g.2xlarge", 8, 64),
+    ("db.r6g.4xlarge", 16, 128),
+    ("db.r6g.8xlarge", 32, 256),
+    ("db.r6g.16xlarge", 64, 512)
+]
+# Cache node types as (type, usable memory GiB)
+CACHE_NODE_TYPES = [
+    ("cache.t4g.medium", 3.09),
+    ("cache.r7g.large", 13.07),
+    ("cache.r7g.xlarge", 26.32),
+    ("cache.r7g.2xlarge", 52.82)
+]
+
+# Node groups stay under this size, including room to scale out to twice the planned nodes; past it the
+# planner moves to a larger instance type, and past the largest type it adds node groups
+MAX_NODES_PER_POOL = 12
+POOL_SCALE_OUT = 2
+EKS_MAX_NODE_GROUPS = 30
+
+# Database: the extracted text of a document is chunked and embedded, and each chunk row carries its
+# text, embedding and indexes. Text is a small share of an uploaded file (PDF, DOCX) by size.
+TEXT_SHARE_OF_FILE = 0.05
+CHUNK_KB = 4
+STORED_KB_PER_CHUNK = 20
+# Share of the data that is read often enough that it has to stay in memory to hold the latency target
+HOT_DATA_FRACTION = 0.2
+QUERIES_PER_REQUEST = 3
+QUERIES_PER_DB_VCPU = 400
+# Share of queries that miss the page cache, and the IOPS each of them costs
+CACHE_MISS_RATIO = 0.05
+IOPS_PER_MISS = 10
+GP3_BASELINE_IOPS = 3000
+# From 400 GB RDS stripes gp3 over four volumes and only accepts provisioned IOPS and throughput in these ranges
+GP3_MIN_PROVISIONED_GB = 400
+GP3_PROVISIONED_IOPS = (12000, 64000)
+GP3_PROVISIONED_THROUGHPUT = (500, 4000)
+RDS_MAX_STORAGE_GB = 65536
+RDS_MAX_READ_REPLICAS = 15
+
+# Cache: chat session state plus document metadata, kept under 75% of maxmemory
+CACHE_MB_PER_CHAT_SESSION = 0.5
+CACHE_KB_PER_DOCUMENT = 2
+CACHE_FILL_RATIO = 0.75
+
+
+# Tighter latency targets leave more idle capacity so queueing does not push p99 up
+def utilisation_target(p99_latency_ms):
+    if p99_latency_ms <= 300:
+        return 0.5
+    if p99_latency_ms <= 1000:
+        return 0.6
+    return 0.7
+
+
+def smallest_fitting(catalog, fits, production, demand):
+    candidates = catalog[1:] if production else catalog
+    entry = next((entry for entry in candidates if fits(entry)), None)
+    if entry is None:
+        raise ValueError(f"No entry in the catalog fits {demand}; the load targets are beyond what the planner can size")
+    return entry
+
+
+def plan_node_pools(api_vcpu, api_memory_gib, az_count, production):
+    def nodes_needed(entry):
+        _, vcpu, memory_gib = entry
+        return max(
+            math.ceil(api_vcpu / (vcpu * NODE_ALLOCATABLE)),
+            math.ceil(api_memory_gib / (memory_gib * NODE_ALLOCATABLE))
+        )
+
+    planned_nodes_per_pool = MAX_NODES_PER_POOL // POOL_SCALE_OUT
+    instance_type = smallest_fitting(
+        NODE_TYPES,
+        lambda entry: nodes_needed(entry) <= planned_nodes_per_pool or entry is NODE_TYPES[-1],
+        production,
+        f"{api_vcpu:.0f} API vCPU / {api_memory_gib:.0f} GiB"
+    )
+    # At least one node per AZ, rounded up to keep every pool balanced across them
+    pool_count = math.ceil(nodes_needed(instance_type) / planned_nodes_per_pool)
+    if pool_count > EKS_MAX_NODE_GROUPS:
+        raise ValueError(
+            f"{api_vcpu:.0f} API vCPU needs {pool_count} node groups of {instance_type[0]}, "
+            f"more than the {EKS_MAX_NODE_GROUPS} EKS allows"
+        )
+    nodes_per_pool = math.ceil(nodes_needed(instance_type) / pool_count)
+    min_size = math.ceil(max(nodes_per_pool, az_count) / az_count) * az_count
+    return [
+        {
+            "name": "default" if i == 0 else f"api-{i + 1}",
+            "capacity_type": "ON_DEMAND",
+            "instance_types": [instance_type[0]],
+            "min_size": min_size,
+            "desired_size": min_size,
+            "max_size": min(min_size * POOL_SCALE_OUT, MAX_NODES_PER_POOL)
+        }
+        for i in range(pool_count)
+    ]
+
+
+def plan_database(data_gb, db_vcpu, peak_rps, production, storage_floor):
+    hot_memory_gib = data_gb * HOT_DATA_FRACTION / 0.75
+    # Reads beyond what the largest class can serve go to replicas, but the hot data has to fit in memory
+    instance = smallest_fitting(
+        DB_INSTANCE_CLASSES,
+        lambda entry: entry[2] >= hot_memory_gib and (entry[1] >= db_vcpu or entry is DB_INSTANCE_CLASSES[-1]),
+        production,
+        f"{hot_memory_gib:.0f} GiB of hot data"
+    )
+    replica_count = max(1 if production else 0, math.ceil(db_vcpu / instance[1]) - 1)
+    if replica_count > RDS_MAX_READ_REPLICAS:
+        raise ValueError(
+            f"{db_vcpu:.0f} database vCPU needs {replica_count} read replicas of {instance[0]}, "
+            f"more than the {RDS_MAX_READ_REPLICAS} RDS allows"
+        )
+
+    allocated_storage = max(20, math.ceil(data_gb * 2 / 10) * 10)
+    iops = math.ceil(peak_rps * QUERIES_PER_REQUEST * CACHE_MISS_RATIO * IOPS_PER_MISS)
+    storage = {
+        "allocated_storage": allocated_storage,
+        "max_allocated_storage": min(allocated_storage * 5, RDS_MAX_STORAGE_GB),
+        "storage_type": "gp3"
+    }
+    if iops > GP3_BASELINE_IOPS:
+        # gp3 only accepts provisioned IOPS from 400 GB, which is cheaper than moving to io2
+        storage["allocated_storage"] = max(allocated_storage, GP3_MIN_PROVISIONED_GB)
+        storage["max_allocated_storage"] = min(storage["allocated_storage"] * 5, RDS_MAX_STORAGE_GB)
+        min_iops, max_iops = GP3_PROVISIONED_IOPS
+        min_throughput, max_throughput = GP3_PROVISIONED_THROUGHPUT
+        if iops > max_iops:
+            raise ValueError(f"{iops} database IOPS is more than gp3 provides ({max_iops})")
+        storage["iops"] = max(min_iops, math.ceil(iops / 1000) * 1000)
+        storage["storage_throughput"] = min(max_throughput, max(min_throughput, storage["iops"] // 24))
+
+    # Never plan below the environment's storage preset: RDS cannot shrink allocated storage
+    for key, value in storage_floor.items():
+        if key != "storage_type":
+            storage[key] = max(storage.get(key, 0), value)
+
+    return instance[0], storage, replica_count, hot_memory_gib, iops
+
+
+def plan_cache(cache_gib, production):
+    # Past the largest node type the data is spread over shards
+    node_type, memory_gib = smallest_fitting(
+        CACHE_NODE_TYPES,
+        lambda entry: entry[1] * CACHE_FILL_RATIO >= cache_gib or entry is CACHE_NODE_TYPES[-1],
+        production,
+        f"{cache_gib:.1f} GiB of cache"
+    )
+    num_shards = max(1, math.ceil(cache_gib / (memory_gib * CACHE_FILL_RATIO)))
+    return node_type, num_shards
+
+
+def plan_capacity(targets=None, environment="dev"):
+    targets = {**DEFAULT_TARGETS, **(targets or {})}
+    production = environment in PRODUCTION_ENVIRONMENTS
+    headroom = targets["headroom"]
+    peak_rps = targets["peak_rps"] * headroom
+    sessions = targets["concurrent_chat_sessions"] * headroom
+    utilisation = utilisation_target(targets["p99_latency_ms"])
+
+    # Production always spreads over three AZs with a NAT gateway each, so losing a zone loses a third
+    az_count = 3 if production or targets["peak_rps"] >= 200 else 2
+
+    api_vcpu = (peak_rps / RPS_PER_VCPU + sessions * VCPU_PER_CHAT_SESSION) / utilisation
+    api_memory_gib = api_vcpu * MEMORY_GIB_PER_VCPU + sessions * MEMORY_MB_PER_CHAT_SESSION / 1024
+
+    chunks_per_document = math.ceil(targets["average_document_mb"] * 1024 * TEXT_SHARE_OF_FILE / CHUNK_KB)
+    data_gb = targets["document_count"] * chunks_per_document * STORED_KB_PER_CHUNK / 1024 ** 2
+    db_vcpu = peak_rps * QUERIES_PER_REQUEST / QUERIES_PER_DB_VCPU / utilisation
+    db_instance_class, db_storage, db_replica_count, db_hot_memory_gib, db_iops = plan_database(
+        data_gb, db_vcpu, peak_rps, production,
+        STORAGE_PRESETS["prod"] if production else STORAGE_PRESETS.get(environment, STORAGE_PRESETS["dev"])
+    )
+
+    cache_gib = (sessions * CACHE_MB_PER_CHAT_SESSION / 1024
+                 + targets["document_count"] * CACHE_KB_PER_DOCUMENT / 1024 ** 2)
+    cache_node_type, cache_num_shards = plan_cache(cache_gib, production)
+
+    return {
+        "az_count": az_count,
+        "single_nat_gateway": not production,
+        "eks_node_pools": plan_node_pools(api_vcpu, api_memory_gib, az_count, production),
+        "db_instance_class": db_instance_class,
+        "db_storage": db_storage,
+        "db_replica_count": db_replica_count,
+        "cache_node_type": cache_node_type,
+        "cache_cluster_mode": cache_num_shards > 1,
+        "cache_num_shards": cache_num_shards,
+        # Intermediate figures, for the sizing report
+        "demand": {
+            "api_vcpu": round(api_vcpu, 1),
+            "api_memory_gib": round(api_memory_gib, 1),
+            "utilisation_target": utilisation,
+            "data_gb": round(data_gb, 1),
+            "db_hot_memory_gib": round(db_hot_memory_gib, 1),
+            "db_vcpu": round(db_vcpu, 1),
+            "db_iops": db_iops,
+            "cache_gib": round(cache_gib, 2)
+        }
+    }
+
+
+def sizing_report(plan, targets=None, environment="dev"):
+    targets = {**DEFAULT_TARGETS, **(targets or {})}
+    demand = plan["demand"]
+    node_pools = plan["eks_node_pools"]
+    storage = plan["db_storage"]
+    lines = [
+        f"Capacity plan for {environment}",
+        f"  targets: {targets['peak_rps']} rps peak, {targets['concurrent_chat_sessions']} chat sessions, "
+        f"{targets['document_count']} documents of {targets['average_document_mb']} MB, "
+        f"p99 {targets['p99_latency_ms']} ms, {targets['headroom']}x headroom",
+        f"  network: {plan['az_count']} AZs, {'a single NAT gateway' if plan['single_nat_gateway'] else 'a NAT gateway per AZ'}",
+        f"  nodes:   {len(node_pools)} pool(s) of {node_pools[0]['min_size']}-{node_pools[0]['max_size']} x "
+        f"{node_pools[0]['instance_types'][0]} "
+        f"for {demand['api_vcpu']} vCPU / {demand['api_memory_gib']} GiB at {int(demand['utilisation_target'] * 100)}% utilisation",
+        f"  db:      {plan['db_instance_class']} + {plan['db_replica_count']} replica(s) "
+        f"for {demand['db_vcpu']} vCPU, {demand['db_hot_memory_gib']} GiB hot data of {demand['data_gb']} GB",
+        f"  storage: {storage['allocated_storage']}-{storage['max_allocated_storage']} GB {storage['storage_type']}"
+        + (f", {storage['iops']} IOPS" if storage.get("iops") else f", baseline IOPS for {demand['db_iops']} needed"),
+        f"  cache:   {plan['cache_num_shards']} shard(s) of {plan['cache_node_type']} for {demand['cache_gib']} GiB"
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,3 @@
+from .cdn import Cdn
+
+__all__ = ['Cdn']
\ No newline at end of file
@@ -0,0 +1,277 @@
+import json
+import pulumi
+from pulumi import ResourceOptions
+from pulumi_aws import cloudfront, s3
+
+# AWS managed CloudFront policies
+CACHING_OPTIMIZED_POLICY_ID = "658327ea-f89d-4fab-a63d-7e88639e58f6"
+CACHING_DISABLED_POLICY_ID = "4135ea2d-6df8-44a3-9df3-4b5a84be39ad"
+ALL_VIEWER_EXCEPT_HOST_HEADER_POLICY_ID = "b689b0a8-53d0-40ab-baf2-68738e2966ac"
+
+class Cdn(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, api_origin_domain=None, web_acl_arn=None,
+                 document_signing_public_key=None, price_class="PriceClass_100", documents_bucket=None, opts=None):
+        super().__init__("aidocs:cdn:Cdn", name, None, opts)
+        self.name = name
+        self.project_name = project_name
+        self.environment = environment
+        # Resources predate the component, the alias keeps their original top-level URNs
+        self.opts = ResourceOptions(parent=self, aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)])
+
+        # Create private buckets for the frontend assets and, unless the Storage component owns it, the documents
+        self.buckets = {}
+        for bucket_name in ["frontend"] + ([] if documents_bucket else ["documents"]):
+            bucket = s3.BucketV2(
+                f"{name}-{bucket_name}-bucket",
+                bucket=f"{project_name}-{environment}-{bucket_name}",
+                tags={
+                    "Name": f"{project_name}-{environment}-{bucket_name}",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts
+            )
+
+            s3.BucketPublicAccessBlock(
+                f"{name}-{bucket_name}-public-access-block",
+                bucket=bucket.id,
+                block_public_acls=True,
+                block_public_policy=True,
+                ignore_public_acls=True,
+                restrict_public_buckets=True,
+                opts=self.opts
+            )
+
+            s3.BucketOwnershipControls(
+                f"{name}-{bucket_name}-ownership",
+                bucket=bucket.id,
+                rule={
+                    "object_ownership": "BucketOwnerEnforced"
+                },
+                opts=self.opts
+            )
+
+            s3.BucketServerSideEncryptionConfigurationV2(
+                f"{name}-{bucket_name}-encryption",
+                bucket=bucket.id,
+                rules=[{
+                    "apply_server_side_encryption_by_default": {
+                        "sse_algorithm": "AES256"
+                    }
+                }],
+                opts=self.opts
+            )
+
+            self.buckets[bucket_name] = bucket
+
+        if documents_bucket:
+            self.buckets["documents"] = documents_bucket
+
+        self.frontend_bucket = self.buckets["frontend"]
+        self.documents_bucket = self.buckets["documents"]
+
+        # Create Origin Access Control so only CloudFront can read the buckets
+        self.origin_access_control = cloudfront.OriginAccessControl(
+            f"{name}-oac",
+            name=f"{project_name}-{environment}-oac",
+            description="Origin access control for the S3 origins",
+            origin_access_control_origin_type="s3",
+            signing_behavior="always",
+            signing_protocol="sigv4",
+            opts=self.opts
+        )
+
+        # Immutable, content-hashed Next.js build output can be cached for a year
+        self.static_cache_policy = cloudfront.CachePolicy(
+            f"{name}-static-cache-policy",
+            name=f"{project_name}-{environment}-immutable-static",
+            comment="Long-lived caching for content-hashed static assets",
+            min_ttl=31536000,
+            default_ttl=31536000,
+            max_ttl=31536000,
+            parameters_in_cache_key_and_forwarded_to_origin={
+                "enable_accept_encoding_brotli": True,
+                "enable_accept_encoding_gzip": True,
+                "cookies_config": {
+                    "cookie_behavior": "none"
+                },
+                "headers_config": {
+                    "header_behavior": "none"
+                },
+                "query_strings_config": {
+                    "query_string_behavior": "none"
+                }
+            },
+            opts=self.opts
+        )
+
+        # Create the key group that validates signed document URLs
+        self.key_group = None
+        if document_signing_public_key:
+            public_key = cloudfront.PublicKey(
+                f"{name}-document-signing-key",
+                name=f"{project_name}-{environment}-document-signing",
+                comment="Public key for signed document download URLs",
+                encoded_key=document_signing_public_key,
+                opts=self.opts
+            )
+
+            self.key_group = cloudfront.KeyGroup(
+                f"{name}-document-key-group",
+                name=f"{project_name}-{environment}-documents",
+                items=[public_key.id],
+                opts=self.opts
+            )
+        else:
+            pulumi.log.warn("No document signing key configured; documents are not served through the CDN")
+
+        origins = [
+            {
+                "origin_id": "frontend",
+                "domain_name": self.frontend_bucket.bucket_regional_domain_name,
+                "origin_access_control_id": self.origin_access_control.id
+            },
+            {
+                "origin_id": "documents",
+                "domain_name": self.documents_bucket.bucket_regional_domain_name,
+                "origin_access_control_id": self.origin_access_control.id
+            }
+        ]
+
+        ordered_cache_behaviors = [
+            {
+                "path_pattern": "/_next/static/*",
+                "target_origin_id": "frontend",
+                "viewer_protocol_policy": "redirect-to-https",
+                "allowed_methods": ["GET", "HEAD"],
+                "cached_methods": ["GET", "HEAD"],
+                "cache_policy_id": self.static_cache_policy.id,
+                "compress": True
+            }
+        ]
+
+        if self.key_group:
+            ordered_cache_behaviors.append({
+                "path_pattern": "/documents/*",
+                "target_origin_id": "documents",
+                "viewer_protocol_policy": "https-only",
+                "allowed_methods": ["GET", "HEAD"],
+                "cached_methods": ["GET", "HEAD"],
+                "cache_policy_id": CACHING_OPTIMIZED_POLICY_ID,
+                "trusted_key_groups": [self.key_group.id],
+                "compress": True
+            })
+
+        if api_origin_domain:
+            origins.append({
+                "origin_id": "api",
+                "domain_name": api_origin_domain,
+                "custom_origin_config": {
+                    "http_port": 80,
+                    "https_port": 443,
+                    "origin_protocol_policy": "https-only",
+                    "origin_ssl_protocols": ["TLSv1.2"],
+                    "origin_keepalive_timeout": 60,
+                    "origin_read_timeout": 60
+                }
+            })
+            ordered_cache_behaviors.append({
+                "path_pattern": "/api/*",
+                "target_origin_id": "api",
+                "viewer_protocol_policy": "https-only",
+                "allowed_methods": ["GET", "HEAD", "OPTIONS", "PUT", "POST", "PATCH", "DELETE"],
+                "cached_methods": ["GET", "HEAD"],
+                "cache_policy_id": CACHING_DISABLED_POLICY_ID,
+                "origin_request_policy_id": ALL_VIEWER_EXCEPT_HOST_HEADER_POLICY_ID,
+                "compress": True
+            })
+
+        # Create CloudFront distribution
+        self.distribution = cloudfront.Distribution(
+            f"{name}-distribution",
+            enabled=True,
+            comment=f"{project_name}-{environment}-distribution",
+            default_root_object="index.html",
+            http_version="http2and3",
+            is_ipv6_enabled=True,
+            price_class=price_class,
+            web_acl_id=web_acl_arn,
+            origins=origins,
+            default_cache_behavior={
+                "target_origin_id": "frontend",
+                "viewer_protocol_policy": "redirect-to-https",
+                "allowed_methods": ["GET", "HEAD", "OPTIONS"],
+                "cached_methods": ["GET", "HEAD"],
+                "cache_policy_id": CACHING_OPTIMIZED_POLICY_ID,
+                "compress": True
+            },
+            ordered_cache_behaviors=ordered_cache_behaviors,
+            restrictions={
+                "geo_restriction": {
+                    "restriction_type": "none"
+                }
+            },
+            viewer_certificate={
+                "cloudfront_default_certificate": True
+            },
+            tags={
+                "Name": f"{project_name}-{environment}-cloudfront",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        # Allow the distribution to read the buckets through OAC
+        for bucket_name, bucket in self.buckets.items():
+            s3.BucketPolicy(
+                f"{name}-{bucket_name}-bucket-policy",
+                bucket=bucket.id,
+                policy=pulumi.Output.all(bucket.arn, self.distribution.arn).apply(
+                    lambda args: json.dumps({
+                        "Version": "2012-10-17",
+                        "Statement": [{
+                            "Sid": "AllowCloudFrontRead",
+                            "Effect": "Allow",
+                            "Principal": {
+                                "Service": "cloudfront.amazonaws.com"
+                            },
+                            "Action": "s3:GetObject",
+                            "Resource": f"{args[0]}/*",
+                            "Condition": {
+                                "StringEquals": {
+                                    "AWS:SourceArn": args[1]
+                                }
+                            }
+                        }]
+                    })
+                ),
+                opts=self.opts
+            )
+
+        self.register_outputs({
+            "distribution_id": self.distribution_id,
+            "domain_name": self.domain_name
+        })
+
+    @property
+    def distribution_id(self):
+        return self.distribution.id
+
+    @property
+    def domain_name(self):
+        return self.distribution.domain_name
+
+    @property
+    def frontend_bucket_name(self):
+        return self.frontend_bucket.bucket
+
+    @property
+    def documents_bucket_name(self):
+        return self.documents_bucket.bucket
+
+    @property
+    def key_group_id(self):
+        return self.key_group.id if self.key_group else None
\ No newline at end of file
@@ -0,0 +1,3 @@
+from .dns import Dns
+
+__all__ = ['Dns']
@@ -0,0 +1,61 @@
+import pulumi
+from pulumi import ResourceOptions
+from pulumi_aws import route53
+
+class Dns(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, zone_id, domain_name, regional_endpoints,
+                 health_check_path="/health", opts=None):
+        super().__init__("aidocs:dns:Dns", name, None, opts)
+        self.name = name
+        self.project_name = project_name
+        self.environment = environment
+        self.domain_name = domain_name
+        self.opts = ResourceOptions(parent=self)
+
+        # Health check and latency record per region; Route 53 answers with the lowest-latency healthy region
+        self.health_checks = {}
+        self.records = {}
+        for region, endpoint in regional_endpoints.items():
+            health_check = route53.HealthCheck(
+                f"{name}-{region}-health-check",
+                type="HTTPS",
+                fqdn=endpoint,
+                port=443,
+                resource_path=health_check_path,
+                request_interval=10,
+                failure_threshold=3,
+                measure_latency=True,
+                tags={
+                    "Name": f"{project_name}-{environment}-{region}",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts
+            )
+
+            self.records[region] = route53.Record(
+                f"{name}-{region}-record",
+                zone_id=zone_id,
+                name=domain_name,
+                type="CNAME",
+                ttl=60,
+                records=[endpoint],
+                set_identifier=region,
+                latency_routing_policies=[{
+                    "region": region
+                }],
+                health_check_id=health_check.id,
+                opts=self.opts
+            )
+
+            self.health_checks[region] = health_check
+
+        self.register_outputs({
+            "domain_name": self.domain_name,
+            "health_check_ids": self.health_check_ids
+        })
+
+    @property
+    def health_check_ids(self):
+        return {region: health_check.id for region, health_check in self.health_checks.items()}
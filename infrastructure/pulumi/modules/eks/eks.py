@@ -1,16 +1,70 @@
+import json
 import pulumi
+import pulumi_kubernetes as k8s
 from pulumi import ResourceOptions
-from pulumi_aws import eks, ec2, iam, kms, cloudwatch
+from pulumi_aws import eks, ec2, iam, kms, cloudwatch, get_region
+from .karpenter import Karpenter
+from .user_data import node_user_data
 
-class Eks:
-    def __init__(self, name, project_name, environment, vpc_id, subnet_ids, eks_node_iam_role_arn, opts=None):
+# Root CA thumbprint for the EKS OIDC issuers
+EKS_OIDC_THUMBPRINT = "9e99a48a9960b14926bb7f3b02e22da2b0ab7280"
+
+# Node pools used when the stack does not declare its own
+DEFAULT_NODE_POOLS = [
+    {
+        "name": "default",
+        "capacity_type": "ON_DEMAND",
+        "architecture": "x86_64",
+        "instance_types": ["t3.medium"],
+        "min_size": 3,
+        "desired_size": 3,
+        "max_size": 6
+    }
+]
+
+# Dedicated pool for load generators in perf stacks; the taint keeps the system under test off it
+LOAD_GENERATOR_TAINT = {
+    "key": "dedicated",
+    "value": "load-generator",
+    "effect": "NO_SCHEDULE"
+}
+LOAD_GENERATOR_POOL = {
+    "name": "loadgen",
+    "capacity_type": "ON_DEMAND",
+    "instance_types": ["c6i.2xlarge"],
+    "min_size": 2,
+    "desired_size": 2,
+    "max_size": 4,
+    "labels": {
+        "workload": "load-generator"
+    },
+    "taints": [LOAD_GENERATOR_TAINT]
+}
+
+# AL2023 nodes are bootstrapped by nodeadm, which merges the NodeConfig in our user data
+AMI_TYPES = {
+    "x86_64": "AL2023_x86_64_STANDARD",
+    "arm64": "AL2023_ARM_64_STANDARD"
+}
+
+class Eks(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, vpc_id, subnet_ids, eks_node_iam_role_arn, node_pools=None,
+                 karpenter_enabled=False, karpenter_version="1.0.6", karpenter_cpu_limit=200, container_insights_enabled=True,
+                 node_subnet_ids=None, load_generator_pool=None, opts=None):
+        super().__init__("aidocs:eks:Eks", name, None, opts)
         self.name = name
         self.project_name = project_name
         self.environment = environment
         self.vpc_id = vpc_id
         self.subnet_ids = subnet_ids
+        # Nodes need egress to bootstrap, so they can be placed on subnets that resolve after their NAT routes
+        self.node_subnet_ids = node_subnet_ids or subnet_ids
         self.eks_node_iam_role_arn = eks_node_iam_role_arn
-        self.opts = opts or ResourceOptions()
+        self.node_pools = list(node_pools or DEFAULT_NODE_POOLS)
+        if load_generator_pool is not None:
+            self.node_pools.append({**LOAD_GENERATOR_POOL, **load_generator_pool})
+        # Resources predate the component, the alias keeps their original top-level URNs
+        self.opts = ResourceOptions(parent=self, aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)])
 
         # Create EKS cluster security group
         self.cluster_security_group = ec2.SecurityGroup(
@@ -57,7 +111,7 @@ class Eks:
         )
 
         # Attach EKS cluster policy
-        iam.RolePolicyAttachment(
+        self.cluster_policy_attachment = iam.RolePolicyAttachment(
             f"{name}-cluster-policy",
             role=self.cluster_role.name,
             policy_arn="arn:aws:iam::aws:policy/AmazonEKSClusterPolicy",
@@ -79,6 +133,20 @@ class Eks:
             opts=self.opts
         )
 
+        # Create the control plane log group up front, otherwise EKS creates it without a retention
+        self.cloudwatch_log_group = cloudwatch.LogGroup(
+            f"{name}-logs",
+            name=f"/aws/eks/{project_name}-{environment}/cluster",
+            retention_in_days=30,
+            tags={
+                "Name": f"{project_name}-{environment}-eks-logs",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
         # Create EKS cluster
         self.cluster = eks.Cluster(
             f"{name}-cluster",
@@ -110,27 +178,24 @@ class Eks:
                 "Environment": environment,
                 "ManagedBy": "Pulumi"
             },
-            opts=self.opts
+            opts=ResourceOptions.merge(self.opts, ResourceOptions(depends_on=[self.cluster_policy_attachment, self.cloudwatch_log_group]))
         )
 
-        # Create EKS node group
-        self.node_group = eks.NodeGroup(
-            f"{name}-node-group",
+        # Enable VPC CNI prefix delegation so pod density is not capped by secondary IPs per ENI
+        self.vpc_cni_addon = eks.Addon(
+            f"{name}-vpc-cni",
             cluster_name=self.cluster.name,
-            node_group_name=f"{project_name}-{environment}-ng",
-            node_role_arn=eks_node_iam_role_arn,
-            subnet_ids=subnet_ids,
-            scaling_config={
-                "desired_size": 3,
-                "max_size": 6,
-                "min_size": 3
-            },
-            instance_types=["t3.medium"],
-            update_config={
-                "max_unavailable": 1
-            },
+            addon_name="vpc-cni",
+            resolve_conflicts_on_create="OVERWRITE",
+            resolve_conflicts_on_update="OVERWRITE",
+            configuration_values=json.dumps({
+                "env": {
+                    "ENABLE_PREFIX_DELEGATION": "true",
+                    "WARM_PREFIX_TARGET": "1"
+                }
+            }),
             tags={
-                "Name": f"{project_name}-{environment}-eks-node-group",
+                "Name": f"{project_name}-{environment}-vpc-cni",
                 "Project": project_name,
                 "Environment": environment,
                 "ManagedBy": "Pulumi"
@@ -138,13 +203,102 @@ class Eks:
             opts=self.opts
         )
 
-        # Create CloudWatch log group
-        self.cloudwatch_log_group = cloudwatch.LogGroup(
-            f"{name}-logs",
-            name=f"/aws/eks/{project_name}-{environment}/cluster",
-            retention_in_days=30,
+        # Create one EKS node group per node pool
+        self.launch_templates = {}
+        self.node_groups = {}
+        for pool in self.node_pools:
+            pool_name = pool["name"]
+            # The default pool keeps its original resource name so its state is adopted
+            is_default = pool_name == "default"
+            min_size = pool.get("min_size", 1)
+
+            # Launch template with a tuned gp3 root volume, IMDSv2 and node-level kernel settings
+            self.launch_templates[pool_name] = ec2.LaunchTemplate(
+                f"{name}-launch-template-{pool_name}",
+                name=f"{project_name}-{environment}-{pool_name}",
+                update_default_version=True,
+                block_device_mappings=[{
+                    "device_name": "/dev/xvda",
+                    "ebs": {
+                        "volume_size": pool.get("disk_size", 20),
+                        "volume_type": "gp3",
+                        "iops": pool.get("disk_iops", 3000),
+                        "throughput": pool.get("disk_throughput", 125),
+                        "encrypted": "true",
+                        "delete_on_termination": "true"
+                    }
+                }],
+                metadata_options={
+                    "http_endpoint": "enabled",
+                    "http_tokens": "required",
+                    "http_put_response_hop_limit": 2
+                },
+                user_data=node_user_data(pool.get("max_pods", 110)),
+                tag_specifications=[{
+                    "resource_type": "instance",
+                    "tags": {
+                        "Name": f"{project_name}-{environment}-{pool_name}",
+                        "Project": project_name,
+                        "Environment": environment,
+                        "ManagedBy": "Pulumi"
+                    }
+                }],
+                tags={
+                    "Name": f"{project_name}-{environment}-{pool_name}-lt",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts
+            )
+
+            self.node_groups[pool_name] = eks.NodeGroup(
+                f"{name}-node-group" if is_default else f"{name}-node-group-{pool_name}",
+                cluster_name=self.cluster.name,
+                # Launch template, AMI type and instance types force a replacement, which creates the new group
+                # before deleting the old one, so the physical name has to change with it
+                node_group_name_prefix=f"{project_name}-{environment}-ng-" if is_default else f"{project_name}-{environment}-ng-{pool_name}-",
+                node_role_arn=eks_node_iam_role_arn,
+                subnet_ids=self.node_subnet_ids,
+                scaling_config={
+                    "desired_size": pool.get("desired_size", min_size),
+                    "max_size": pool.get("max_size", min_size),
+                    "min_size": min_size
+                },
+                capacity_type=pool.get("capacity_type", "ON_DEMAND"),
+                ami_type=AMI_TYPES[pool.get("architecture", "x86_64")],
+                instance_types=pool["instance_types"],
+                launch_template={
+                    "id": self.launch_templates[pool_name].id,
+                    "version": self.launch_templates[pool_name].latest_version.apply(str)
+                },
+                labels={
+                    "node-pool": pool_name,
+                    **pool.get("labels", {})
+                },
+                taints=pool.get("taints", []),
+                update_config={
+                    "max_unavailable": 1
+                },
+                tags={
+                    "Name": f"{project_name}-{environment}-eks-node-group" if is_default else f"{project_name}-{environment}-eks-node-group-{pool_name}",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=ResourceOptions.merge(self.opts, ResourceOptions(depends_on=[self.vpc_cni_addon]))
+            )
+
+        self.node_group = next(iter(self.node_groups.values()))
+
+        # Create OIDC identity provider so service accounts can assume IAM roles (IRSA)
+        self.oidc_provider = iam.OpenIdConnectProvider(
+            f"{name}-oidc-provider",
+            url=self.cluster.identities[0].oidcs[0].issuer,
+            client_id_lists=["sts.amazonaws.com"],
+            thumbprint_lists=[EKS_OIDC_THUMBPRINT],
             tags={
-                "Name": f"{project_name}-{environment}-eks-logs",
+                "Name": f"{project_name}-{environment}-eks-oidc",
                 "Project": project_name,
                 "Environment": environment,
                 "ManagedBy": "Pulumi"
@@ -152,6 +306,138 @@ class Eks:
             opts=self.opts
         )
 
+        # Create Kubernetes provider for in-cluster resources; tokens are requested from the cluster's own
+        # region, not whichever region the deploying shell defaults to
+        region = get_region(opts=pulumi.InvokeOptions(parent=self)).name
+        self.k8s_provider = k8s.Provider(
+            f"{name}-k8s-provider",
+            kubeconfig=pulumi.Output.all(
+                self.cluster.name,
+                self.cluster.endpoint,
+                self.cluster.certificate_authority.data
+            ).apply(lambda args: json.dumps({
+                "apiVersion": "v1",
+                "kind": "Config",
+                "clusters": [{
+                    "name": args[0],
+                    "cluster": {
+                        "server": args[1],
+                        "certificate-authority-data": args[2]
+                    }
+                }],
+                "contexts": [{
+                    "name": args[0],
+                    "context": {
+                        "cluster": args[0],
+                        "user": args[0]
+                    }
+                }],
+                "current-context": args[0],
+                "users": [{
+                    "name": args[0],
+                    "user": {
+                        "exec": {
+                            "apiVersion": "client.authentication.k8s.io/v1beta1",
+                            "command": "aws",
+                            "args": ["eks", "get-token", "--cluster-name", args[0], "--region", region]
+                        }
+                    }
+                }]
+            })),
+            opts=ResourceOptions.merge(self.opts, ResourceOptions(depends_on=list(self.node_groups.values())))
+        )
+
+        # Enable Container Insights through the CloudWatch observability add-on
+        self.observability_addon = None
+        if container_insights_enabled:
+            self.cloudwatch_agent_role = self.create_irsa_role(
+                "cloudwatch-agent",
+                namespace="amazon-cloudwatch",
+                service_account="cloudwatch-agent",
+                policy_arns=[
+                    "arn:aws:iam::aws:policy/CloudWatchAgentServerPolicy",
+                    "arn:aws:iam::aws:policy/AWSXrayWriteOnlyAccess"
+                ]
+            )
+
+            self.observability_addon = eks.Addon(
+                f"{name}-cloudwatch-observability",
+                cluster_name=self.cluster.name,
+                addon_name="amazon-cloudwatch-observability",
+                service_account_role_arn=self.cloudwatch_agent_role.arn,
+                resolve_conflicts_on_create="OVERWRITE",
+                resolve_conflicts_on_update="OVERWRITE",
+                tags={
+                    "Name": f"{project_name}-{environment}-cloudwatch-observability",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=ResourceOptions.merge(self.opts, ResourceOptions(depends_on=list(self.node_groups.values())))
+            )
+
+        # Install Karpenter for just-in-time node provisioning
+        self.karpenter = None
+        if karpenter_enabled:
+            self.karpenter = Karpenter(
+                f"{name}-karpenter",
+                project_name=project_name,
+                environment=environment,
+                eks=self,
+                version=karpenter_version,
+                cpu_limit=karpenter_cpu_limit,
+                max_pods=max(pool.get("max_pods", 110) for pool in self.node_pools),
+                opts=self.opts
+            )
+
+        self.register_outputs({
+            "cluster_name": self.cluster_name,
+            "cluster_endpoint": self.cluster_endpoint,
+            "oidc_provider_arn": self.oidc_provider_arn,
+            "node_group_names": self.node_group_names
+        })
+
+    # Create an IAM role that a Kubernetes service account can assume through the cluster OIDC provider
+    def create_irsa_role(self, role_name, namespace, service_account, policy_arns=None):
+        role = iam.Role(
+            f"{self.name}-{role_name}-irsa-role",
+            assume_role_policy=pulumi.Output.all(self.oidc_provider.arn, self.oidc_provider.url).apply(
+                lambda args: json.dumps({
+                    "Version": "2012-10-17",
+                    "Statement": [{
+                        "Action": "sts:AssumeRoleWithWebIdentity",
+                        "Effect": "Allow",
+                        "Principal": {
+                            "Federated": args[0]
+                        },
+                        "Condition": {
+                            "StringEquals": {
+                                f"{args[1].replace('https://', '')}:sub": f"system:serviceaccount:{namespace}:{service_account}",
+                                f"{args[1].replace('https://', '')}:aud": "sts.amazonaws.com"
+                            }
+                        }
+                    }]
+                })
+            ),
+            tags={
+                "Name": f"{self.project_name}-{self.environment}-{role_name}-irsa-role",
+                "Project": self.project_name,
+                "Environment": self.environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        for i, policy_arn in enumerate(policy_arns or []):
+            iam.RolePolicyAttachment(
+                f"{self.name}-{role_name}-irsa-policy-{i}",
+                role=role.name,
+                policy_arn=policy_arn,
+                opts=self.opts
+            )
+
+        return role
+
     @property
     def cluster_id(self):
         return self.cluster.id
@@ -168,6 +454,32 @@ class Eks:
     def cluster_certificate_authority_data(self):
         return self.cluster.certificate_authority.data
 
+    @property
+    def node_group_names(self):
+        return {pool_name: node_group.node_group_name for pool_name, node_group in self.node_groups.items()}
+
+    @property
+    def node_group_arns(self):
+        return {pool_name: node_group.arn for pool_name, node_group in self.node_groups.items()}
+
+    @property
+    def oidc_provider_arn(self):
+        return self.oidc_provider.arn
+
+    @property
+    def karpenter_interruption_queue_name(self):
+        return self.karpenter.interruption_queue.name if self.karpenter else None
+
+    @property
+    def cloudwatch_log_group_name(self):
+        return self.cloudwatch_log_group.name
+
     @property
     def cluster_security_group_id(self):
-        return self.cluster_security_group.id 
\ No newline at end of file
+        return self.cluster_security_group.id
+
+    # Security group EKS creates for the cluster; managed and Karpenter nodes carry it, so pods reach
+    # the data stores through it
+    @property
+    def managed_cluster_security_group_id(self):
+        return self.cluster.vpc_config.cluster_security_group_id
@@ -0,0 +1,320 @@
+import json
+import pulumi
+import pulumi_kubernetes as k8s
+from pulumi import ResourceOptions
+from pulumi_aws import cloudwatch, iam, sqs, get_caller_identity, get_partition, get_region
+from .user_data import node_sysctl_script
+
+# EventBridge events that Karpenter reacts to by draining the affected node ahead of time
+INTERRUPTION_EVENTS = {
+    "scheduled-change": {
+        "source": ["aws.health"],
+        "detail-type": ["AWS Health Event"]
+    },
+    "spot-interruption": {
+        "source": ["aws.ec2"],
+        "detail-type": ["EC2 Spot Instance Interruption Warning"]
+    },
+    "rebalance": {
+        "source": ["aws.ec2"],
+        "detail-type": ["EC2 Instance Rebalance Recommendation"]
+    },
+    "instance-state-change": {
+        "source": ["aws.ec2"],
+        "detail-type": ["EC2 Instance State-change Notification"]
+    }
+}
+
+class Karpenter(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, eks, version="1.0.6", cpu_limit=200, max_pods=110, opts=None):
+        super().__init__("aidocs:eks:Karpenter", name, None, opts)
+        self.name = name
+        self.project_name = project_name
+        self.environment = environment
+        # Resources predate the component, the alias keeps their original top-level URNs
+        self.opts = ResourceOptions(parent=self, aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)])
+
+        cluster_name = f"{project_name}-{environment}"
+        partition = get_partition(opts=pulumi.InvokeOptions(parent=self)).partition
+        account_id = get_caller_identity(opts=pulumi.InvokeOptions(parent=self)).account_id
+        region = get_region(opts=pulumi.InvokeOptions(parent=self)).name
+
+        # Create SQS queue for interruption events
+        self.interruption_queue = sqs.Queue(
+            f"{name}-interruption-queue",
+            name=f"{cluster_name}-karpenter",
+            message_retention_seconds=300,
+            sqs_managed_sse_enabled=True,
+            tags={
+                "Name": f"{cluster_name}-karpenter-interruption-queue",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        sqs.QueuePolicy(
+            f"{name}-interruption-queue-policy",
+            queue_url=self.interruption_queue.id,
+            policy=self.interruption_queue.arn.apply(lambda arn: json.dumps({
+                "Version": "2012-10-17",
+                "Statement": [{
+                    "Effect": "Allow",
+                    "Principal": {
+                        "Service": ["events.amazonaws.com", "sqs.amazonaws.com"]
+                    },
+                    "Action": "sqs:SendMessage",
+                    "Resource": arn
+                }]
+            })),
+            opts=self.opts
+        )
+
+        # Route interruption events to the queue
+        for event_name, event_pattern in INTERRUPTION_EVENTS.items():
+            rule = cloudwatch.EventRule(
+                f"{name}-{event_name}",
+                name=f"{cluster_name}-karpenter-{event_name}",
+                event_pattern=json.dumps(event_pattern),
+                tags={
+                    "Name": f"{cluster_name}-karpenter-{event_name}",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts
+            )
+
+            cloudwatch.EventTarget(
+                f"{name}-{event_name}-target",
+                rule=rule.name,
+                arn=self.interruption_queue.arn,
+                opts=self.opts
+            )
+
+        # Create IAM policy for the Karpenter controller
+        self.controller_policy = iam.Policy(
+            f"{name}-controller-policy",
+            # IAM is global, so the policy name carries the region of the cluster it serves
+            name=f"{cluster_name}-{region}-karpenter-controller",
+            policy=pulumi.Output.all(self.interruption_queue.arn, eks.eks_node_iam_role_arn).apply(
+                lambda args: json.dumps({
+                    "Version": "2012-10-17",
+                    "Statement": [
+                        {
+                            "Sid": "Provisioning",
+                            "Effect": "Allow",
+                            "Action": [
+                                "ec2:CreateFleet",
+                                "ec2:CreateLaunchTemplate",
+                                "ec2:CreateTags",
+                                "ec2:DeleteLaunchTemplate",
+                                "ec2:RunInstances",
+                                "ec2:TerminateInstances",
+                                "ec2:DescribeAvailabilityZones",
+                                "ec2:DescribeImages",
+                                "ec2:DescribeInstances",
+                                "ec2:DescribeInstanceTypeOfferings",
+                                "ec2:DescribeInstanceTypes",
+                                "ec2:DescribeLaunchTemplates",
+                                "ec2:DescribeSecurityGroups",
+                                "ec2:DescribeSpotPriceHistory",
+                                "ec2:DescribeSubnets",
+                                "pricing:GetProducts",
+                                "ssm:GetParameter"
+                            ],
+                            "Resource": "*"
+                        },
+                        {
+                            "Sid": "InstanceProfiles",
+                            "Effect": "Allow",
+                            "Action": [
+                                "iam:AddRoleToInstanceProfile",
+                                "iam:CreateInstanceProfile",
+                                "iam:DeleteInstanceProfile",
+                                "iam:GetInstanceProfile",
+                                "iam:RemoveRoleFromInstanceProfile",
+                                "iam:TagInstanceProfile"
+                            ],
+                            "Resource": "*"
+                        },
+                        {
+                            "Sid": "PassNodeRole",
+                            "Effect": "Allow",
+                            "Action": "iam:PassRole",
+                            "Resource": args[1]
+                        },
+                        {
+                            "Sid": "Interruption",
+                            "Effect": "Allow",
+                            "Action": [
+                                "sqs:DeleteMessage",
+                                "sqs:GetQueueUrl",
+                                "sqs:ReceiveMessage"
+                            ],
+                            "Resource": args[0]
+                        },
+                        {
+                            "Sid": "ClusterDiscovery",
+                            "Effect": "Allow",
+                            "Action": "eks:DescribeCluster",
+                            "Resource": f"arn:{partition}:eks:{region}:{account_id}:cluster/{cluster_name}"
+                        }
+                    ]
+                })
+            ),
+            tags={
+                "Name": f"{cluster_name}-karpenter-controller",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        self.controller_role = eks.create_irsa_role(
+            "karpenter",
+            namespace="karpenter",
+            service_account="karpenter",
+            policy_arns=[self.controller_policy.arn]
+        )
+
+        # Install the Karpenter controller; it runs on the managed node groups
+        self.namespace = k8s.core.v1.Namespace(
+            f"{name}-namespace",
+            metadata={
+                "name": "karpenter"
+            },
+            opts=ResourceOptions.merge(self.opts, ResourceOptions(provider=eks.k8s_provider))
+        )
+
+        self.release = k8s.helm.v3.Release(
+            f"{name}-release",
+            name="karpenter",
+            chart="oci://public.ecr.aws/karpenter/karpenter",
+            version=version,
+            namespace=self.namespace.metadata["name"],
+            values={
+                "settings": {
+                    "clusterName": eks.cluster.name,
+                    "clusterEndpoint": eks.cluster.endpoint,
+                    "interruptionQueue": self.interruption_queue.name
+                },
+                "serviceAccount": {
+                    "name": "karpenter",
+                    "annotations": {
+                        "eks.amazonaws.com/role-arn": self.controller_role.arn
+                    }
+                },
+                "controller": {
+                    "resources": {
+                        "requests": {
+                            "cpu": "500m",
+                            "memory": "512Mi"
+                        },
+                        "limits": {
+                            "cpu": "1",
+                            "memory": "1Gi"
+                        }
+                    }
+                }
+            },
+            opts=ResourceOptions.merge(self.opts, ResourceOptions(provider=eks.k8s_provider))
+        )
+
+        # Default node class and pool: spot first, on-demand fallback, both architectures
+        self.node_class = k8s.apiextensions.CustomResource(
+            f"{name}-node-class",
+            api_version="karpenter.k8s.aws/v1",
+            kind="EC2NodeClass",
+            metadata={
+                "name": "default"
+            },
+            spec={
+                "amiSelectorTerms": [{
+                    "alias": "al2023@latest"
+                }],
+                "kubelet": {
+                    "maxPods": max_pods
+                },
+                "blockDeviceMappings": [{
+                    "deviceName": "/dev/xvda",
+                    "ebs": {
+                        "volumeSize": "50Gi",
+                        "volumeType": "gp3",
+                        "iops": 3000,
+                        "throughput": 125,
+                        "encrypted": True,
+                        "deleteOnTermination": True
+                    }
+                }],
+                "userData": node_sysctl_script(),
+                "role": eks.eks_node_iam_role_arn.apply(lambda arn: arn.split("/")[-1]),
+                "subnetSelectorTerms": [{"id": subnet_id} for subnet_id in eks.node_subnet_ids],
+                "securityGroupSelectorTerms": [{
+                    "id": eks.managed_cluster_security_group_id
+                }],
+                "tags": {
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Karpenter"
+                }
+            },
+            opts=ResourceOptions.merge(self.opts, ResourceOptions(provider=eks.k8s_provider, depends_on=[self.release]))
+        )
+
+        self.node_pool = k8s.apiextensions.CustomResource(
+            f"{name}-node-pool",
+            api_version="karpenter.sh/v1",
+            kind="NodePool",
+            metadata={
+                "name": "default"
+            },
+            spec={
+                "template": {
+                    "spec": {
+                        "nodeClassRef": {
+                            "group": "karpenter.k8s.aws",
+                            "kind": "EC2NodeClass",
+                            "name": "default"
+                        },
+                        "requirements": [
+                            {
+                                "key": "karpenter.sh/capacity-type",
+                                "operator": "In",
+                                "values": ["spot", "on-demand"]
+                            },
+                            {
+                                "key": "kubernetes.io/arch",
+                                "operator": "In",
+                                "values": ["amd64", "arm64"]
+                            },
+                            {
+                                "key": "karpenter.k8s.aws/instance-category",
+                                "operator": "In",
+                                "values": ["c", "m", "r"]
+                            },
+                            {
+                                "key": "karpenter.k8s.aws/instance-generation",
+                                "operator": "Gt",
+                                "values": ["5"]
+                            }
+                        ],
+                        "expireAfter": "720h"
+                    }
+                },
+                "limits": {
+                    "cpu": str(cpu_limit)
+                },
+                "disruption": {
+                    "consolidationPolicy": "WhenEmptyOrUnderutilized",
+                    "consolidateAfter": "1m"
+                }
+            },
+            opts=ResourceOptions.merge(self.opts, ResourceOptions(provider=eks.k8s_provider, depends_on=[self.node_class]))
+        )
+
+        self.register_outputs({
+            "interruption_queue_name": self.interruption_queue.name
+        })
@@ -0,0 +1,55 @@
+import base64
+
+# Kernel settings for nodes serving many short-lived connections
+NODE_SYSCTLS = {
+    "net.core.somaxconn": 65535,
+    "net.ipv4.tcp_max_syn_backlog": 65535,
+    "net.core.netdev_max_backlog": 16384,
+    "net.ipv4.ip_local_port_range": "1024 65535",
+    "net.ipv4.tcp_tw_reuse": 1,
+    "net.netfilter.nf_conntrack_max": 1048576,
+    "fs.file-max": 2097152,
+    "fs.nr_open": 2097152,
+    "fs.inotify.max_user_watches": 524288,
+    "fs.inotify.max_user_instances": 8192
+}
+
+def node_sysctl_script():
+    sysctls = "\n".join(f"{key} = {value}" for key, value in NODE_SYSCTLS.items())
+    return f"""#!/bin/bash
+set -euo pipefail
+cat > /etc/sysctl.d/99-aidocs.conf <<'SYSCTL'
+{sysctls}
+SYSCTL
+modprobe nf_conntrack
+sysctl --system
+mkdir -p /etc/systemd/system/containerd.service.d
+cat > /etc/systemd/system/containerd.service.d/99-nofile.conf <<'UNIT'
+[Service]
+LimitNOFILE=1048576
+UNIT
+# containerd may already be running; containers inherit its limit, so restart it to apply the drop-in
+systemctl daemon-reload
+systemctl restart containerd
+"""
+
+def node_user_data(max_pods):
+    return base64.b64encode(f"""MIME-Version: 1.0
+Content-Type: multipart/mixed; boundary="BOUNDARY"
+
+--BOUNDARY
+Content-Type: application/node.eks.aws
+
+apiVersion: node.eks.aws/v1alpha1
+kind: NodeConfig
+spec:
+  kubelet:
+    config:
+      maxPods: {max_pods}
+
+--BOUNDARY
+Content-Type: text/x-shellscript; charset="us-ascii"
+
+{node_sysctl_script()}
+--BOUNDARY--
+""".encode()).decode()
\ No newline at end of file
@@ -0,0 +1,3 @@
+from .log_metrics import LogMetrics
+
+__all__ = ['LogMetrics']
\ No newline at end of file
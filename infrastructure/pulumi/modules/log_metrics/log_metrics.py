@@ -0,0 +1,130 @@
+import pulumi
+from pulumi import ResourceOptions
+from pulumi_aws import cloudwatch
+
+# Request metrics extracted from the structured (JSON) API request logs, one metric filter each.
+# The backend's request log middleware (backend/src/middleware/requestLog.ts) writes route (the route
+# template, not the raw path), method, status and latency_ms on every line. Fields are written relative to the log record and prefixed at deploy time.
+ROUTE_METRICS = [
+    {
+        "filter_name": "requests",
+        "metric_name": "RequestCount",
+        "match": "status = *",
+        "value": "1",
+        "unit": "Count"
+    },
+    {
+        "filter_name": "latency",
+        "metric_name": "Latency",
+        "match": "latency_ms = *",
+        "value": "latency_ms",
+        "unit": "Milliseconds"
+    },
+    {
+        "filter_name": "server-errors",
+        "metric_name": "ServerErrorCount",
+        "match": "status >= 500",
+        "value": "1",
+        "unit": "Count"
+    },
+    # Every request reports 100 or 0, so the Average statistic is the 5xx rate in percent
+    {
+        "filter_name": "server-error-rate",
+        "metric_name": "ServerErrorRate",
+        "match": "status >= 500",
+        "value": "100",
+        "unit": "Percent"
+    },
+    {
+        "filter_name": "server-error-rate-ok",
+        "metric_name": "ServerErrorRate",
+        "match": "status < 500",
+        "value": "0",
+        "unit": "Percent"
+    }
+]
+
+# Dimensions are taken from the log record, so new routes show up without any change here
+ROUTE_METRIC_DIMENSIONS = {
+    "route": "route",
+    "method": "method"
+}
+
+# Fluent Bit in the CloudWatch observability add-on nests parsed JSON application logs under log_processed
+DEFAULT_FIELD_PREFIX = "$.log_processed"
+
+def metric_filter_pattern(definition, field_prefix=DEFAULT_FIELD_PREFIX):
+    conditions = [f"{field_prefix}.{field} = *" for field in ROUTE_METRIC_DIMENSIONS.values()]
+    conditions.append(f"{field_prefix}.{definition['match']}")
+    return "{ " + " && ".join(f"({condition})" for condition in conditions) + " }"
+
+def metric_filter_value(definition, field_prefix=DEFAULT_FIELD_PREFIX):
+    value = definition["value"]
+    # Literal values (counters) are used as-is, anything else is a field of the log record
+    return value if value.replace(".", "", 1).isdigit() else f"{field_prefix}.{value}"
+
+class LogMetrics(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, cluster_name, metric_definitions=None,
+                 field_prefix=DEFAULT_FIELD_PREFIX, retention_in_days=30, opts=None):
+        super().__init__("aidocs:logmetrics:LogMetrics", name, None, opts)
+        self.name = name
+        self.project_name = project_name
+        self.environment = environment
+        self.metric_definitions = metric_definitions or ROUTE_METRICS
+        self.namespace = f"{project_name}-{environment}/Api"
+        # Resources predate the component, the alias keeps their original top-level URNs
+        self.opts = ResourceOptions(parent=self, aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)])
+
+        # Create the application log groups the Container Insights agents write to, with a retention
+        self.log_groups = {}
+        for log_type in ["application", "dataplane"]:
+            self.log_groups[log_type] = cloudwatch.LogGroup(
+                f"{name}-{log_type}-logs",
+                name=pulumi.Output.from_input(cluster_name).apply(
+                    lambda cluster, log_type=log_type: f"/aws/containerinsights/{cluster}/{log_type}"
+                ),
+                retention_in_days=retention_in_days,
+                tags={
+                    "Name": f"{project_name}-{environment}-{log_type}-logs",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts
+            )
+
+        self.application_log_group = self.log_groups["application"]
+
+        # Create one metric filter per definition, dimensioned by route and method
+        self.metric_filters = []
+        for definition in self.metric_definitions:
+            filter_name = definition["filter_name"]
+            self.metric_filters.append(cloudwatch.LogMetricFilter(
+                f"{name}-{filter_name}",
+                name=f"{project_name}-{environment}-api-{filter_name}",
+                log_group_name=self.application_log_group.name,
+                pattern=metric_filter_pattern(definition, field_prefix),
+                metric_transformation={
+                    "name": definition["metric_name"],
+                    "namespace": self.namespace,
+                    "value": metric_filter_value(definition, field_prefix),
+                    "unit": definition.get("unit", "None"),
+                    "dimensions": {
+                        dimension: f"{field_prefix}.{field}"
+                        for dimension, field in ROUTE_METRIC_DIMENSIONS.items()
+                    }
+                },
+                opts=self.opts
+            ))
+
+        self.register_outputs({
+            "application_log_group_name": self.application_log_group_name
+        })
+
+    @property
+    def application_log_group_name(self):
+        return self.application_log_group.name
+
+    @property
+    def dimensions(self):
+        return list(ROUTE_METRIC_DIMENSIONS)
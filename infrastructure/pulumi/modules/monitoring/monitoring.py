@@ -1,61 +1,269 @@
+import json
+import re
 import pulumi
 from pulumi import ResourceOptions
 from pulumi_aws import cloudwatch, sns
 
-class Monitoring:
-    def __init__(self, name, project_name, environment, aws_region, alert_email, opts=None):
+def container_insights_widgets(cluster_name, aws_region, workload_namespaces):
+    def metric_widget(title, metrics, x, y, stat="Average", width=8):
+        return {
+            "type": "metric",
+            "x": x,
+            "y": y,
+            "width": width,
+            "height": 6,
+            "properties": {
+                "metrics": metrics,
+                "period": 60,
+                "stat": stat,
+                "region": aws_region,
+                "title": title
+            }
+        }
+
+    def search(dimensions, metric_name, stat="Average", extra=""):
+        return [{
+            "expression": f"SEARCH('{{ContainerInsights,{dimensions}}} MetricName=\"{metric_name}\" ClusterName=\"{cluster_name}\"{extra}', '{stat}', 60)",
+            "id": "e1"
+        }]
+
+    widgets = [
+        metric_widget("EKS Node Utilization", [
+            ["ContainerInsights", "node_cpu_utilization", "ClusterName", cluster_name],
+            ["ContainerInsights", "node_memory_utilization", "ClusterName", cluster_name]
+        ], 0, 0),
+        metric_widget("EKS Node Count", [
+            ["ContainerInsights", "cluster_node_count", "ClusterName", cluster_name],
+            ["ContainerInsights", "cluster_failed_node_count", "ClusterName", cluster_name]
+        ], 8, 0),
+        metric_widget("EKS Pending Pods", [
+            ["ContainerInsights", "pod_status_pending", "ClusterName", cluster_name]
+        ], 16, 0, stat="Maximum"),
+        metric_widget("Pod CPU by Namespace", search("ClusterName,Namespace", "pod_cpu_utilization"), 0, 6),
+        metric_widget("Pod Memory by Namespace", search("ClusterName,Namespace", "pod_memory_utilization"), 8, 6),
+        metric_widget("Running Pods by Service", search("ClusterName,Namespace,Service", "service_number_of_running_pods"), 16, 6)
+    ]
+
+    # Container Insights aggregates pods of a deployment under the deployment name in PodName
+    for i, namespace in enumerate(workload_namespaces):
+        y = 12 + i * 6
+        extra = f" Namespace=\"{namespace}\""
+        widgets.extend([
+            metric_widget(f"{namespace}: CPU by Deployment", search("ClusterName,Namespace,PodName", "pod_cpu_utilization", extra=extra), 0, y),
+            metric_widget(f"{namespace}: Memory by Deployment", search("ClusterName,Namespace,PodName", "pod_memory_utilization", extra=extra), 8, y),
+            metric_widget(f"{namespace}: Container Restarts", search("ClusterName,Namespace,PodName", "pod_number_of_container_restarts", stat="Sum", extra=extra), 16, y, stat="Sum")
+        ])
+
+    return widgets
+
+def bedrock_widgets(models, aws_region, y):
+    widgets = []
+    for i, model in enumerate(models):
+        model_id = model["model_id"]
+        row_y = y + i * 6
+
+        def metric(metric_name, **options):
+            return ["AWS/Bedrock", metric_name, "ModelId", model_id, options] if options else ["AWS/Bedrock", metric_name, "ModelId", model_id]
+
+        tokens_per_minute = {
+            "metrics": [
+                [{"expression": "input + output", "label": "Tokens per minute", "id": "tpm"}],
+                metric("InputTokenCount", id="input", visible=False),
+                metric("OutputTokenCount", id="output", visible=False)
+            ],
+            "period": 60,
+            "stat": "Sum",
+            "region": aws_region,
+            "title": f"{model_id}: Tokens per Minute vs Quota"
+        }
+        if model.get("tokens_per_minute_quota"):
+            tokens_per_minute["annotations"] = {
+                "horizontal": [{
+                    "label": "TPM quota",
+                    "value": model["tokens_per_minute_quota"]
+                }]
+            }
+
+        widgets.extend([
+            {
+                "type": "metric",
+                "x": 0,
+                "y": row_y,
+                "width": 6,
+                "height": 6,
+                "properties": {
+                    "metrics": [
+                        metric("InvocationLatency", stat="p50", label="p50"),
+                        metric("InvocationLatency", stat="p90", label="p90"),
+                        metric("InvocationLatency", stat="p99", label="p99")
+                    ],
+                    "period": 60,
+                    "region": aws_region,
+                    "title": f"{model_id}: Invocation Latency"
+                }
+            },
+            {
+                "type": "metric",
+                "x": 6,
+                "y": row_y,
+                "width": 6,
+                "height": 6,
+                "properties": {
+                    "metrics": [
+                        metric("Invocations"),
+                        metric("InvocationThrottles"),
+                        metric("InvocationClientErrors")
+                    ],
+                    "period": 60,
+                    "stat": "Sum",
+                    "region": aws_region,
+                    "title": f"{model_id}: Invocations, Throttles and Errors"
+                }
+            },
+            {
+                "type": "metric",
+                "x": 12,
+                "y": row_y,
+                "width": 6,
+                "height": 6,
+                "properties": {
+                    "metrics": [
+                        metric("InputTokenCount"),
+                        metric("OutputTokenCount")
+                    ],
+                    "period": 60,
+                    "stat": "Sum",
+                    "region": aws_region,
+                    "title": f"{model_id}: Token Throughput"
+                }
+            },
+            {
+                "type": "metric",
+                "x": 18,
+                "y": row_y,
+                "width": 6,
+                "height": 6,
+                "properties": tokens_per_minute
+            }
+        ])
+    return widgets
+
+def api_route_widgets(namespace, dimensions, aws_region, y):
+    schema = ",".join([f'"{namespace}"'] + dimensions)
+    label = " ".join(f"${{PROP('Dim.{dimension}')}}" for dimension in reversed(dimensions))
+
+    def search(metric_name, stat, expression_id, label_prefix, **options):
+        return [{
+            "expression": f"SEARCH('{{{schema}}} MetricName=\"{metric_name}\"', '{stat}', 60)",
+            "label": f"{label_prefix}{label}",
+            "id": expression_id,
+            **options
+        }]
+
+    return [
+        {
+            "type": "metric",
+            "x": 0,
+            "y": y,
+            "width": 12,
+            "height": 6,
+            "properties": {
+                "metrics": [
+                    search("Latency", "p50", "p50", "p50 "),
+                    search("Latency", "p95", "p95", "p95 "),
+                    search("Latency", "p99", "p99", "p99 ")
+                ],
+                "period": 60,
+                "region": aws_region,
+                "title": "API Latency by Route"
+            }
+        },
+        {
+            "type": "metric",
+            "x": 12,
+            "y": y,
+            "width": 12,
+            "height": 6,
+            "properties": {
+                "metrics": [
+                    search("RequestCount", "Sum", "requests", "requests "),
+                    search("ServerErrorRate", "Average", "error_rate", "5xx % ", yAxis="right")
+                ],
+                "period": 60,
+                "region": aws_region,
+                "title": "API Requests and 5xx Rate by Route"
+            }
+        }
+    ]
+
+class Monitoring(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, aws_region, alert_email, eks_cluster_name=None, workload_namespaces=None,
+                 rds=None, bedrock_models=None, log_metrics=None, eks_log_group_name=None, dashboard_name=None, queues=None, opts=None):
+        super().__init__("aidocs:monitoring:Monitoring", name, None, opts)
         self.name = name
         self.project_name = project_name
         self.environment = environment
         self.aws_region = aws_region
         self.alert_email = alert_email
-        self.opts = opts or ResourceOptions()
+        self.eks_cluster_name = eks_cluster_name or f"{project_name}-{environment}"
+        self.workload_namespaces = workload_namespaces or [project_name]
+        self.bedrock_models = bedrock_models or []
+        # Resources predate the component, the alias keeps their original top-level URNs
+        self.opts = ResourceOptions(parent=self, aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)])
 
         # Create CloudWatch dashboard
         self.dashboard = cloudwatch.Dashboard(
             f"{name}-dashboard",
-            dashboard_name=f"{project_name}-{environment}-dashboard",
+            dashboard_name=dashboard_name or f"{project_name}-{environment}-dashboard",
             dashboard_body=pulumi.Output.all(
-                project_name=project_name,
-                environment=environment
-            ).apply(lambda args: f"""{{
-                "widgets": [
-                    {{
+                self.eks_cluster_name,
+                rds.db_instance_identifier if rds else f"{project_name}-{environment}"
+            ).apply(lambda args: json.dumps({
+                "widgets": container_insights_widgets(args[0], aws_region, self.workload_namespaces) + [
+                    {
                         "type": "metric",
                         "x": 0,
-                        "y": 0,
+                        "y": 12 + len(self.workload_namespaces) * 6,
                         "width": 12,
                         "height": 6,
-                        "properties": {{
+                        "properties": {
                             "metrics": [
-                                ["AWS/EKS", "CPUUtilization", "ClusterName", "{args['project_name']}-{args['environment']}"],
-                                ["AWS/EKS", "MemoryUtilization", "ClusterName", "{args['project_name']}-{args['environment']}"]
+                                ["AWS/RDS", "CPUUtilization", "DBInstanceIdentifier", args[1]],
+                                ["AWS/RDS", "DatabaseConnections", "DBInstanceIdentifier", args[1], {"yAxis": "right"}]
                             ],
-                            "period": 300,
+                            "period": 60,
                             "stat": "Average",
-                            "region": "{aws_region}",
-                            "title": "EKS Cluster Metrics"
-                        }}
-                    }},
-                    {{
+                            "region": aws_region,
+                            "title": "RDS CPU and Connections"
+                        }
+                    },
+                    {
                         "type": "metric",
                         "x": 12,
-                        "y": 0,
+                        "y": 12 + len(self.workload_namespaces) * 6,
                         "width": 12,
                         "height": 6,
-                        "properties": {{
+                        "properties": {
                             "metrics": [
-                                ["AWS/RDS", "CPUUtilization", "DBInstanceIdentifier", "{args['project_name']}-{args['environment']}"],
-                                ["AWS/RDS", "FreeStorageSpace", "DBInstanceIdentifier", "{args['project_name']}-{args['environment']}"]
+                                ["AWS/RDS", "ReadLatency", "DBInstanceIdentifier", args[1]],
+                                ["AWS/RDS", "WriteLatency", "DBInstanceIdentifier", args[1]],
+                                ["AWS/RDS", "DiskQueueDepth", "DBInstanceIdentifier", args[1], {"yAxis": "right"}]
                             ],
-                            "period": 300,
+                            "period": 60,
                             "stat": "Average",
-                            "region": "{aws_region}",
-                            "title": "RDS Metrics"
-                        }}
-                    }}
-                ]
-            }}"""),
+                            "region": aws_region,
+                            "title": "RDS Latency and Queue Depth"
+                        }
+                    }
+                ] + bedrock_widgets(self.bedrock_models, aws_region, 18 + len(self.workload_namespaces) * 6) + (
+                    api_route_widgets(
+                        log_metrics.namespace,
+                        log_metrics.dimensions,
+                        aws_region,
+                        18 + (len(self.workload_namespaces) + len(self.bedrock_models)) * 6
+                    ) if log_metrics else []
+                )
+            })),
             opts=self.opts
         )
 
@@ -81,21 +289,21 @@ class Monitoring:
             opts=self.opts
         )
 
-        # Create EKS CPU alarm
+        # Create EKS node CPU alarm
         self.eks_cpu_alarm = cloudwatch.MetricAlarm(
             f"{name}-eks-cpu",
-            alarm_name=f"{project_name}-{environment}-eks-cpu",
+            name=f"{project_name}-{environment}-eks-cpu",
             comparison_operator="GreaterThanThreshold",
-            evaluation_periods=2,
-            metric_name="CPUUtilization",
-            namespace="AWS/EKS",
-            period=300,
+            evaluation_periods=5,
+            metric_name="node_cpu_utilization",
+            namespace="ContainerInsights",
+            period=60,
             statistic="Average",
             threshold=80,
-            alarm_description="EKS cluster CPU utilization is high",
+            alarm_description="EKS node CPU utilization is high",
             alarm_actions=[self.sns_topic.arn],
             dimensions={
-                "ClusterName": f"{project_name}-{environment}"
+                "ClusterName": self.eks_cluster_name
             },
             tags={
                 "Name": f"{project_name}-{environment}-eks-cpu-alarm",
@@ -106,24 +314,24 @@ class Monitoring:
             opts=self.opts
         )
 
-        # Create RDS CPU alarm
-        self.rds_cpu_alarm = cloudwatch.MetricAlarm(
-            f"{name}-rds-cpu",
-            alarm_name=f"{project_name}-{environment}-rds-cpu",
+        # Create EKS node memory alarm
+        self.eks_memory_alarm = cloudwatch.MetricAlarm(
+            f"{name}-eks-memory",
+            name=f"{project_name}-{environment}-eks-memory",
             comparison_operator="GreaterThanThreshold",
-            evaluation_periods=2,
-            metric_name="CPUUtilization",
-            namespace="AWS/RDS",
-            period=300,
+            evaluation_periods=5,
+            metric_name="node_memory_utilization",
+            namespace="ContainerInsights",
+            period=60,
             statistic="Average",
-            threshold=80,
-            alarm_description="RDS instance CPU utilization is high",
+            threshold=85,
+            alarm_description="EKS node memory utilization is high",
             alarm_actions=[self.sns_topic.arn],
             dimensions={
-                "DBInstanceIdentifier": f"{project_name}-{environment}"
+                "ClusterName": self.eks_cluster_name
             },
             tags={
-                "Name": f"{project_name}-{environment}-rds-cpu-alarm",
+                "Name": f"{project_name}-{environment}-eks-memory-alarm",
                 "Project": project_name,
                 "Environment": environment,
                 "ManagedBy": "Pulumi"
@@ -131,12 +339,81 @@ class Monitoring:
             opts=self.opts
         )
 
+        # Create EKS pending pods alarm; sustained pending pods mean the cluster cannot scale out
+        self.eks_pending_pods_alarm = cloudwatch.MetricAlarm(
+            f"{name}-eks-pending-pods",
+            name=f"{project_name}-{environment}-eks-pending-pods",
+            comparison_operator="GreaterThanThreshold",
+            evaluation_periods=5,
+            metric_name="pod_status_pending",
+            namespace="ContainerInsights",
+            period=60,
+            statistic="Maximum",
+            threshold=0,
+            treat_missing_data="notBreaching",
+            alarm_description="Pods have been pending for 5 minutes",
+            alarm_actions=[self.sns_topic.arn],
+            dimensions={
+                "ClusterName": self.eks_cluster_name
+            },
+            tags={
+                "Name": f"{project_name}-{environment}-eks-pending-pods-alarm",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        # Create EKS failed nodes alarm
+        self.eks_failed_nodes_alarm = cloudwatch.MetricAlarm(
+            f"{name}-eks-failed-nodes",
+            name=f"{project_name}-{environment}-eks-failed-nodes",
+            comparison_operator="GreaterThanThreshold",
+            evaluation_periods=3,
+            metric_name="cluster_failed_node_count",
+            namespace="ContainerInsights",
+            period=60,
+            statistic="Maximum",
+            threshold=0,
+            treat_missing_data="notBreaching",
+            alarm_description="EKS cluster has failed nodes",
+            alarm_actions=[self.sns_topic.arn],
+            dimensions={
+                "ClusterName": self.eks_cluster_name
+            },
+            tags={
+                "Name": f"{project_name}-{environment}-eks-failed-nodes-alarm",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        # Create the database alarm suite; individual alarms only feed the composite alarm below
+        self.rds_alarms = []
+        self.rds_cpu_alarm = None
+        self.rds_degraded_alarm = None
+        if rds:
+            self.create_rds_alarms(rds)
+
+        # Create Bedrock throttling and latency alarms per model
+        self.bedrock_alarms = []
+        for model in self.bedrock_models:
+            self.create_bedrock_alarms(model)
+
+        # Create work queue backlog, age and dead-letter alarms
+        self.queue_alarms = []
+        if queues:
+            self.create_queue_alarms(queues)
+
         # Create error logs metric filter
         self.error_logs_filter = cloudwatch.LogMetricFilter(
             f"{name}-error-logs",
             name=f"{project_name}-{environment}-error-logs",
             pattern="ERROR",
-            log_group_name=f"/aws/eks/{project_name}-{environment}/cluster",
+            log_group_name=eks_log_group_name or f"/aws/eks/{project_name}-{environment}/cluster",
             metric_transformation={
                 "name": "ErrorCount",
                 "namespace": "Custom",
@@ -148,7 +425,7 @@ class Monitoring:
         # Create error logs alarm
         self.error_logs_alarm = cloudwatch.MetricAlarm(
             f"{name}-error-logs",
-            alarm_name=f"{project_name}-{environment}-error-logs",
+            name=f"{project_name}-{environment}-error-logs",
             comparison_operator="GreaterThanThreshold",
             evaluation_periods=1,
             metric_name="ErrorCount",
@@ -167,6 +444,431 @@ class Monitoring:
             opts=self.opts
         )
 
+        self.register_outputs({
+            "dashboard_name": self.dashboard_name,
+            "sns_topic_arn": self.sns_topic_arn
+        })
+
+    def create_rds_alarms(self, rds):
+        # Alarm on the writer by default, everything is keyed off the Rds component outputs
+        identifier = rds.db_instance_identifier
+        dimensions = {
+            "DBInstanceIdentifier": identifier
+        }
+
+        def alarm(key, description, **kwargs):
+            metric_alarm = cloudwatch.MetricAlarm(
+                f"{self.name}-rds-{key}",
+                name=identifier.apply(lambda db_identifier: f"{db_identifier}-rds-{key}"),
+                alarm_description=description,
+                treat_missing_data=kwargs.pop("treat_missing_data", "missing"),
+                tags={
+                    "Name": f"{self.project_name}-{self.environment}-rds-{key}-alarm",
+                    "Project": self.project_name,
+                    "Environment": self.environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts,
+                **kwargs
+            )
+            self.rds_alarms.append(metric_alarm)
+            return metric_alarm
+
+        def anomaly_alarm(key, metric_name, description, band_width=3):
+            return alarm(
+                key,
+                description,
+                comparison_operator="GreaterThanUpperThreshold",
+                evaluation_periods=5,
+                datapoints_to_alarm=4,
+                threshold_metric_id="band",
+                metric_queries=[
+                    {
+                        "id": "m1",
+                        "return_data": True,
+                        "metric": {
+                            "metric_name": metric_name,
+                            "namespace": "AWS/RDS",
+                            "period": 60,
+                            "stat": "Average",
+                            "dimensions": dimensions
+                        }
+                    },
+                    {
+                        "id": "band",
+                        "expression": f"ANOMALY_DETECTION_BAND(m1, {band_width})",
+                        "label": f"{metric_name} (expected)",
+                        "return_data": True
+                    }
+                ]
+            )
+
+        def ratio_alarm(key, expression, metrics, threshold, description, comparison_operator="GreaterThanThreshold"):
+            return alarm(
+                key,
+                description,
+                comparison_operator=comparison_operator,
+                evaluation_periods=5,
+                datapoints_to_alarm=4,
+                threshold=threshold,
+                metric_queries=[
+                    {
+                        "id": "ratio",
+                        "expression": expression,
+                        "label": key,
+                        "return_data": True
+                    }
+                ] + [
+                    {
+                        "id": metric_id,
+                        "return_data": False,
+                        "metric": {
+                            "metric_name": metric_name,
+                            "namespace": "AWS/RDS",
+                            "period": 60,
+                            "stat": "Average",
+                            "dimensions": dimensions
+                        }
+                    }
+                    for metric_id, metric_name in metrics.items()
+                ]
+            )
+
+        # Static ceiling on CPU; load is cyclical, but saturation is absolute
+        self.rds_cpu_alarm = alarm(
+            "cpu",
+            "RDS instance CPU utilization is high",
+            comparison_operator="GreaterThanThreshold",
+            evaluation_periods=5,
+            datapoints_to_alarm=4,
+            metric_name="CPUUtilization",
+            namespace="AWS/RDS",
+            period=60,
+            statistic="Average",
+            threshold=80,
+            dimensions=dimensions
+        )
+
+        anomaly_alarm("read-latency", "ReadLatency", "RDS read latency is above its expected band")
+        anomaly_alarm("write-latency", "WriteLatency", "RDS write latency is above its expected band")
+
+        alarm(
+            "disk-queue-depth",
+            "RDS I/O requests are queueing on the storage volume",
+            comparison_operator="GreaterThanThreshold",
+            evaluation_periods=5,
+            datapoints_to_alarm=4,
+            metric_name="DiskQueueDepth",
+            namespace="AWS/RDS",
+            period=60,
+            statistic="Average",
+            threshold=10,
+            dimensions=dimensions
+        )
+
+        if rds.max_connections:
+            ratio_alarm(
+                "connections",
+                f"100 * connections / {rds.max_connections}",
+                {"connections": "DatabaseConnections"},
+                80,
+                "RDS connections are above 80% of max_connections"
+            )
+
+        if rds.instance_memory_bytes:
+            ratio_alarm(
+                "freeable-memory",
+                f"100 * memory / {rds.instance_memory_bytes}",
+                {"memory": "FreeableMemory"},
+                10,
+                "RDS freeable memory is below 10% of instance memory",
+                comparison_operator="LessThanThreshold"
+            )
+
+        # Storage autoscaling grows the volume before free space drops below 10% of the current allocation,
+        # which is never smaller than the initial one, so an absolute floor stays valid after every grow
+        if rds.allocated_storage_bytes:
+            alarm(
+                "free-storage",
+                "RDS free storage is below 10% of the initial allocation; autoscaling has stalled or reached its maximum",
+                comparison_operator="LessThanThreshold",
+                evaluation_periods=5,
+                datapoints_to_alarm=4,
+                metric_name="FreeStorageSpace",
+                namespace="AWS/RDS",
+                period=60,
+                statistic="Minimum",
+                threshold=rds.allocated_storage_bytes // 10,
+                dimensions=dimensions
+            )
+
+        if rds.provisioned_iops:
+            ratio_alarm(
+                "iops",
+                f"100 * (reads + writes) / {rds.provisioned_iops}",
+                {"reads": "ReadIOPS", "writes": "WriteIOPS"},
+                90,
+                "RDS IOPS are above 90% of the provisioned IOPS"
+            )
+
+        if rds.is_aurora:
+            alarm(
+                "acu-utilization",
+                "Aurora Serverless v2 capacity is close to the configured maximum",
+                comparison_operator="GreaterThanThreshold",
+                evaluation_periods=5,
+                datapoints_to_alarm=4,
+                metric_name="ACUUtilization",
+                namespace="AWS/RDS",
+                period=60,
+                statistic="Average",
+                threshold=90,
+                dimensions=dimensions
+            )
+
+        for i, replica_identifier in enumerate(rds.db_replica_identifiers):
+            alarm(
+                f"replica-lag-{i}",
+                "RDS read replica is lagging behind the writer",
+                comparison_operator="GreaterThanThreshold",
+                evaluation_periods=5,
+                datapoints_to_alarm=4,
+                # Aurora reports lag in milliseconds, RDS replicas in seconds
+                metric_name="AuroraReplicaLag" if rds.is_aurora else "ReplicaLag",
+                namespace="AWS/RDS",
+                period=60,
+                statistic="Maximum",
+                threshold=1000 if rds.is_aurora else 30,
+                dimensions={
+                    "DBInstanceIdentifier": replica_identifier
+                }
+            )
+
+        # A cross-region copy serves this region's reads, so its lag behind the source region matters too
+        if rds.is_cross_region_replica:
+            alarm(
+                "cross-region-lag",
+                "Cross-region database copy is lagging behind the source region",
+                comparison_operator="GreaterThanThreshold",
+                evaluation_periods=5,
+                datapoints_to_alarm=4,
+                metric_name="AuroraGlobalDBReplicationLag" if rds.is_aurora else "ReplicaLag",
+                namespace="AWS/RDS",
+                period=60,
+                statistic="Maximum",
+                threshold=1000 if rds.is_aurora else 30,
+                dimensions={
+                    "DBClusterIdentifier": rds.db_cluster_identifier
+                } if rds.is_aurora else dimensions
+            )
+
+        # Page once when any of the database alarms fire
+        self.rds_degraded_alarm = cloudwatch.CompositeAlarm(
+            f"{self.name}-rds-degraded",
+            alarm_name=identifier.apply(lambda db_identifier: f"{db_identifier}-database-degraded"),
+            alarm_description="Database degraded: one or more RDS performance alarms are firing",
+            alarm_rule=pulumi.Output.all(*[metric_alarm.arn for metric_alarm in self.rds_alarms]).apply(
+                lambda arns: " OR ".join(f"ALARM(\"{arn}\")" for arn in arns)
+            ),
+            alarm_actions=[self.sns_topic.arn],
+            ok_actions=[self.sns_topic.arn],
+            tags={
+                "Name": f"{self.project_name}-{self.environment}-rds-degraded-alarm",
+                "Project": self.project_name,
+                "Environment": self.environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+    def create_bedrock_alarms(self, model):
+        model_id = model["model_id"]
+        key = re.sub(r"[^a-zA-Z0-9-]", "-", model_id)
+        dimensions = {
+            "ModelId": model_id
+        }
+        tags = {
+            "Project": self.project_name,
+            "Environment": self.environment,
+            "ManagedBy": "Pulumi"
+        }
+
+        # Throttle rate as a percentage of invocations
+        self.bedrock_alarms.append(cloudwatch.MetricAlarm(
+            f"{self.name}-bedrock-{key}-throttles",
+            name=f"{self.project_name}-{self.environment}-bedrock-{key}-throttles",
+            comparison_operator="GreaterThanThreshold",
+            evaluation_periods=5,
+            datapoints_to_alarm=3,
+            threshold=model.get("throttle_rate_threshold", 5),
+            treat_missing_data="notBreaching",
+            alarm_description=f"Bedrock is throttling more than {model.get('throttle_rate_threshold', 5)}% of {model_id} invocations",
+            alarm_actions=[self.sns_topic.arn],
+            metric_queries=[
+                {
+                    "id": "throttle_rate",
+                    "expression": "100 * throttles / MAX([invocations, 1])",
+                    "label": "Throttle rate (%)",
+                    "return_data": True
+                },
+                {
+                    "id": "throttles",
+                    "return_data": False,
+                    "metric": {
+                        "metric_name": "InvocationThrottles",
+                        "namespace": "AWS/Bedrock",
+                        "period": 60,
+                        "stat": "Sum",
+                        "dimensions": dimensions
+                    }
+                },
+                {
+                    "id": "invocations",
+                    "return_data": False,
+                    "metric": {
+                        "metric_name": "Invocations",
+                        "namespace": "AWS/Bedrock",
+                        "period": 60,
+                        "stat": "Sum",
+                        "dimensions": dimensions
+                    }
+                }
+            ],
+            tags={
+                "Name": f"{self.project_name}-{self.environment}-bedrock-{key}-throttles-alarm",
+                **tags
+            },
+            opts=self.opts
+        ))
+
+        # p99 invocation latency
+        self.bedrock_alarms.append(cloudwatch.MetricAlarm(
+            f"{self.name}-bedrock-{key}-latency",
+            name=f"{self.project_name}-{self.environment}-bedrock-{key}-p99-latency",
+            comparison_operator="GreaterThanThreshold",
+            evaluation_periods=5,
+            datapoints_to_alarm=3,
+            metric_name="InvocationLatency",
+            namespace="AWS/Bedrock",
+            period=60,
+            extended_statistic="p99",
+            threshold=model.get("p99_latency_threshold_ms", 30000),
+            treat_missing_data="notBreaching",
+            alarm_description=f"{model_id} p99 invocation latency is above {model.get('p99_latency_threshold_ms', 30000)} ms",
+            alarm_actions=[self.sns_topic.arn],
+            dimensions=dimensions,
+            tags={
+                "Name": f"{self.project_name}-{self.environment}-bedrock-{key}-latency-alarm",
+                **tags
+            },
+            opts=self.opts
+        ))
+
+        # Tokens per minute approaching the account quota
+        if model.get("tokens_per_minute_quota"):
+            self.bedrock_alarms.append(cloudwatch.MetricAlarm(
+                f"{self.name}-bedrock-{key}-tpm",
+                name=f"{self.project_name}-{self.environment}-bedrock-{key}-tpm-quota",
+                comparison_operator="GreaterThanThreshold",
+                evaluation_periods=5,
+                datapoints_to_alarm=3,
+                threshold=80,
+                treat_missing_data="notBreaching",
+                alarm_description=f"{model_id} tokens per minute are above 80% of the account quota",
+                alarm_actions=[self.sns_topic.arn],
+                metric_queries=[
+                    {
+                        "id": "quota_usage",
+                        "expression": f"100 * (input + output) / {model['tokens_per_minute_quota']}",
+                        "label": "TPM quota usage (%)",
+                        "return_data": True
+                    }
+                ] + [
+                    {
+                        "id": metric_id,
+                        "return_data": False,
+                        "metric": {
+                            "metric_name": metric_name,
+                            "namespace": "AWS/Bedrock",
+                            "period": 60,
+                            "stat": "Sum",
+                            "dimensions": dimensions
+                        }
+                    }
+                    for metric_id, metric_name in [("input", "InputTokenCount"), ("output", "OutputTokenCount")]
+                ],
+                tags={
+                    "Name": f"{self.project_name}-{self.environment}-bedrock-{key}-tpm-alarm",
+                    **tags
+                },
+                opts=self.opts
+            ))
+
+    def create_queue_alarms(self, queues):
+        tags = {
+            "Project": self.project_name,
+            "Environment": self.environment,
+            "ManagedBy": "Pulumi"
+        }
+
+        def alarm(key, queue_name, description, **kwargs):
+            self.queue_alarms.append(cloudwatch.MetricAlarm(
+                f"{self.name}-queue-{key}",
+                name=f"{self.project_name}-{self.environment}-queue-{key}",
+                comparison_operator="GreaterThanThreshold",
+                namespace="AWS/SQS",
+                period=60,
+                statistic="Maximum",
+                treat_missing_data="notBreaching",
+                alarm_description=description,
+                alarm_actions=[self.sns_topic.arn],
+                dimensions={
+                    "QueueName": queue_name
+                },
+                tags={
+                    "Name": f"{self.project_name}-{self.environment}-queue-{key}-alarm",
+                    **tags
+                },
+                opts=self.opts,
+                **kwargs
+            ))
+
+        for definition in queues.queue_definitions:
+            queue_key = definition["name"]
+            # Backlog beyond what the workers drain at full scale-out
+            depth_threshold = definition.get(
+                "depth_alarm_threshold",
+                definition["messages_per_replica"] * definition["max_replicas"]
+            )
+            age_threshold = definition.get("age_alarm_seconds", definition["max_age_seconds"] * 2)
+
+            alarm(
+                f"{queue_key}-depth",
+                queues.queues[queue_key].name,
+                f"{queue_key} queue backlog is above {depth_threshold} messages",
+                metric_name="ApproximateNumberOfMessagesVisible",
+                evaluation_periods=10,
+                datapoints_to_alarm=8,
+                threshold=depth_threshold
+            )
+            alarm(
+                f"{queue_key}-age",
+                queues.queues[queue_key].name,
+                f"Oldest {queue_key} message has waited more than {age_threshold} seconds",
+                metric_name="ApproximateAgeOfOldestMessage",
+                evaluation_periods=5,
+                datapoints_to_alarm=4,
+                threshold=age_threshold
+            )
+            alarm(
+                f"{queue_key}-dlq",
+                queues.dead_letter_queues[queue_key].name,
+                f"{queue_key} messages are failing into the dead-letter queue",
+                metric_name="ApproximateNumberOfMessagesVisible",
+                evaluation_periods=1,
+                threshold=0
+            )
+
     @property
     def dashboard_name(self):
         return self.dashboard.dashboard_name
@@ -179,10 +881,18 @@ class Monitoring:
     def eks_cpu_alarm_arn(self):
         return self.eks_cpu_alarm.arn
 
+    @property
+    def eks_pending_pods_alarm_arn(self):
+        return self.eks_pending_pods_alarm.arn
+
     @property
     def rds_cpu_alarm_arn(self):
-        return self.rds_cpu_alarm.arn
+        return self.rds_cpu_alarm.arn if self.rds_cpu_alarm else None
+
+    @property
+    def rds_degraded_alarm_arn(self):
+        return self.rds_degraded_alarm.arn if self.rds_degraded_alarm else None
 
     @property
     def error_logs_alarm_arn(self):
-        return self.error_logs_alarm.arn 
\ No newline at end of file
+        return self.error_logs_alarm.arn
\ No newline at end of file
@@ -0,0 +1,3 @@
+from .perf import Perf
+
+__all__ = ['Perf']
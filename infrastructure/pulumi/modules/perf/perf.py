@@ -0,0 +1,444 @@
+import json
+import os
+import pulumi
+import pulumi_kubernetes as k8s
+from pulumi import ResourceOptions
+from pulumi_aws import cloudwatch, iam, s3
+from modules.eks.eks import LOAD_GENERATOR_POOL, LOAD_GENERATOR_TAINT
+
+SCENARIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios")
+
+# Load-test scenarios: virtual users and how long to hold them
+DEFAULT_SCENARIOS = {
+    "crud": {
+        "vus": 50,
+        "duration": "10m"
+    },
+    "search": {
+        "vus": 100,
+        "duration": "10m"
+    },
+    "chat": {
+        "vus": 20,
+        "duration": "10m"
+    }
+}
+
+RUN_METRICS = [
+    ("LatencyP99", "p99 latency (ms)"),
+    ("RequestsPerSecond", "Throughput (requests/s)"),
+    ("ErrorRate", "Error rate (%)")
+]
+
+K6_IMAGE = "grafana/k6:0.54.0"
+AWS_CLI_IMAGE = "amazon/aws-cli:2.17.0"
+WIREMOCK_IMAGE = "wiremock/wiremock:3.9.1"
+
+# Canned Bedrock response, valid for both the text completion and the messages API
+BEDROCK_MOCK_RESPONSE = {
+    "completion": " This is a canned answer from the Bedrock mock used in load tests.",
+    "stop_reason": "stop_sequence",
+    "type": "message",
+    "role": "assistant",
+    "content": [{
+        "type": "text",
+        "text": "This is a canned answer from the Bedrock mock used in load tests."
+    }],
+    "usage": {
+        "input_tokens": 500,
+        "output_tokens": 100
+    }
+}
+
+class Perf(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, eks, target_url, release="adhoc", scenarios=None,
+                 perf_user_email=None, perf_user_password=None, bedrock_mock=True, bedrock_mock_latency_ms=800,
+                 opts=None):
+        super().__init__("aidocs:perf:Perf", name, None, opts)
+        self.name = name
+        self.project_name = project_name
+        self.environment = environment
+        self.release = release
+        self.scenarios = {
+            scenario: {**DEFAULT_SCENARIOS.get(scenario, {}), **overrides}
+            for scenario, overrides in {**{key: {} for key in DEFAULT_SCENARIOS}, **(scenarios or {})}.items()
+        }
+        self.metric_namespace = f"{project_name}-{environment}/LoadTest"
+        self.opts = ResourceOptions(parent=self)
+        k8s_opts = ResourceOptions.merge(self.opts, ResourceOptions(provider=eks.k8s_provider))
+        tags = {
+            "Project": project_name,
+            "Environment": environment,
+            "ManagedBy": "Pulumi"
+        }
+
+        # Create the results bucket; every run writes its k6 summary under <release>/<scenario>/
+        self.results_bucket = s3.BucketV2(
+            f"{name}-results-bucket",
+            bucket=f"{project_name}-{environment}-load-test-results",
+            force_destroy=True,
+            tags={
+                "Name": f"{project_name}-{environment}-load-test-results",
+                **tags
+            },
+            opts=self.opts
+        )
+
+        s3.BucketPublicAccessBlock(
+            f"{name}-results-public-access-block",
+            bucket=self.results_bucket.id,
+            block_public_acls=True,
+            block_public_policy=True,
+            ignore_public_acls=True,
+            restrict_public_buckets=True,
+            opts=self.opts
+        )
+
+        s3.BucketServerSideEncryptionConfigurationV2(
+            f"{name}-results-encryption",
+            bucket=self.results_bucket.id,
+            rules=[{
+                "apply_server_side_encryption_by_default": {
+                    "sse_algorithm": "AES256"
+                }
+            }],
+            opts=self.opts
+        )
+
+        s3.BucketLifecycleConfigurationV2(
+            f"{name}-results-lifecycle",
+            bucket=self.results_bucket.id,
+            rules=[{
+                "id": "expire-old-runs",
+                "status": "Enabled",
+                "filter": {},
+                "expiration": {
+                    "days": 365
+                }
+            }],
+            opts=self.opts
+        )
+
+        # Create the runner IRSA role: upload results and publish the per-run metrics
+        self.runner_policy = iam.Policy(
+            f"{name}-runner-policy",
+            description="Upload load test results and publish run metrics",
+            policy=self.results_bucket.arn.apply(lambda arn: json.dumps({
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Effect": "Allow",
+                        "Action": ["s3:PutObject"],
+                        "Resource": f"{arn}/*"
+                    },
+                    {
+                        "Effect": "Allow",
+                        "Action": ["cloudwatch:PutMetricData"],
+                        "Resource": "*",
+                        "Condition": {
+                            "StringEquals": {
+                                "cloudwatch:namespace": self.metric_namespace
+                            }
+                        }
+                    }
+                ]
+            })),
+            opts=self.opts
+        )
+
+        self.runner_role = eks.create_irsa_role(
+            "k6-runner",
+            namespace="perf",
+            service_account="k6-runner",
+            policy_arns=[self.runner_policy.arn]
+        )
+
+        self.namespace = k8s.core.v1.Namespace(
+            f"{name}-namespace",
+            metadata={
+                "name": "perf"
+            },
+            opts=k8s_opts
+        )
+        namespace = self.namespace.metadata["name"]
+
+        k8s.core.v1.ServiceAccount(
+            f"{name}-runner-sa",
+            metadata={
+                "name": "k6-runner",
+                "namespace": namespace,
+                "annotations": {
+                    "eks.amazonaws.com/role-arn": self.runner_role.arn
+                }
+            },
+            opts=k8s_opts
+        )
+
+        scripts = {}
+        for file_name in sorted(os.listdir(SCENARIO_DIR)):
+            with open(os.path.join(SCENARIO_DIR, file_name)) as script:
+                scripts[file_name] = script.read()
+
+        self.scripts = k8s.core.v1.ConfigMap(
+            f"{name}-scripts",
+            metadata={
+                "name": "k6-scenarios",
+                "namespace": namespace
+            },
+            data=scripts,
+            opts=k8s_opts
+        )
+
+        self.credentials = k8s.core.v1.Secret(
+            f"{name}-credentials",
+            metadata={
+                "name": "perf-user",
+                "namespace": namespace
+            },
+            string_data={
+                "PERF_USER_EMAIL": perf_user_email or f"perf@{project_name}.local",
+                "PERF_USER_PASSWORD": perf_user_password or ""
+            },
+            opts=k8s_opts
+        )
+
+        # Load generators and the Bedrock mock only run on the tainted load-generator pool
+        placement = {
+            "node_selector": {
+                "node-pool": LOAD_GENERATOR_POOL["name"]
+            },
+            "tolerations": [{
+                "key": LOAD_GENERATOR_TAINT["key"],
+                "operator": "Equal",
+                "value": LOAD_GENERATOR_TAINT["value"],
+                "effect": "NoSchedule"
+            }]
+        }
+
+        # Stand-in for Bedrock so runs cost nothing; point the API at it with AWS_ENDPOINT_URL_BEDROCK_RUNTIME
+        self.bedrock_mock_service = None
+        if bedrock_mock:
+            mappings = k8s.core.v1.ConfigMap(
+                f"{name}-bedrock-mock-mappings",
+                metadata={
+                    "name": "bedrock-mock-mappings",
+                    "namespace": namespace
+                },
+                data={
+                    "invoke.json": json.dumps({
+                        "request": {
+                            "method": "POST",
+                            "urlPathPattern": "/model/.+/invoke"
+                        },
+                        "response": {
+                            "status": 200,
+                            "headers": {
+                                "Content-Type": "application/json"
+                            },
+                            "jsonBody": BEDROCK_MOCK_RESPONSE,
+                            # Model latency, so the API holds connections the way it does against Bedrock
+                            "fixedDelayMilliseconds": bedrock_mock_latency_ms
+                        }
+                    })
+                },
+                opts=k8s_opts
+            )
+
+            labels = {
+                "app": "bedrock-mock"
+            }
+            k8s.apps.v1.Deployment(
+                f"{name}-bedrock-mock",
+                metadata={
+                    "name": "bedrock-mock",
+                    "namespace": namespace
+                },
+                spec={
+                    "replicas": 2,
+                    "selector": {
+                        "match_labels": labels
+                    },
+                    "template": {
+                        "metadata": {
+                            "labels": labels
+                        },
+                        "spec": {
+                            **placement,
+                            "containers": [{
+                                "name": "wiremock",
+                                "image": WIREMOCK_IMAGE,
+                                "args": ["--port", "8080", "--no-request-journal", "--async-response-enabled", "true"],
+                                "ports": [{
+                                    "container_port": 8080
+                                }],
+                                "volume_mounts": [{
+                                    "name": "mappings",
+                                    "mount_path": "/home/wiremock/mappings"
+                                }],
+                                "resources": {
+                                    "requests": {
+                                        "cpu": "500m",
+                                        "memory": "512Mi"
+                                    }
+                                }
+                            }],
+                            "volumes": [{
+                                "name": "mappings",
+                                "config_map": {
+                                    "name": mappings.metadata["name"]
+                                }
+                            }]
+                        }
+                    }
+                },
+                opts=k8s_opts
+            )
+
+            self.bedrock_mock_service = k8s.core.v1.Service(
+                f"{name}-bedrock-mock-service",
+                metadata={
+                    "name": "bedrock-mock",
+                    "namespace": namespace
+                },
+                spec={
+                    "selector": labels,
+                    "ports": [{
+                        "port": 80,
+                        "target_port": 8080
+                    }]
+                },
+                opts=k8s_opts
+            )
+
+        # One Job per scenario and release: k6 runs in an init container, then the results are uploaded.
+        # k6 exits non-zero when a threshold fails; the exit code is kept so the upload still happens and
+        # the Job fails afterwards
+        self.jobs = {}
+        for scenario, settings in self.scenarios.items():
+            self.jobs[scenario] = k8s.batch.v1.Job(
+                f"{name}-{scenario}-job",
+                metadata={
+                    "name": f"k6-{scenario}-{release}".lower().replace(".", "-")[:63],
+                    "namespace": namespace,
+                    "annotations": {
+                        # Runs take longer than an update should wait for
+                        "pulumi.com/skipAwait": "true"
+                    }
+                },
+                spec={
+                    "backoff_limit": 0,
+                    "ttl_seconds_after_finished": 7 * 24 * 3600,
+                    "template": {
+                        "metadata": {
+                            "labels": {
+                                "app": "k6",
+                                "scenario": scenario
+                            }
+                        },
+                        "spec": {
+                            **placement,
+                            "service_account_name": "k6-runner",
+                            "restart_policy": "Never",
+                            "init_containers": [{
+                                "name": "k6",
+                                "image": K6_IMAGE,
+                                "command": ["sh", "-c"],
+                                "args": [f"k6 run /scripts/{scenario}.js; echo $? > /results/exit-code"],
+                                "env": [
+                                    {"name": "BASE_URL", "value": target_url},
+                                    {"name": "SCENARIO", "value": scenario},
+                                    {"name": "RELEASE", "value": release},
+                                    {"name": "VUS", "value": str(settings["vus"])},
+                                    {"name": "DURATION", "value": settings["duration"]}
+                                ],
+                                "env_from": [{
+                                    "secret_ref": {
+                                        "name": self.credentials.metadata["name"]
+                                    }
+                                }],
+                                "volume_mounts": [
+                                    {"name": "scripts", "mount_path": "/scripts"},
+                                    {"name": "results", "mount_path": "/results"}
+                                ],
+                                "resources": {
+                                    "requests": {
+                                        "cpu": "2",
+                                        "memory": "2Gi"
+                                    }
+                                }
+                            }],
+                            "containers": [{
+                                "name": "upload",
+                                "image": AWS_CLI_IMAGE,
+                                "command": ["sh", "-c"],
+                                "args": [
+                                    "aws s3 cp /results \"s3://$RESULTS_BUCKET/$RELEASE/$SCENARIO/\" --recursive && "
+                                    "aws cloudwatch put-metric-data --namespace \"$METRIC_NAMESPACE\" --metric-data file:///results/metrics.json && "
+                                    "exit \"$(cat /results/exit-code)\""
+                                ],
+                                "env": [
+                                    {"name": "RESULTS_BUCKET", "value": self.results_bucket.bucket},
+                                    {"name": "METRIC_NAMESPACE", "value": self.metric_namespace},
+                                    {"name": "SCENARIO", "value": scenario},
+                                    {"name": "RELEASE", "value": release}
+                                ],
+                                "volume_mounts": [
+                                    {"name": "results", "mount_path": "/results"}
+                                ]
+                            }],
+                            "volumes": [
+                                {"name": "scripts", "config_map": {"name": self.scripts.metadata["name"]}},
+                                {"name": "results", "empty_dir": {}}
+                            ]
+                        }
+                    }
+                },
+                opts=k8s_opts
+            )
+
+        # Compare runs: one bar per release for each scenario
+        self.dashboard = cloudwatch.Dashboard(
+            f"{name}-dashboard",
+            dashboard_name=f"{project_name}-{environment}-load-tests",
+            dashboard_body=json.dumps({
+                "widgets": [
+                    {
+                        "type": "metric",
+                        "x": (i % 2) * 12,
+                        "y": (i // 2) * 6,
+                        "width": 12,
+                        "height": 6,
+                        "properties": {
+                            "metrics": [[{
+                                "expression": f"SEARCH('{{\"{self.metric_namespace}\",Scenario,Release}} MetricName=\"{metric_name}\"', 'Maximum', 2592000)",
+                                "label": "",
+                                "id": "runs"
+                            }]],
+                            "view": "bar",
+                            "period": 2592000,
+                            "stat": "Maximum",
+                            "title": f"{title} by scenario and release"
+                        }
+                    }
+                    for i, (metric_name, title) in enumerate(RUN_METRICS)
+                ]
+            }),
+            opts=self.opts
+        )
+
+        self.register_outputs({
+            "results_bucket_name": self.results_bucket_name,
+            "dashboard_name": self.dashboard_name
+        })
+
+    @property
+    def results_bucket_name(self):
+        return self.results_bucket.bucket
+
+    @property
+    def dashboard_name(self):
+        return self.dashboard.dashboard_name
+
+    @property
+    def bedrock_mock_endpoint(self):
+        return "http://bedrock-mock.perf.svc.cluster.local" if self.bedrock_mock_service else None
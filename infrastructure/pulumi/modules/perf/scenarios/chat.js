@@ -0,0 +1,27 @@
+import http from "k6/http"
+import { check, sleep } from "k6"
+import { BASE_URL, authHeaders, login } from "./lib.js"
+
+export { options, handleSummary } from "./lib.js"
+
+export function setup() {
+  const session = login()
+  const created = http.post(
+    `${BASE_URL}/api/documents`,
+    JSON.stringify({ title: "perf-chat", content: "Document the chat scenario asks questions about", tags: ["perf"] }),
+    authHeaders(session),
+  )
+  return { ...session, documentId: created.json("id") || created.json("_id") }
+}
+
+// Ask questions about a document, the Bedrock-bound path
+export default function (session) {
+  const response = http.post(
+    `${BASE_URL}/api/ai/ask/${session.documentId}`,
+    JSON.stringify({ question: "What is this document about?" }),
+    { ...authHeaders(session), timeout: "120s" },
+  )
+  check(response, { "answered": (r) => r.status === 200 })
+
+  sleep(2)
+}
@@ -0,0 +1,31 @@
+import http from "k6/http"
+import { check, sleep } from "k6"
+import { BASE_URL, authHeaders, login } from "./lib.js"
+
+export { options, handleSummary } from "./lib.js"
+
+export function setup() {
+  return login()
+}
+
+// Create, read, update and delete a document per iteration
+export default function (session) {
+  const params = authHeaders(session)
+
+  const created = http.post(
+    `${BASE_URL}/api/documents`,
+    JSON.stringify({ title: `perf-${__VU}-${__ITER}`, content: "Load test document", tags: ["perf"] }),
+    params,
+  )
+  check(created, { "created": (r) => r.status === 201 || r.status === 200 })
+  const id = created.json("id") || created.json("_id")
+
+  check(http.get(`${BASE_URL}/api/documents/${id}`, params), { "read": (r) => r.status === 200 })
+  check(
+    http.put(`${BASE_URL}/api/documents/${id}`, JSON.stringify({ title: `perf-${__VU}-${__ITER}-updated` }), params),
+    { "updated": (r) => r.status === 200 },
+  )
+  check(http.del(`${BASE_URL}/api/documents/${id}`, null, params), { "deleted": (r) => r.status === 200 || r.status === 204 })
+
+  sleep(1)
+}
@@ -0,0 +1,61 @@
+import http from "k6/http"
+import { check } from "k6"
+
+export const BASE_URL = __ENV.BASE_URL
+const SCENARIO = __ENV.SCENARIO
+const RELEASE = __ENV.RELEASE
+
+// Ramp to the target number of virtual users, hold, then ramp down
+export const options = {
+  stages: [
+    { duration: "1m", target: Number(__ENV.VUS) },
+    { duration: __ENV.DURATION, target: Number(__ENV.VUS) },
+    { duration: "30s", target: 0 },
+  ],
+  summaryTrendStats: ["avg", "p(50)", "p(95)", "p(99)", "max"],
+  // A scenario whose requests fail its checks fails the run instead of reporting fast errors as throughput
+  thresholds: {
+    checks: ["rate>0.99"],
+  },
+}
+
+export function login() {
+  const response = http.post(
+    `${BASE_URL}/api/auth/login`,
+    JSON.stringify({ email: __ENV.PERF_USER_EMAIL, password: __ENV.PERF_USER_PASSWORD }),
+    { headers: { "Content-Type": "application/json" } },
+  )
+  check(response, { "logged in": (r) => r.status === 200 })
+  return { token: response.json("token"), userId: response.json("user.id") }
+}
+
+export function authHeaders(session) {
+  return {
+    headers: {
+      "Content-Type": "application/json",
+      Authorization: `Bearer ${session.token}`,
+    },
+  }
+}
+
+// One datapoint per metric and run, keyed by scenario and release, for put-metric-data
+function cloudWatchMetrics(data) {
+  const dimensions = [
+    { Name: "Scenario", Value: SCENARIO },
+    { Name: "Release", Value: RELEASE },
+  ]
+  const metric = (name, value, unit) => ({ MetricName: name, Dimensions: dimensions, Value: value, Unit: unit })
+  return [
+    metric("RequestsPerSecond", data.metrics.http_reqs.values.rate, "Count/Second"),
+    metric("LatencyP50", data.metrics.http_req_duration.values["p(50)"], "Milliseconds"),
+    metric("LatencyP99", data.metrics.http_req_duration.values["p(99)"], "Milliseconds"),
+    metric("ErrorRate", data.metrics.http_req_failed.values.rate * 100, "Percent"),
+  ]
+}
+
+export function handleSummary(data) {
+  return {
+    "/results/summary.json": JSON.stringify(data, null, 2),
+    "/results/metrics.json": JSON.stringify(cloudWatchMetrics(data)),
+  }
+}
@@ -0,0 +1,23 @@
+import http from "k6/http"
+import { check, sleep } from "k6"
+import { BASE_URL, authHeaders, login } from "./lib.js"
+
+export { options, handleSummary } from "./lib.js"
+
+const QUERIES = ["contract", "invoice", "architecture", "onboarding", "security", "roadmap"]
+
+export function setup() {
+  return login()
+}
+
+// Search and list documents, the read-heavy path
+export default function (session) {
+  const params = authHeaders(session)
+  const query = QUERIES[Math.floor(Math.random() * QUERIES.length)]
+
+  check(http.get(`${BASE_URL}/api/documents/search?q=${query}`, params), { "searched": (r) => r.status === 200 })
+  check(http.get(`${BASE_URL}/api/documents/public`, params), { "listed public": (r) => r.status === 200 })
+  check(http.get(`${BASE_URL}/api/documents/user/${session.userId}`, params), { "listed own": (r) => r.status === 200 })
+
+  sleep(1)
+}
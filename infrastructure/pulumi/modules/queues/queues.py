@@ -0,0 +1,444 @@
+import json
+import pulumi
+import pulumi_kubernetes as k8s
+from pulumi import ResourceOptions
+from pulumi_aws import iam, kms, sqs, get_caller_identity, get_partition, get_region
+
+# Work queues for the long-running AI operations, each drained by its own worker Deployment.
+# Thresholds are per queue: workers scale on backlog per replica and on the age of the oldest message.
+# The Deployments ship with the application, so a queue only gets a scaler once its definition names one.
+DEFAULT_QUEUES = [
+    {
+        "name": "summarisation",
+        "visibility_timeout_seconds": 900,
+        "max_receive_count": 3,
+        "messages_per_replica": 5,
+        "max_age_seconds": 300,
+        "max_replicas": 20
+    },
+    {
+        "name": "ingestion",
+        "visibility_timeout_seconds": 900,
+        "max_receive_count": 3,
+        "messages_per_replica": 5,
+        "max_age_seconds": 300,
+        "max_replicas": 20
+    },
+    {
+        "name": "generation",
+        "visibility_timeout_seconds": 900,
+        "max_receive_count": 3,
+        "messages_per_replica": 2,
+        "max_age_seconds": 120,
+        "max_replicas": 20
+    }
+]
+
+# Workers receive, extend and delete; producers only send
+WORKER_ACTIONS = [
+    "sqs:ReceiveMessage",
+    "sqs:DeleteMessage",
+    "sqs:ChangeMessageVisibility",
+    "sqs:GetQueueAttributes",
+    "sqs:GetQueueUrl"
+]
+PRODUCER_ACTIONS = [
+    "sqs:SendMessage",
+    "sqs:GetQueueAttributes",
+    "sqs:GetQueueUrl"
+]
+
+class Queues(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, eks, queue_definitions=None, namespace=None,
+                 api_namespace=None, api_service_account=None, keda_version="2.15.1", opts=None):
+        super().__init__("aidocs:queues:Queues", name, None, opts)
+        self.name = name
+        self.project_name = project_name
+        self.environment = environment
+        self.queue_definitions = [
+            {
+                "deployment": None,
+                "service_account": f"{definition['name']}-worker",
+                "visibility_timeout_seconds": 900,
+                "max_receive_count": 3,
+                "messages_per_replica": 5,
+                "max_age_seconds": 300,
+                "min_replicas": 0,
+                "max_replicas": 10,
+                **definition
+            }
+            for definition in queue_definitions or DEFAULT_QUEUES
+        ]
+        self.namespace_name = namespace or f"{project_name}-workers"
+        self.opts = ResourceOptions(parent=self)
+        k8s_opts = ResourceOptions.merge(self.opts, ResourceOptions(provider=eks.k8s_provider))
+
+        partition = get_partition(opts=pulumi.InvokeOptions(parent=self)).partition
+        account_id = get_caller_identity(opts=pulumi.InvokeOptions(parent=self)).account_id
+        region = get_region(opts=pulumi.InvokeOptions(parent=self)).name
+
+        # Create KMS key for the queues; data keys are reused for five minutes to keep KMS calls off the hot path
+        self.kms_key = kms.Key(
+            f"{name}-kms-key",
+            description="KMS key for the SQS work queues",
+            deletion_window_in_days=7,
+            enable_key_rotation=True,
+            # EventBridge delivers events such as document uploads straight to the queues
+            policy=json.dumps({
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Sid": "AccountAdministration",
+                        "Effect": "Allow",
+                        "Principal": {
+                            "AWS": f"arn:{partition}:iam::{account_id}:root"
+                        },
+                        "Action": "kms:*",
+                        "Resource": "*"
+                    },
+                    {
+                        "Sid": "AllowEventBridge",
+                        "Effect": "Allow",
+                        "Principal": {
+                            "Service": "events.amazonaws.com"
+                        },
+                        "Action": ["kms:GenerateDataKey", "kms:Decrypt"],
+                        "Resource": "*"
+                    }
+                ]
+            }),
+            tags={
+                "Name": f"{project_name}-{environment}-queues-kms",
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            },
+            opts=self.opts
+        )
+
+        # Create a work queue with its dead-letter queue per definition
+        self.queues = {}
+        self.dead_letter_queues = {}
+        for definition in self.queue_definitions:
+            queue_name = definition["name"]
+            tags = {
+                "Project": project_name,
+                "Environment": environment,
+                "ManagedBy": "Pulumi"
+            }
+
+            dead_letter_queue = sqs.Queue(
+                f"{name}-{queue_name}-dlq",
+                name=f"{project_name}-{environment}-{queue_name}-dlq",
+                message_retention_seconds=1209600,
+                kms_master_key_id=self.kms_key.arn,
+                kms_data_key_reuse_period_seconds=300,
+                tags={
+                    "Name": f"{project_name}-{environment}-{queue_name}-dlq",
+                    **tags
+                },
+                opts=self.opts
+            )
+
+            queue = sqs.Queue(
+                f"{name}-{queue_name}-queue",
+                name=f"{project_name}-{environment}-{queue_name}",
+                # Visibility must outlast the slowest job, or the message is redelivered while still being processed
+                visibility_timeout_seconds=definition["visibility_timeout_seconds"],
+                message_retention_seconds=345600,
+                receive_wait_time_seconds=20,
+                kms_master_key_id=self.kms_key.arn,
+                kms_data_key_reuse_period_seconds=300,
+                redrive_policy=dead_letter_queue.arn.apply(lambda arn, definition=definition: json.dumps({
+                    "deadLetterTargetArn": arn,
+                    "maxReceiveCount": definition["max_receive_count"]
+                })),
+                tags={
+                    "Name": f"{project_name}-{environment}-{queue_name}",
+                    **tags
+                },
+                opts=self.opts
+            )
+
+            sqs.RedriveAllowPolicy(
+                f"{name}-{queue_name}-dlq-redrive-allow",
+                queue_url=dead_letter_queue.id,
+                redrive_allow_policy=queue.arn.apply(lambda arn: json.dumps({
+                    "redrivePermission": "byQueue",
+                    "sourceQueueArns": [arn]
+                })),
+                opts=self.opts
+            )
+
+            self.queues[queue_name] = queue
+            self.dead_letter_queues[queue_name] = dead_letter_queue
+
+        # Create the producer policy for the API service to enqueue work
+        self.producer_policy = iam.Policy(
+            f"{name}-producer-policy",
+            description="Send messages to the work queues",
+            policy=pulumi.Output.all(self.kms_key.arn, *[queue.arn for queue in self.queues.values()]).apply(
+                lambda args: json.dumps({
+                    "Version": "2012-10-17",
+                    "Statement": [
+                        {
+                            "Effect": "Allow",
+                            "Action": PRODUCER_ACTIONS,
+                            "Resource": args[1:]
+                        },
+                        {
+                            "Effect": "Allow",
+                            "Action": ["kms:GenerateDataKey", "kms:Decrypt"],
+                            "Resource": args[0]
+                        }
+                    ]
+                })
+            ),
+            opts=self.opts
+        )
+
+        # The API enqueues work under its own service account (infrastructure/kubernetes/base/rbac)
+        self.producer_role = eks.create_irsa_role(
+            "api-queue-producer",
+            namespace=api_namespace or project_name,
+            service_account=api_service_account or f"{project_name}-sa",
+            policy_arns=[self.producer_policy.arn]
+        )
+
+        # Create an IRSA role per worker, scoped to its own queue
+        self.worker_roles = {}
+        for definition in self.queue_definitions:
+            queue_name = definition["name"]
+            worker_policy = iam.Policy(
+                f"{name}-{queue_name}-worker-policy",
+                description=f"Consume the {queue_name} work queue",
+                policy=pulumi.Output.all(self.kms_key.arn, self.queues[queue_name].arn).apply(
+                    lambda args: json.dumps({
+                        "Version": "2012-10-17",
+                        "Statement": [
+                            {
+                                "Effect": "Allow",
+                                "Action": WORKER_ACTIONS,
+                                "Resource": args[1]
+                            },
+                            {
+                                "Effect": "Allow",
+                                "Action": ["kms:Decrypt"],
+                                "Resource": args[0]
+                            }
+                        ]
+                    })
+                ),
+                opts=self.opts
+            )
+
+            self.worker_roles[queue_name] = eks.create_irsa_role(
+                f"{queue_name}-worker",
+                namespace=self.namespace_name,
+                service_account=definition["service_account"],
+                policy_arns=[worker_policy.arn]
+            )
+
+        # KEDA reads queue attributes and the oldest-message age to drive the scalers
+        self.keda_policy = iam.Policy(
+            f"{name}-keda-policy",
+            description="Read work queue depth and age for KEDA",
+            policy=pulumi.Output.all(*[queue.arn for queue in self.queues.values()]).apply(
+                lambda arns: json.dumps({
+                    "Version": "2012-10-17",
+                    "Statement": [
+                        {
+                            "Effect": "Allow",
+                            "Action": ["sqs:GetQueueAttributes", "sqs:GetQueueUrl"],
+                            "Resource": arns
+                        },
+                        {
+                            "Effect": "Allow",
+                            "Action": ["cloudwatch:GetMetricData"],
+                            "Resource": "*"
+                        }
+                    ]
+                })
+            ),
+            opts=self.opts
+        )
+
+        self.keda_role = eks.create_irsa_role(
+            "keda-operator",
+            namespace="keda",
+            service_account="keda-operator",
+            policy_arns=[self.keda_policy.arn]
+        )
+
+        # Install KEDA
+        self.keda_namespace = k8s.core.v1.Namespace(
+            f"{name}-keda-namespace",
+            metadata={
+                "name": "keda"
+            },
+            opts=k8s_opts
+        )
+
+        self.keda_release = k8s.helm.v3.Release(
+            f"{name}-keda-release",
+            name="keda",
+            chart="keda",
+            version=keda_version,
+            namespace=self.keda_namespace.metadata["name"],
+            repository_opts={
+                "repo": "https://kedacore.github.io/charts"
+            },
+            values={
+                "podIdentity": {
+                    "aws": {
+                        "irsa": {
+                            "enabled": True,
+                            "roleArn": self.keda_role.arn
+                        }
+                    }
+                },
+                "resources": {
+                    "operator": {
+                        "requests": {
+                            "cpu": "100m",
+                            "memory": "128Mi"
+                        },
+                        "limits": {
+                            "cpu": "1",
+                            "memory": "1000Mi"
+                        }
+                    }
+                }
+            },
+            opts=k8s_opts
+        )
+
+        self.trigger_authentication = k8s.apiextensions.CustomResource(
+            f"{name}-keda-trigger-auth",
+            api_version="keda.sh/v1alpha1",
+            kind="ClusterTriggerAuthentication",
+            metadata={
+                "name": "aws-keda-operator"
+            },
+            spec={
+                "podIdentity": {
+                    "provider": "aws",
+                    "identityOwner": "keda"
+                }
+            },
+            opts=ResourceOptions.merge(k8s_opts, ResourceOptions(depends_on=[self.keda_release]))
+        )
+
+        # Worker namespace and service accounts; the worker Deployments are shipped with the application
+        self.namespace = k8s.core.v1.Namespace(
+            f"{name}-namespace",
+            metadata={
+                "name": self.namespace_name
+            },
+            opts=k8s_opts
+        )
+
+        self.scaled_objects = {}
+        for definition in self.queue_definitions:
+            queue_name = definition["name"]
+            queue = self.queues[queue_name]
+
+            k8s.core.v1.ServiceAccount(
+                f"{name}-{queue_name}-worker-sa",
+                metadata={
+                    "name": definition["service_account"],
+                    "namespace": self.namespace.metadata["name"],
+                    "annotations": {
+                        "eks.amazonaws.com/role-arn": self.worker_roles[queue_name].arn
+                    }
+                },
+                opts=k8s_opts
+            )
+
+            if not definition["deployment"]:
+                continue
+
+            # Scale on whichever is further behind: backlog per replica or the age of the oldest message.
+            # With min_replicas at 0 the workers go away once both have been quiet for the cooldown period.
+            self.scaled_objects[queue_name] = k8s.apiextensions.CustomResource(
+                f"{name}-{queue_name}-scaled-object",
+                api_version="keda.sh/v1alpha1",
+                kind="ScaledObject",
+                metadata={
+                    "name": definition["deployment"],
+                    "namespace": self.namespace.metadata["name"]
+                },
+                spec={
+                    "scaleTargetRef": {
+                        "name": definition["deployment"]
+                    },
+                    "minReplicaCount": definition["min_replicas"],
+                    "maxReplicaCount": definition["max_replicas"],
+                    "pollingInterval": 15,
+                    "cooldownPeriod": 300,
+                    "triggers": [
+                        {
+                            "type": "aws-sqs-queue",
+                            "authenticationRef": {
+                                "name": "aws-keda-operator",
+                                "kind": "ClusterTriggerAuthentication"
+                            },
+                            "metadata": {
+                                "queueURL": queue.url,
+                                "queueLength": str(definition["messages_per_replica"]),
+                                "awsRegion": region,
+                                "scaleOnInFlight": "true"
+                            }
+                        },
+                        {
+                            "type": "aws-cloudwatch",
+                            "authenticationRef": {
+                                "name": "aws-keda-operator",
+                                "kind": "ClusterTriggerAuthentication"
+                            },
+                            "metadata": {
+                                "namespace": "AWS/SQS",
+                                "metricName": "ApproximateAgeOfOldestMessage",
+                                "dimensionName": "QueueName",
+                                "dimensionValue": queue.name,
+                                "metricStat": "Maximum",
+                                "metricStatPeriod": "60",
+                                "targetMetricValue": str(definition["max_age_seconds"]),
+                                "minMetricValue": "0",
+                                "awsRegion": region
+                            }
+                        }
+                    ]
+                },
+                opts=ResourceOptions.merge(k8s_opts, ResourceOptions(depends_on=[self.trigger_authentication]))
+            )
+
+        self.register_outputs({
+            "queue_urls": self.queue_urls,
+            "producer_policy_arn": self.producer_policy_arn,
+            "producer_role_arn": self.producer_role_arn
+        })
+
+    @property
+    def queue_urls(self):
+        return {queue_name: queue.url for queue_name, queue in self.queues.items()}
+
+    @property
+    def queue_names(self):
+        return {queue_name: queue.name for queue_name, queue in self.queues.items()}
+
+    @property
+    def dead_letter_queue_names(self):
+        return {queue_name: queue.name for queue_name, queue in self.dead_letter_queues.items()}
+
+    @property
+    def producer_policy_arn(self):
+        return self.producer_policy.arn
+
+    @property
+    def producer_role_arn(self):
+        return self.producer_role.arn
+
+    @property
+    def worker_role_arns(self):
+        return {queue_name: role.arn for queue_name, role in self.worker_roles.items()}
@@ -1,9 +1,147 @@
+import json
 import pulumi
 from pulumi import ResourceOptions
-from pulumi_aws import rds, ec2, iam, kms, cloudwatch
+from pulumi_aws import rds, ec2, iam, kms, cloudwatch, route53, secretsmanager
 
-class Rds:
-    def __init__(self, name, project_name, environment, vpc_id, subnet_ids, allowed_security_groups, db_name, db_username, db_password, opts=None):
+# Memory (GiB) of the instance classes we deploy, used to size the Postgres memory settings
+INSTANCE_CLASS_MEMORY_GIB = {
+    "db.t3.micro": 1,
+    "db.t3.small": 2,
+    "db.t3.medium": 4,
+    "db.t3.large": 8,
+    "db.t3.xlarge": 16,
+    "db.t3.2xlarge": 32,
+    "db.t4g.micro": 1,
+    "db.t4g.small": 2,
+    "db.t4g.medium": 4,
+    "db.t4g.large": 8,
+    "db.t4g.xlarge": 16,
+    "db.t4g.2xlarge": 32,
+    "db.m5.large": 8,
+    "db.m5.xlarge": 16,
+    "db.m5.2xlarge": 32,
+    "db.m5.4xlarge": 64,
+    "db.m6g.large": 8,
+    "db.m6g.xlarge": 16,
+    "db.m6g.2xlarge": 32,
+    "db.m6g.4xlarge": 64,
+    "db.m6i.large": 8,
+    "db.m6i.xlarge": 16,
+    "db.m6i.2xlarge": 32,
+    "db.m6i.4xlarge": 64,
+    "db.m7g.large": 8,
+    "db.m7g.xlarge": 16,
+    "db.m7g.2xlarge": 32,
+    "db.m7g.4xlarge": 64,
+    "db.r5.large": 16,
+    "db.r5.xlarge": 32,
+    "db.r5.2xlarge": 64,
+    "db.r5.4xlarge": 128,
+    "db.r6g.large": 16,
+    "db.r6g.xlarge": 32,
+    "db.r6g.2xlarge": 64,
+    "db.r6g.4xlarge": 128,
+    "db.r6g.8xlarge": 256,
+    "db.r6g.16xlarge": 512,
+    "db.r6i.large": 16,
+    "db.r6i.xlarge": 32,
+    "db.r6i.2xlarge": 64,
+    "db.r6i.4xlarge": 128,
+    "db.r7g.large": 16,
+    "db.r7g.xlarge": 32,
+    "db.r7g.2xlarge": 64,
+    "db.r7g.4xlarge": 128,
+}
+
+# Parameters that only take effect after a reboot
+STATIC_PARAMETERS = {"shared_buffers", "shared_preload_libraries", "pg_stat_statements.max", "max_connections", "track_activity_query_size"}
+
+
+# RDS default max_connections is LEAST(DBInstanceClassMemory/9531392, 5000)
+def default_max_connections(memory_gib):
+    return min(memory_gib * 1024 ** 3 // 9531392, 5000)
+
+
+def postgres_parameters(instance_class=None, overrides=None):
+    parameters = {
+        "shared_preload_libraries": "pg_stat_statements,auto_explain",
+        "pg_stat_statements.track": "all",
+        "pg_stat_statements.max": "10000",
+        "track_io_timing": "1",
+        "auto_explain.log_min_duration": "1000",
+        "auto_explain.log_format": "json",
+        "auto_explain.log_nested_statements": "1",
+        # gp3 random reads are nearly as cheap as sequential ones
+        "random_page_cost": "1.1",
+        "effective_io_concurrency": "200",
+    }
+
+    memory_gib = INSTANCE_CLASS_MEMORY_GIB.get(instance_class)
+    if memory_gib:
+        memory_kb = memory_gib * 1024 * 1024
+        max_connections = default_max_connections(memory_gib)
+        parameters.update({
+            # shared_buffers and effective_cache_size are expressed in 8 kB pages
+            "shared_buffers": str(memory_kb // 4 // 8),
+            "effective_cache_size": str(memory_kb * 3 // 4 // 8),
+            # work_mem and maintenance_work_mem are expressed in kB
+            "work_mem": str(max(4096, memory_kb // 4 // max_connections)),
+            "maintenance_work_mem": str(min(2 * 1024 * 1024, memory_kb // 16)),
+        })
+    elif instance_class is not None:
+        pulumi.log.warn(f"Unknown instance class {instance_class}; using default Postgres memory settings")
+
+    parameters.update({key: str(value) for key, value in (overrides or {}).items()})
+    return parameters
+
+
+# Per-environment storage profiles; gp3 only accepts explicit IOPS/throughput from 400 GB
+STORAGE_PRESETS = {
+    "dev": {
+        "allocated_storage": 20,
+        "max_allocated_storage": 100,
+        "storage_type": "gp3",
+    },
+    "staging": {
+        "allocated_storage": 100,
+        "max_allocated_storage": 500,
+        "storage_type": "gp3",
+    },
+    "prod": {
+        "allocated_storage": 400,
+        "max_allocated_storage": 2000,
+        "storage_type": "gp3",
+        "iops": 12000,
+        "storage_throughput": 500,
+    },
+}
+
+
+def storage_settings(environment, overrides=None):
+    settings = dict(STORAGE_PRESETS.get(environment, STORAGE_PRESETS["dev"]))
+    settings.update(overrides or {})
+
+    storage_type = settings["storage_type"]
+    if storage_type in ("io1", "io2"):
+        if not settings.get("iops"):
+            raise ValueError(f"storage_type {storage_type} requires iops")
+        # Throughput is derived from IOPS on provisioned-IOPS volumes
+        settings.pop("storage_throughput", None)
+    elif storage_type == "gp3" and settings["allocated_storage"] < 400:
+        # Below 400 GB gp3 runs at the fixed 3000 IOPS / 125 MiB/s baseline
+        settings.pop("iops", None)
+        settings.pop("storage_throughput", None)
+    return settings
+
+
+class Rds(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, vpc_id, subnet_ids, allowed_security_groups, db_name, db_username, db_password,
+                 engine_mode="instance", engine_version="14.7", instance_class="db.t3.medium", parameter_overrides=None,
+                 serverless_min_capacity=0.5, serverless_max_capacity=16, storage_overrides=None,
+                 replica_count=0, replica_instance_class=None, replica_availability_zones=None,
+                 enable_proxy=False, proxy_max_connections_percent=90, proxy_idle_client_timeout=1800, proxy_require_tls=False,
+                 global_database=False, source_db=None, skip_final_snapshot=False, opts=None):
+        super().__init__("aidocs:rds:Rds", name, None, opts)
         self.name = name
         self.project_name = project_name
         self.environment = environment
@@ -13,7 +151,24 @@ class Rds:
         self.db_name = db_name
         self.db_username = db_username
         self.db_password = db_password
-        self.opts = opts or ResourceOptions()
+        self.engine_mode = engine_mode
+        self.engine_version = engine_version
+        self.instance_class = instance_class
+        self.parameter_overrides = parameter_overrides
+        self.storage = storage_settings(environment, storage_overrides)
+        self.replica_count = replica_count
+        self.replica_instance_class = replica_instance_class or instance_class
+        self.replica_availability_zones = replica_availability_zones or []
+        self.enable_proxy = enable_proxy
+        self.source_db = source_db
+        if source_db and source_db.is_aurora != (engine_mode == "aurora-serverless-v2"):
+            raise ValueError("A cross-region database must use the same engine mode as its source")
+        if source_db and source_db.is_aurora and not source_db.global_cluster:
+            raise ValueError("The source Aurora cluster must be created with global_database=True")
+        if source_db and enable_proxy:
+            raise ValueError("RDS Proxy cannot front a cross-region read replica")
+        # Resources predate the component, the alias keeps their original top-level URNs
+        self.opts = ResourceOptions(parent=self, aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)])
 
         # Create DB subnet group
         self.db_subnet_group = rds.SubnetGroup(
@@ -29,19 +184,28 @@ class Rds:
             opts=self.opts
         )
 
-        # Create RDS security group
+        # RDS Proxy security group; its rules are added with the proxy
+        self.proxy_security_group = None
+        if enable_proxy:
+            self.proxy_security_group = ec2.SecurityGroup(
+                f"{name}-proxy-sg",
+                vpc_id=vpc_id,
+                description="Security group for RDS Proxy",
+                tags={
+                    "Name": f"{project_name}-{environment}-rds-proxy-sg",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts
+            )
+
+        # Create RDS security group; its ingress rules are standalone, so only the rules wait for the
+        # source groups (the EKS cluster's group exists only once the cluster does), not the database
         self.security_group = ec2.SecurityGroup(
             f"{name}-sg",
             vpc_id=vpc_id,
             description="Security group for RDS",
-            ingress=[
-                {
-                    "protocol": "tcp",
-                    "from_port": 5432,
-                    "to_port": 5432,
-                    "security_groups": allowed_security_groups
-                }
-            ],
             tags={
                 "Name": f"{project_name}-{environment}-rds-sg",
                 "Project": project_name,
@@ -51,6 +215,18 @@ class Rds:
             opts=self.opts
         )
 
+        for i, source_security_group in enumerate(allowed_security_groups):
+            ec2.SecurityGroupRule(
+                f"{name}-sg-ingress" if i == 0 else f"{name}-sg-ingress-{i}",
+                type="ingress",
+                protocol="tcp",
+                from_port=5432,
+                to_port=5432,
+                security_group_id=self.security_group.id,
+                source_security_group_id=source_security_group,
+                opts=self.opts
+            )
+
         # Create KMS key for RDS encryption
         self.kms_key = kms.Key(
             f"{name}-kms-key",
@@ -96,46 +272,435 @@ class Rds:
             opts=self.opts
         )
 
-        # Create RDS instance
-        self.db_instance = rds.Instance(
-            f"{name}-instance",
-            identifier=f"{project_name}-{environment}",
-            engine="postgres",
-            engine_version="14.7",
-            instance_class="db.t3.medium",
-            allocated_storage=20,
-            storage_type="gp3",
-            storage_encrypted=True,
-            kms_key_id=self.kms_key.arn,
-            db_name=db_name,
-            username=db_username,
-            password=db_password,
-            port=5432,
-            vpc_security_group_ids=[self.security_group.id],
-            db_subnet_group_name=self.db_subnet_group.name,
-            backup_retention_period=7,
-            backup_window="03:00-04:00",
-            maintenance_window="Mon:04:00-Mon:05:00",
-            multi_az=True,
-            skip_final_snapshot=False,
-            final_snapshot_identifier=f"{project_name}-{environment}-final-snapshot",
-            performance_insights_enabled=True,
-            performance_insights_retention_period=7,
-            monitoring_interval=60,
-            monitoring_role_arn=self.monitoring_role.arn,
-            tags={
-                "Name": f"{project_name}-{environment}-rds",
-                "Project": project_name,
-                "Environment": environment,
-                "ManagedBy": "Pulumi"
-            },
-            opts=self.opts
-        )
+        self.db_cluster = None
+        if engine_mode == "aurora-serverless-v2":
+            # Create cluster parameter group; Aurora sizes its own memory settings per ACU
+            self.parameter_group = rds.ClusterParameterGroup(
+                f"{name}-cluster-parameter-group",
+                name=f"{project_name}-{environment}-aurora-postgres",
+                family=f"aurora-postgresql{engine_version.split('.')[0]}",
+                description="Aurora PostgreSQL parameters",
+                parameters=[
+                    {
+                        "name": key,
+                        "value": value,
+                        "apply_method": "pending-reboot" if key in STATIC_PARAMETERS else "immediate"
+                    }
+                    for key, value in sorted(postgres_parameters(None, parameter_overrides).items())
+                ],
+                tags={
+                    "Name": f"{project_name}-{environment}-aurora-parameter-group",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts
+            )
+
+            # Create Aurora PostgreSQL cluster with Serverless v2 capacity
+            self.db_cluster = rds.Cluster(
+                f"{name}-cluster",
+                cluster_identifier=f"{project_name}-{environment}",
+                engine="aurora-postgresql",
+                engine_mode="provisioned",
+                engine_version=engine_version,
+                serverlessv2_scaling_configuration={
+                    "min_capacity": serverless_min_capacity,
+                    "max_capacity": serverless_max_capacity
+                },
+                storage_encrypted=True,
+                kms_key_id=self.kms_key.arn,
+                # Secondary clusters of a global database inherit the schema and credentials
+                database_name=None if source_db else db_name,
+                master_username=None if source_db else db_username,
+                master_password=None if source_db else db_password,
+                global_cluster_identifier=source_db.global_cluster.id if source_db else None,
+                enable_global_write_forwarding=True if source_db else None,
+                port=5432,
+                vpc_security_group_ids=[self.security_group.id],
+                db_subnet_group_name=self.db_subnet_group.name,
+                db_cluster_parameter_group_name=self.parameter_group.name,
+                backup_retention_period=7,
+                preferred_backup_window="03:00-04:00",
+                preferred_maintenance_window="Mon:04:00-Mon:05:00",
+                skip_final_snapshot=bool(source_db) or skip_final_snapshot,
+                final_snapshot_identifier=None if source_db or skip_final_snapshot else f"{project_name}-{environment}-final-snapshot",
+                enabled_cloudwatch_logs_exports=["postgresql"],
+                tags={
+                    "Name": f"{project_name}-{environment}-aurora",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=ResourceOptions.merge(self.opts, ResourceOptions(
+                    # Secondaries attach once the source writer is up; the primary's membership is managed by the global cluster
+                    depends_on=[source_db.db_instance] if source_db else None,
+                    ignore_changes=["global_cluster_identifier"] if global_database and not source_db else None
+                ))
+            )
+
+            # Promote the cluster to the primary of a global database that other regions replicate from
+            self.global_cluster = None
+            if global_database and not source_db:
+                self.global_cluster = rds.GlobalCluster(
+                    f"{name}-global-cluster",
+                    global_cluster_identifier=f"{project_name}-{environment}",
+                    source_db_cluster_identifier=self.db_cluster.arn,
+                    force_destroy=True,
+                    opts=self.opts
+                )
+
+            # Create the writer and reader instances; readers share the cluster reader endpoint
+            cluster_instances = []
+            for i in range(replica_count + 1):
+                cluster_instance = rds.ClusterInstance(
+                    f"{name}-writer" if i == 0 else f"{name}-reader-{i - 1}",
+                    identifier=f"{project_name}-{environment}" if i == 0 else f"{project_name}-{environment}-reader-{i - 1}",
+                    cluster_identifier=self.db_cluster.id,
+                    engine=self.db_cluster.engine,
+                    engine_version=self.db_cluster.engine_version,
+                    instance_class="db.serverless",
+                    db_subnet_group_name=self.db_subnet_group.name,
+                    availability_zone=self.replica_availability_zones[(i - 1) % len(self.replica_availability_zones)] if i and self.replica_availability_zones else None,
+                    # Tier 0-1 readers scale with the writer so a failover target is always warm
+                    promotion_tier=0 if i < 2 else 2,
+                    performance_insights_enabled=True,
+                    performance_insights_retention_period=7,
+                    monitoring_interval=60,
+                    monitoring_role_arn=self.monitoring_role.arn,
+                    tags={
+                        "Name": f"{project_name}-{environment}-aurora-{'writer' if i == 0 else f'reader-{i - 1}'}",
+                        "Project": project_name,
+                        "Environment": environment,
+                        "ManagedBy": "Pulumi"
+                    },
+                    opts=self.opts
+                )
+                cluster_instances.append(cluster_instance)
+
+            self.db_instance = cluster_instances[0]
+            self.read_replicas = cluster_instances[1:]
+            self.reader_zone = None
+            self.reader_record_name = None
+        else:
+            # Create parameter group tuned for the instance class
+            self.parameter_group = rds.ParameterGroup(
+                f"{name}-parameter-group",
+                name=f"{project_name}-{environment}-postgres",
+                family=f"postgres{engine_version.split('.')[0]}",
+                description=f"Tuned Postgres parameters for {instance_class}",
+                parameters=[
+                    {
+                        "name": key,
+                        "value": value,
+                        "apply_method": "pending-reboot" if key in STATIC_PARAMETERS else "immediate"
+                    }
+                    for key, value in sorted(postgres_parameters(instance_class, parameter_overrides).items())
+                ],
+                tags={
+                    "Name": f"{project_name}-{environment}-rds-parameter-group",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts
+            )
+
+            # Create RDS instance
+            self.global_cluster = None
+            self.db_instance = rds.Instance(
+                f"{name}-instance",
+                identifier=f"{project_name}-{environment}",
+                # A cross-region read replica inherits engine, schema and credentials from its source
+                replicate_source_db=source_db.db_instance.arn if source_db else None,
+                engine=None if source_db else "postgres",
+                engine_version=None if source_db else engine_version,
+                instance_class=instance_class,
+                allocated_storage=self.storage["allocated_storage"],
+                max_allocated_storage=self.storage.get("max_allocated_storage"),
+                storage_type=self.storage["storage_type"],
+                iops=self.storage.get("iops"),
+                storage_throughput=self.storage.get("storage_throughput"),
+                storage_encrypted=True,
+                kms_key_id=self.kms_key.arn,
+                db_name=None if source_db else db_name,
+                username=None if source_db else db_username,
+                password=None if source_db else db_password,
+                port=5432,
+                vpc_security_group_ids=[self.security_group.id],
+                db_subnet_group_name=self.db_subnet_group.name,
+                parameter_group_name=self.parameter_group.name,
+                backup_retention_period=0 if source_db else 7,
+                backup_window="03:00-04:00",
+                maintenance_window="Mon:04:00-Mon:05:00",
+                multi_az=True,
+                skip_final_snapshot=bool(source_db) or skip_final_snapshot,
+                final_snapshot_identifier=None if source_db or skip_final_snapshot else f"{project_name}-{environment}-final-snapshot",
+                performance_insights_enabled=True,
+                performance_insights_retention_period=7,
+                monitoring_interval=60,
+                monitoring_role_arn=self.monitoring_role.arn,
+                enabled_cloudwatch_logs_exports=["postgresql"],
+                tags={
+                    "Name": f"{project_name}-{environment}-rds",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts
+            )
+
+            # Memory settings are absolute values, so replicas of another class get a group sized for their own RAM.
+            # A hot standby refuses to start with fewer connections than its primary, so max_connections follows it.
+            self.replica_parameter_group = self.parameter_group
+            if replica_count and self.replica_instance_class != instance_class:
+                replica_overrides = dict(parameter_overrides or {})
+                primary_memory_gib = INSTANCE_CLASS_MEMORY_GIB.get(instance_class)
+                if primary_memory_gib:
+                    replica_overrides.setdefault("max_connections", default_max_connections(primary_memory_gib))
+                self.replica_parameter_group = rds.ParameterGroup(
+                    f"{name}-replica-parameter-group",
+                    name=f"{project_name}-{environment}-postgres-replica",
+                    family=f"postgres{engine_version.split('.')[0]}",
+                    description=f"Tuned Postgres parameters for {self.replica_instance_class} replicas",
+                    parameters=[
+                        {
+                            "name": key,
+                            "value": value,
+                            "apply_method": "pending-reboot" if key in STATIC_PARAMETERS else "immediate"
+                        }
+                        for key, value in sorted(postgres_parameters(self.replica_instance_class, replica_overrides).items())
+                    ],
+                    tags={
+                        "Name": f"{project_name}-{environment}-rds-replica-parameter-group",
+                        "Project": project_name,
+                        "Environment": environment,
+                        "ManagedBy": "Pulumi"
+                    },
+                    opts=self.opts
+                )
+
+            # Create read replicas, spread round-robin over the requested AZs
+            self.read_replicas = []
+            for i in range(replica_count):
+                replica = rds.Instance(
+                    f"{name}-replica-{i}",
+                    identifier=f"{project_name}-{environment}-replica-{i}",
+                    replicate_source_db=self.db_instance.identifier,
+                    instance_class=self.replica_instance_class,
+                    availability_zone=self.replica_availability_zones[i % len(self.replica_availability_zones)] if self.replica_availability_zones else None,
+                    max_allocated_storage=self.storage.get("max_allocated_storage"),
+                    storage_type=self.storage["storage_type"],
+                    iops=self.storage.get("iops"),
+                    storage_throughput=self.storage.get("storage_throughput"),
+                    storage_encrypted=True,
+                    kms_key_id=self.kms_key.arn,
+                    vpc_security_group_ids=[self.security_group.id],
+                    parameter_group_name=self.replica_parameter_group.name,
+                    backup_retention_period=0,
+                    skip_final_snapshot=True,
+                    performance_insights_enabled=True,
+                    performance_insights_retention_period=7,
+                    monitoring_interval=60,
+                    monitoring_role_arn=self.monitoring_role.arn,
+                    tags={
+                        "Name": f"{project_name}-{environment}-rds-replica-{i}",
+                        "Project": project_name,
+                        "Environment": environment,
+                        "ManagedBy": "Pulumi"
+                    },
+                    opts=self.opts
+                )
+                self.read_replicas.append(replica)
+
+            # Create a private DNS name that load-balances reads across the replicas
+            self.reader_zone = None
+            self.reader_record_name = None
+            if self.read_replicas:
+                self.reader_zone = route53.Zone(
+                    f"{name}-reader-zone",
+                    name=f"{project_name}-{environment}.db.internal",
+                    vpcs=[{
+                        "vpc_id": vpc_id
+                    }],
+                    comment="Private zone for the RDS reader endpoint",
+                    tags={
+                        "Name": f"{project_name}-{environment}-rds-reader-zone",
+                        "Project": project_name,
+                        "Environment": environment,
+                        "ManagedBy": "Pulumi"
+                    },
+                    opts=self.opts
+                )
+
+                self.reader_record_name = f"reader.{project_name}-{environment}.db.internal"
+                for i, replica in enumerate(self.read_replicas):
+                    route53.Record(
+                        f"{name}-reader-record-{i}",
+                        zone_id=self.reader_zone.zone_id,
+                        name=self.reader_record_name,
+                        type="CNAME",
+                        ttl=30,
+                        records=[replica.address],
+                        set_identifier=f"replica-{i}",
+                        weighted_routing_policies=[{
+                            "weight": 1
+                        }],
+                        opts=self.opts
+                    )
+
+        # Create RDS Proxy to pool connections from the EKS pods
+        self.proxy = None
+        if enable_proxy:
+            self.proxy_secret = secretsmanager.Secret(
+                f"{name}-proxy-secret",
+                name=f"{project_name}-{environment}-rds-proxy-credentials",
+                description="Database credentials used by the RDS Proxy",
+                kms_key_id=self.kms_key.arn,
+                tags={
+                    "Name": f"{project_name}-{environment}-rds-proxy-secret",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts
+            )
+
+            secretsmanager.SecretVersion(
+                f"{name}-proxy-secret-version",
+                secret_id=self.proxy_secret.id,
+                secret_string=pulumi.Output.all(db_username, db_password).apply(
+                    lambda args: json.dumps({"username": args[0], "password": args[1]})
+                ),
+                opts=self.opts
+            )
+
+            self.proxy_role = iam.Role(
+                f"{name}-proxy-role",
+                assume_role_policy={
+                    "Version": "2012-10-17",
+                    "Statement": [{
+                        "Action": "sts:AssumeRole",
+                        "Effect": "Allow",
+                        "Principal": {
+                            "Service": "rds.amazonaws.com"
+                        }
+                    }]
+                },
+                tags={
+                    "Name": f"{project_name}-{environment}-rds-proxy-role",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts
+            )
+
+            iam.RolePolicy(
+                f"{name}-proxy-policy",
+                role=self.proxy_role.id,
+                policy=pulumi.Output.all(self.proxy_secret.arn, self.kms_key.arn).apply(
+                    lambda arns: json.dumps({
+                        "Version": "2012-10-17",
+                        "Statement": [
+                            {
+                                "Effect": "Allow",
+                                "Action": ["secretsmanager:GetSecretValue"],
+                                "Resource": arns[0]
+                            },
+                            {
+                                "Effect": "Allow",
+                                "Action": ["kms:Decrypt"],
+                                "Resource": arns[1]
+                            }
+                        ]
+                    })
+                ),
+                opts=self.opts
+            )
+
+            # Allow the proxy to reach the database
+            ec2.SecurityGroupRule(
+                f"{name}-proxy-ingress",
+                type="ingress",
+                protocol="tcp",
+                from_port=5432,
+                to_port=5432,
+                security_group_id=self.security_group.id,
+                source_security_group_id=self.proxy_security_group.id,
+                opts=self.opts
+            )
+
+            for i, source_security_group in enumerate(allowed_security_groups):
+                ec2.SecurityGroupRule(
+                    f"{name}-proxy-sg-ingress" if i == 0 else f"{name}-proxy-sg-ingress-{i}",
+                    type="ingress",
+                    protocol="tcp",
+                    from_port=5432,
+                    to_port=5432,
+                    security_group_id=self.proxy_security_group.id,
+                    source_security_group_id=source_security_group,
+                    opts=self.opts
+                )
+
+            ec2.SecurityGroupRule(
+                f"{name}-proxy-sg-egress",
+                type="egress",
+                protocol="tcp",
+                from_port=5432,
+                to_port=5432,
+                security_group_id=self.proxy_security_group.id,
+                source_security_group_id=self.security_group.id,
+                opts=self.opts
+            )
+
+            self.proxy = rds.Proxy(
+                f"{name}-proxy",
+                name=f"{project_name}-{environment}",
+                engine_family="POSTGRESQL",
+                role_arn=self.proxy_role.arn,
+                vpc_subnet_ids=subnet_ids,
+                vpc_security_group_ids=[self.proxy_security_group.id],
+                require_tls=proxy_require_tls,
+                idle_client_timeout=proxy_idle_client_timeout,
+                auths=[{
+                    "auth_scheme": "SECRETS",
+                    "iam_auth": "DISABLED",
+                    "secret_arn": self.proxy_secret.arn
+                }],
+                tags={
+                    "Name": f"{project_name}-{environment}-rds-proxy",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=self.opts
+            )
+
+            rds.ProxyDefaultTargetGroup(
+                f"{name}-proxy-target-group",
+                db_proxy_name=self.proxy.name,
+                connection_pool_config={
+                    "max_connections_percent": proxy_max_connections_percent,
+                    "max_idle_connections_percent": proxy_max_connections_percent // 2,
+                    "connection_borrow_timeout": 120
+                },
+                opts=self.opts
+            )
+
+            rds.ProxyTarget(
+                f"{name}-proxy-target",
+                db_proxy_name=self.proxy.name,
+                target_group_name="default",
+                db_cluster_identifier=self.db_cluster.cluster_identifier if self.db_cluster else None,
+                db_instance_identifier=None if self.db_cluster else self.db_instance.identifier,
+                opts=self.opts
+            )
 
         # Create CloudWatch log group
         self.cloudwatch_log_group = cloudwatch.LogGroup(
             f"{name}-logs",
-            name=f"/aws/rds/instance/{project_name}-{environment}",
+            name=f"/aws/rds/{'cluster' if self.db_cluster else 'instance'}/{project_name}-{environment}/postgresql",
             retention_in_days=30,
             tags={
                 "Name": f"{project_name}-{environment}-rds-logs",
@@ -146,14 +711,97 @@ class Rds:
             opts=self.opts
         )
 
+        self.register_outputs({
+            "db_endpoint": self.db_endpoint,
+            "db_reader_endpoint": self.db_reader_endpoint,
+            "db_instance_identifier": self.db_instance_identifier
+        })
+
     @property
     def db_endpoint(self):
+        if self.db_cluster:
+            return pulumi.Output.concat(self.db_cluster.endpoint, ":5432")
+        return self.db_instance.endpoint
+
+    @property
+    def db_reader_endpoint(self):
+        if self.db_cluster:
+            return pulumi.Output.concat(self.db_cluster.reader_endpoint, ":5432")
+        if self.reader_record_name:
+            return pulumi.Output.from_input(f"{self.reader_record_name}:5432")
         return self.db_instance.endpoint
 
+    # Writes from a cross-region deployment go to the source region's writer
+    @property
+    def db_writer_endpoint(self):
+        return self.source_db.db_writer_endpoint if self.source_db else self.db_endpoint
+
+    @property
+    def db_replica_endpoints(self):
+        return [replica.endpoint for replica in self.read_replicas]
+
+    @property
+    def db_proxy_endpoint(self):
+        return self.proxy.endpoint if self.proxy else None
+
+    @property
+    def db_cluster_id(self):
+        return self.db_cluster.id if self.db_cluster else None
+
     @property
     def db_instance_id(self):
         return self.db_instance.id
 
+    @property
+    def db_instance_identifier(self):
+        return self.db_instance.identifier
+
+    @property
+    def db_replica_identifiers(self):
+        return [replica.identifier for replica in self.read_replicas]
+
+    @property
+    def db_cluster_identifier(self):
+        return self.db_cluster.cluster_identifier if self.db_cluster else None
+
+    @property
+    def global_cluster_id(self):
+        return self.global_cluster.id if self.global_cluster else None
+
+    @property
+    def is_aurora(self):
+        return self.db_cluster is not None
+
+    @property
+    def is_cross_region_replica(self):
+        return self.source_db is not None
+
+    @property
+    def instance_memory_bytes(self):
+        memory_gib = None if self.db_cluster else INSTANCE_CLASS_MEMORY_GIB.get(self.instance_class)
+        return memory_gib * 1024 ** 3 if memory_gib else None
+
+    @property
+    def max_connections(self):
+        overridden = (self.parameter_overrides or {}).get("max_connections")
+        if overridden:
+            return int(overridden)
+        memory_gib = None if self.db_cluster else INSTANCE_CLASS_MEMORY_GIB.get(self.instance_class)
+        return default_max_connections(memory_gib) if memory_gib else None
+
+    @property
+    def allocated_storage_bytes(self):
+        return None if self.db_cluster else self.storage["allocated_storage"] * 1024 ** 3
+
+    @property
+    def provisioned_iops(self):
+        if self.db_cluster:
+            return None
+        if self.storage.get("iops"):
+            return self.storage["iops"]
+        # RDS gp3 baseline is 3000 IOPS below 400 GB and 12000 IOPS from 400 GB
+        return 12000 if self.storage["allocated_storage"] >= 400 else 3000
+
     @property
     def db_security_group_id(self):
         return self.security_group.id
@@ -1,15 +1,85 @@
+import re
 import pulumi
 from pulumi import ResourceOptions
-from pulumi_aws import ec2, iam, wafv2, cloudwatch
+from pulumi_aws import ec2, iam, wafv2, Provider
 
-class Security:
-    def __init__(self, name, project_name, environment, vpc_id, allowed_cidr_blocks, opts=None):
+# Web ACL rules, overridable per stack. Rate limits count requests over a five-minute window, optionally
+# only on a path prefix and per authorization header instead of per client IP. Header-keyed limits skip
+# requests without the header, so each of them is paired with a per-IP limit on the same path.
+DEFAULT_WAF_RULES = {
+    "rate_limits": [
+        {
+            "name": "RateLimit",
+            "limit": 2000
+        },
+        {
+            "name": "AiRateLimit",
+            "path_prefix": "/api/ai/",
+            "limit": 100
+        },
+        {
+            "name": "AiUserRateLimit",
+            "path_prefix": "/api/ai/",
+            "header": "authorization",
+            "limit": 60
+        },
+        # The chat router calls Bedrock too
+        {
+            "name": "ChatRateLimit",
+            "path_prefix": "/api/chat/",
+            "limit": 100
+        },
+        {
+            "name": "ChatUserRateLimit",
+            "path_prefix": "/api/chat/",
+            "header": "authorization",
+            "limit": 60
+        },
+        {
+            "name": "AuthRateLimit",
+            "path_prefix": "/api/auth/",
+            "limit": 100
+        }
+    ],
+    # Managed groups start in count mode; switch a group to block once its metrics show no false positives
+    "managed_rule_groups": [
+        {
+            "name": "AWSManagedRulesAmazonIpReputationList",
+            "action": "count"
+        },
+        {
+            "name": "AWSManagedRulesKnownBadInputsRuleSet",
+            "action": "count"
+        },
+        {
+            "name": "AWSManagedRulesCommonRuleSet",
+            "action": "count",
+            # Document uploads exceed the 8 KB body limit of this rule
+            "count_rules": ["SizeRestrictions_BODY"]
+        }
+    ]
+}
+
+WAF_ACTIONS = ("block", "count")
+
+def waf_metric_name(metric_prefix, rule_name):
+    return f"{metric_prefix}-" + re.sub(r"([a-z0-9])([A-Z])", r"\1-\2", rule_name).lower()
+
+class Security(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, vpc_id, allowed_cidr_blocks, enable_cloudfront_waf=False,
+                 waf_rule_config=None, opts=None):
+        super().__init__("aidocs:security:Security", name, None, opts)
         self.name = name
         self.project_name = project_name
         self.environment = environment
         self.vpc_id = vpc_id
         self.allowed_cidr_blocks = allowed_cidr_blocks
-        self.opts = opts or ResourceOptions()
+        self.waf_rule_config = {**DEFAULT_WAF_RULES, **(waf_rule_config or {})}
+        for rule in self.waf_rule_config["rate_limits"] + self.waf_rule_config["managed_rule_groups"]:
+            if rule.get("action", "block") not in WAF_ACTIONS:
+                raise ValueError(f"WAF rule {rule['name']} action must be one of {', '.join(WAF_ACTIONS)}")
+        # Resources predate the component, the alias keeps their original top-level URNs
+        self.opts = ResourceOptions(parent=self, aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)])
 
         # Create EKS node security group
         self.eks_node_security_group = ec2.SecurityGroup(
@@ -64,28 +134,29 @@ class Security:
         )
 
         # Attach EKS node policy
-        iam.RolePolicyAttachment(
+        self.eks_node_policy_attachments = []
+        self.eks_node_policy_attachments.append(iam.RolePolicyAttachment(
             f"{name}-eks-node-policy",
             role=self.eks_node_role.name,
             policy_arn="arn:aws:iam::aws:policy/AmazonEKSWorkerNodePolicy",
             opts=self.opts
-        )
+        ))
 
         # Attach EKS CNI policy
-        iam.RolePolicyAttachment(
+        self.eks_node_policy_attachments.append(iam.RolePolicyAttachment(
             f"{name}-eks-cni-policy",
             role=self.eks_node_role.name,
             policy_arn="arn:aws:iam::aws:policy/AmazonEKS_CNI_Policy",
             opts=self.opts
-        )
+        ))
 
         # Attach EC2 container registry policy
-        iam.RolePolicyAttachment(
+        self.eks_node_policy_attachments.append(iam.RolePolicyAttachment(
             f"{name}-ecr-policy",
             role=self.eks_node_role.name,
             policy_arn="arn:aws:iam::aws:policy/AmazonEC2ContainerRegistryReadOnly",
             opts=self.opts
-        )
+        ))
 
         # Create WAF web ACL
         self.waf_web_acl = wafv2.WebAcl(
@@ -99,26 +170,7 @@ class Security:
                 "metric_name": f"{project_name}-{environment}-waf",
                 "sampled_requests_enabled": True
             },
-            rules=[
-                {
-                    "name": "RateLimit",
-                    "priority": 1,
-                    "action": {
-                        "block": {}
-                    },
-                    "statement": {
-                        "rate_based_statement": {
-                            "limit": 2000,
-                            "aggregate_key_type": "IP"
-                        }
-                    },
-                    "visibility_config": {
-                        "cloudwatch_metrics_enabled": True,
-                        "metric_name": f"{project_name}-{environment}-rate-limit",
-                        "sampled_requests_enabled": True
-                    }
-                }
-            ],
+            rules=self.waf_rules(f"{project_name}-{environment}"),
             tags={
                 "Name": f"{project_name}-{environment}-waf-acl",
                 "Project": project_name,
@@ -128,32 +180,147 @@ class Security:
             opts=self.opts
         )
 
-        # Create CloudWatch log group
-        self.cloudwatch_log_group = cloudwatch.LogGroup(
-            f"{name}-logs",
-            name=f"/aws/eks/{project_name}-{environment}/cluster",
-            retention_in_days=30,
-            tags={
-                "Name": f"{project_name}-{environment}-logs",
-                "Project": project_name,
-                "Environment": environment,
-                "ManagedBy": "Pulumi"
-            },
-            opts=self.opts
-        )
+        # Create a CLOUDFRONT-scoped copy of the web ACL; CloudFront only accepts ACLs from us-east-1
+        self.cloudfront_waf_web_acl = None
+        if enable_cloudfront_waf:
+            self.us_east_1_provider = Provider(f"{name}-us-east-1", region="us-east-1")
+            self.cloudfront_waf_web_acl = wafv2.WebAcl(
+                f"{name}-cloudfront-waf-acl",
+                scope="CLOUDFRONT",
+                default_action={
+                    "allow": {}
+                },
+                visibility_config={
+                    "cloudwatch_metrics_enabled": True,
+                    "metric_name": f"{project_name}-{environment}-cloudfront-waf",
+                    "sampled_requests_enabled": True
+                },
+                rules=self.waf_rules(f"{project_name}-{environment}-cloudfront"),
+                tags={
+                    "Name": f"{project_name}-{environment}-cloudfront-waf-acl",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=ResourceOptions.merge(self.opts, ResourceOptions(provider=self.us_east_1_provider))
+            )
+
+        self.register_outputs({
+            "eks_node_security_group_id": self.eks_node_security_group_id,
+            "eks_node_iam_role_arn": self.eks_node_iam_role_arn,
+            "waf_web_acl_arn": self.waf_web_acl_arn
+        })
+
+    def waf_rules(self, metric_prefix):
+        rules = []
+
+        for rate_limit in self.waf_rule_config["rate_limits"]:
+            statement = {
+                "limit": rate_limit["limit"],
+                "aggregate_key_type": "IP"
+            }
+            if rate_limit.get("header"):
+                statement["aggregate_key_type"] = "CUSTOM_KEYS"
+                statement["custom_keys"] = [{
+                    "header": {
+                        "name": rate_limit["header"],
+                        "text_transformations": [{
+                            "priority": 0,
+                            "type": "NONE"
+                        }]
+                    }
+                }]
+            if rate_limit.get("path_prefix"):
+                statement["scope_down_statement"] = {
+                    "byte_match_statement": {
+                        "search_string": rate_limit["path_prefix"].lower(),
+                        "positional_constraint": "STARTS_WITH",
+                        "field_to_match": {
+                            "uri_path": {}
+                        },
+                        "text_transformations": [{
+                            "priority": 0,
+                            "type": "LOWERCASE"
+                        }]
+                    }
+                }
+
+            # Throttled clients get a 429 so they can back off instead of treating the block as a failure
+            action = rate_limit.get("action", "block")
+            rules.append({
+                "name": rate_limit["name"],
+                "action": {
+                    "block": {
+                        "custom_response": {
+                            "response_code": 429
+                        }
+                    }
+                } if action == "block" else {
+                    "count": {}
+                },
+                "statement": {
+                    "rate_based_statement": statement
+                }
+            })
+
+        for rule_group in self.waf_rule_config["managed_rule_groups"]:
+            statement = {
+                "name": rule_group["name"],
+                "vendor_name": rule_group.get("vendor", "AWS")
+            }
+            if rule_group.get("count_rules"):
+                statement["rule_action_overrides"] = [
+                    {
+                        "name": rule_name,
+                        "action_to_use": {
+                            "count": {}
+                        }
+                    }
+                    for rule_name in rule_group["count_rules"]
+                ]
+
+            rules.append({
+                "name": rule_group["name"],
+                "override_action": {
+                    "none": {}
+                } if rule_group.get("action", "block") == "block" else {
+                    "count": {}
+                },
+                "statement": {
+                    "managed_rule_group_statement": statement
+                }
+            })
+
+        # Rules are evaluated in the order they are declared, each with its own metric
+        for priority, rule in enumerate(rules, start=1):
+            rule["priority"] = priority
+            rule["visibility_config"] = {
+                "cloudwatch_metrics_enabled": True,
+                "metric_name": waf_metric_name(metric_prefix, rule["name"]),
+                "sampled_requests_enabled": True
+            }
+        return rules
 
     @property
     def eks_node_security_group_id(self):
         return self.eks_node_security_group.id
 
+    # Nodes cannot join the cluster before the policies are attached, so the ARN resolves only after them
     @property
     def eks_node_iam_role_arn(self):
-        return self.eks_node_role.arn
+        return pulumi.Output.all(
+            self.eks_node_role.arn,
+            *[attachment.id for attachment in self.eks_node_policy_attachments]
+        ).apply(lambda args: args[0])
 
     @property
-    def cloudwatch_log_group_name(self):
-        return self.cloudwatch_log_group.name
+    def waf_web_acl_id(self):
+        return self.waf_web_acl.id
 
     @property
-    def waf_web_acl_id(self):
-        return self.waf_web_acl.id 
\ No newline at end of file
+    def waf_web_acl_arn(self):
+        return self.waf_web_acl.arn
+
+    @property
+    def cloudfront_waf_web_acl_arn(self):
+        return self.cloudfront_waf_web_acl.arn if self.cloudfront_waf_web_acl else None
\ No newline at end of file
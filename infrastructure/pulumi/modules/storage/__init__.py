@@ -0,0 +1,3 @@
+from .storage import Storage
+
+__all__ = ['Storage']
@@ -0,0 +1,286 @@
+import json
+import pulumi
+from pulumi import ResourceOptions
+from pulumi_aws import cloudwatch, iam, kms, s3, sqs, get_caller_identity, get_partition
+
+# The API writes documents under this prefix, and the CDN serves them from /documents/*
+DOCUMENTS_PREFIX = "documents/"
+
+# Intelligent-Tiering does not monitor objects under 128 KiB, so they stay in Standard
+INTELLIGENT_TIERING_MIN_OBJECT_SIZE = 128 * 1024
+
+class Storage(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, bucket_name=None, transfer_acceleration=False,
+                 cors_allowed_origins=None, intelligent_tiering_after_days=30, abort_multipart_after_days=1,
+                 upload_queue=None, force_destroy=False, opts=None):
+        super().__init__("aidocs:storage:Storage", name, None, opts)
+        self.name = name
+        self.project_name = project_name
+        self.environment = environment
+        self.opts = ResourceOptions(parent=self)
+
+        partition = get_partition(opts=pulumi.InvokeOptions(parent=self)).partition
+        account_id = get_caller_identity(opts=pulumi.InvokeOptions(parent=self)).account_id
+        tags = {
+            "Project": project_name,
+            "Environment": environment,
+            "ManagedBy": "Pulumi"
+        }
+
+        # The documents bucket used to be created by the Cdn component; the aliases adopt it in place
+        def moved_from_cdn(resource_name):
+            return ResourceOptions.merge(self.opts, ResourceOptions(aliases=[
+                pulumi.Alias(name=f"cdn-documents-{resource_name}", parent=pulumi.ROOT_STACK_RESOURCE),
+                pulumi.Alias(name=f"cdn-documents-{resource_name}", parent=pulumi.create_urn("cdn", "aidocs:cdn:Cdn"))
+            ]))
+
+        # Create the documents bucket
+        self.bucket = s3.BucketV2(
+            f"{name}-documents-bucket",
+            bucket=bucket_name or f"{project_name}-{environment}-documents",
+            force_destroy=force_destroy,
+            tags={
+                "Name": bucket_name or f"{project_name}-{environment}-documents",
+                **tags
+            },
+            opts=moved_from_cdn("bucket")
+        )
+
+        s3.BucketPublicAccessBlock(
+            f"{name}-documents-public-access-block",
+            bucket=self.bucket.id,
+            block_public_acls=True,
+            block_public_policy=True,
+            ignore_public_acls=True,
+            restrict_public_buckets=True,
+            opts=moved_from_cdn("public-access-block")
+        )
+
+        s3.BucketOwnershipControls(
+            f"{name}-documents-ownership",
+            bucket=self.bucket.id,
+            rule={
+                "object_ownership": "BucketOwnerEnforced"
+            },
+            opts=moved_from_cdn("ownership")
+        )
+
+        # Create KMS key for the documents; CloudFront decrypts through origin access control
+        self.kms_key = kms.Key(
+            f"{name}-kms-key",
+            description="KMS key for the documents bucket",
+            deletion_window_in_days=7,
+            enable_key_rotation=True,
+            policy=json.dumps({
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Sid": "AccountAdministration",
+                        "Effect": "Allow",
+                        "Principal": {
+                            "AWS": f"arn:{partition}:iam::{account_id}:root"
+                        },
+                        "Action": "kms:*",
+                        "Resource": "*"
+                    },
+                    {
+                        "Sid": "AllowCloudFrontDecrypt",
+                        "Effect": "Allow",
+                        "Principal": {
+                            "Service": "cloudfront.amazonaws.com"
+                        },
+                        "Action": "kms:Decrypt",
+                        "Resource": "*",
+                        "Condition": {
+                            "StringLike": {
+                                "AWS:SourceArn": f"arn:{partition}:cloudfront::{account_id}:distribution/*"
+                            }
+                        }
+                    }
+                ]
+            }),
+            tags={
+                "Name": f"{project_name}-{environment}-documents-kms",
+                **tags
+            },
+            opts=self.opts
+        )
+
+        # Bucket Keys let S3 reuse a bucket-level data key instead of calling KMS for every object
+        s3.BucketServerSideEncryptionConfigurationV2(
+            f"{name}-documents-encryption",
+            bucket=self.bucket.id,
+            rules=[{
+                "apply_server_side_encryption_by_default": {
+                    "sse_algorithm": "aws:kms",
+                    "kms_master_key_id": self.kms_key.arn
+                },
+                "bucket_key_enabled": True
+            }],
+            opts=moved_from_cdn("encryption")
+        )
+
+        # Accelerated uploads enter the AWS network at the nearest edge location
+        self.transfer_acceleration = transfer_acceleration
+        if transfer_acceleration:
+            s3.BucketAccelerateConfigurationV2(
+                f"{name}-documents-acceleration",
+                bucket=self.bucket.id,
+                status="Enabled",
+                opts=self.opts
+            )
+
+        # Browsers upload straight to S3 with presigned URLs; multipart uploads need the ETag of each part
+        if cors_allowed_origins:
+            s3.BucketCorsConfigurationV2(
+                f"{name}-documents-cors",
+                bucket=self.bucket.id,
+                cors_rules=[{
+                    "allowed_origins": cors_allowed_origins,
+                    "allowed_methods": ["GET", "HEAD", "PUT", "POST"],
+                    "allowed_headers": ["*"],
+                    "expose_headers": ["ETag"],
+                    "max_age_seconds": 3000
+                }],
+                opts=self.opts
+            )
+
+        s3.BucketLifecycleConfigurationV2(
+            f"{name}-documents-lifecycle",
+            bucket=self.bucket.id,
+            rules=[
+                # Parts of abandoned multipart uploads are billed until the upload is aborted
+                {
+                    "id": "abort-incomplete-multipart-uploads",
+                    "status": "Enabled",
+                    "filter": {},
+                    "abort_incomplete_multipart_upload": {
+                        "days_after_initiation": abort_multipart_after_days
+                    }
+                },
+                {
+                    "id": "intelligent-tiering",
+                    "status": "Enabled",
+                    "filter": {
+                        "object_size_greater_than": INTELLIGENT_TIERING_MIN_OBJECT_SIZE
+                    },
+                    "transitions": [{
+                        "days": intelligent_tiering_after_days,
+                        "storage_class": "INTELLIGENT_TIERING"
+                    }]
+                }
+            ],
+            opts=self.opts
+        )
+
+        # Publish object events to EventBridge so processing starts on upload
+        s3.BucketNotification(
+            f"{name}-documents-notifications",
+            bucket=self.bucket.id,
+            eventbridge=True,
+            opts=self.opts
+        )
+
+        self.upload_rule = cloudwatch.EventRule(
+            f"{name}-document-uploaded",
+            name=f"{project_name}-{environment}-document-uploaded",
+            event_pattern=self.bucket.bucket.apply(lambda bucket: json.dumps({
+                "source": ["aws.s3"],
+                "detail-type": ["Object Created"],
+                "detail": {
+                    "bucket": {
+                        "name": [bucket]
+                    },
+                    "object": {
+                        "key": [{"prefix": DOCUMENTS_PREFIX}]
+                    }
+                }
+            })),
+            tags={
+                "Name": f"{project_name}-{environment}-document-uploaded",
+                **tags
+            },
+            opts=self.opts
+        )
+
+        if upload_queue:
+            sqs.QueuePolicy(
+                f"{name}-upload-queue-policy",
+                queue_url=upload_queue.id,
+                policy=pulumi.Output.all(upload_queue.arn, self.upload_rule.arn).apply(lambda args: json.dumps({
+                    "Version": "2012-10-17",
+                    "Statement": [{
+                        "Effect": "Allow",
+                        "Principal": {
+                            "Service": "events.amazonaws.com"
+                        },
+                        "Action": "sqs:SendMessage",
+                        "Resource": args[0],
+                        "Condition": {
+                            "ArnEquals": {
+                                "aws:SourceArn": args[1]
+                            }
+                        }
+                    }]
+                })),
+                opts=self.opts
+            )
+
+            cloudwatch.EventTarget(
+                f"{name}-document-uploaded-target",
+                rule=self.upload_rule.name,
+                arn=upload_queue.arn,
+                opts=self.opts
+            )
+
+        # Create the policy the API attaches to read, write and presign documents
+        self.access_policy = iam.Policy(
+            f"{name}-access-policy",
+            description="Read, write and presign uploads to the documents bucket",
+            policy=pulumi.Output.all(self.bucket.arn, self.kms_key.arn).apply(lambda args: json.dumps({
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Effect": "Allow",
+                        "Action": [
+                            "s3:GetObject",
+                            "s3:PutObject",
+                            "s3:DeleteObject",
+                            "s3:AbortMultipartUpload",
+                            "s3:ListMultipartUploadParts"
+                        ],
+                        "Resource": f"{args[0]}/{DOCUMENTS_PREFIX}*"
+                    },
+                    {
+                        "Effect": "Allow",
+                        "Action": ["kms:GenerateDataKey", "kms:Decrypt"],
+                        "Resource": args[1]
+                    }
+                ]
+            })),
+            opts=self.opts
+        )
+
+        self.register_outputs({
+            "bucket_name": self.bucket_name,
+            "access_policy_arn": self.access_policy_arn
+        })
+
+    @property
+    def bucket_name(self):
+        return self.bucket.bucket
+
+    @property
+    def upload_endpoint(self):
+        # Presigned URLs for accelerated uploads have to be issued against the accelerate endpoint
+        if self.transfer_acceleration:
+            return self.bucket.bucket.apply(lambda bucket: f"{bucket}.s3-accelerate.amazonaws.com")
+        return self.bucket.bucket_regional_domain_name
+
+    @property
+    def access_policy_arn(self):
+        return self.access_policy.arn
+
+    @property
+    def kms_key_arn(self):
+        return self.kms_key.arn
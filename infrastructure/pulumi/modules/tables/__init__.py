@@ -0,0 +1,3 @@
+from .tables import Tables
+
+__all__ = ['Tables']
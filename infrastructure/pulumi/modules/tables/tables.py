@@ -0,0 +1,293 @@
+import json
+import pulumi
+from pulumi import ResourceOptions
+from pulumi_aws import appautoscaling, dax, dynamodb, ec2, iam
+
+# Tables behind the resource, collection and chat handlers, keyed by the access pattern each index serves.
+# Listings sort newest first, so every listing index carries createdAt as its range key.
+# DynamoDB cannot index the tags list, so every tag of a resource is also written to resource-tags.
+TABLE_DEFINITIONS = {
+    "resources": {
+        "hash_key": "id",
+        "attributes": {"id": "S", "collection": "S", "type": "S", "userId": "S", "createdAt": "N"},
+        "indexes": [
+            {"name": "CollectionIndex", "hash_key": "collection", "range_key": "createdAt"},
+            {"name": "TypeIndex", "hash_key": "type", "range_key": "createdAt"},
+            {"name": "UserIdIndex", "hash_key": "userId", "range_key": "createdAt"}
+        ]
+    },
+    "resource-tags": {
+        "hash_key": "tag",
+        "range_key": "resourceId",
+        "attributes": {"tag": "S", "resourceId": "S"},
+        "indexes": [
+            {"name": "ResourceIdIndex", "hash_key": "resourceId", "range_key": "tag", "projection_type": "KEYS_ONLY"}
+        ]
+    },
+    "collections": {
+        "hash_key": "id",
+        "attributes": {"id": "S", "parentId": "S"},
+        "indexes": [
+            {"name": "ParentIdIndex", "hash_key": "parentId"}
+        ]
+    },
+    "chat-threads": {
+        "hash_key": "id",
+        "attributes": {"id": "S", "userId": "S", "createdAt": "N"},
+        "indexes": [
+            {"name": "UserIdIndex", "hash_key": "userId", "range_key": "createdAt"}
+        ]
+    },
+    "chat-messages": {
+        "hash_key": "id",
+        "attributes": {"id": "S", "threadId": "S", "createdAt": "N"},
+        "indexes": [
+            {"name": "ThreadIdIndex", "hash_key": "threadId", "range_key": "createdAt"}
+        ]
+    }
+}
+
+# Provisioned capacity bounds, used when billing_mode is PROVISIONED; indexes scale with the same bounds
+DEFAULT_CAPACITY = {
+    "min_read": 5,
+    "max_read": 200,
+    "min_write": 5,
+    "max_write": 100,
+    "target_utilization": 70
+}
+
+# DAX listens on 9111 when the cluster endpoint is TLS-encrypted
+DAX_PORT = 9111
+
+class Tables(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, billing_mode="PAY_PER_REQUEST", capacity=None,
+                 replica_regions=None, dax_enabled=False, vpc_id=None, subnet_ids=None, allowed_security_groups=None,
+                 dax_node_type="dax.t3.medium", dax_replication_factor=3, opts=None):
+        super().__init__("aidocs:tables:Tables", name, None, opts)
+        self.name = name
+        self.project_name = project_name
+        self.environment = environment
+        self.billing_mode = billing_mode
+        self.capacity = {**DEFAULT_CAPACITY, **(capacity or {})}
+        self.replica_regions = replica_regions or []
+        if billing_mode not in ("PAY_PER_REQUEST", "PROVISIONED"):
+            raise ValueError(f"Unsupported DynamoDB billing mode: {billing_mode}")
+        if dax_enabled and not (vpc_id and subnet_ids):
+            raise ValueError("DAX needs the VPC and private subnets to run in")
+        self.opts = ResourceOptions(parent=self)
+
+        provisioned = billing_mode == "PROVISIONED"
+        tags = {
+            "Project": project_name,
+            "Environment": environment,
+            "ManagedBy": "Pulumi"
+        }
+
+        # Create the tables with point-in-time recovery; replica regions turn them into global tables
+        self.tables = {}
+        for table_key, definition in TABLE_DEFINITIONS.items():
+            self.tables[table_key] = dynamodb.Table(
+                f"{name}-{table_key}",
+                name=f"{project_name}-{environment}-{table_key}",
+                billing_mode=billing_mode,
+                read_capacity=self.capacity["min_read"] if provisioned else None,
+                write_capacity=self.capacity["min_write"] if provisioned else None,
+                hash_key=definition["hash_key"],
+                range_key=definition.get("range_key"),
+                attributes=[
+                    {"name": attribute, "type": attribute_type}
+                    for attribute, attribute_type in definition["attributes"].items()
+                ],
+                global_secondary_indexes=[
+                    {
+                        "name": index["name"],
+                        "hash_key": index["hash_key"],
+                        "range_key": index.get("range_key"),
+                        "projection_type": index.get("projection_type", "ALL"),
+                        "read_capacity": self.capacity["min_read"] if provisioned else None,
+                        "write_capacity": self.capacity["min_write"] if provisioned else None
+                    }
+                    for index in definition["indexes"]
+                ],
+                point_in_time_recovery={
+                    "enabled": True
+                },
+                server_side_encryption={
+                    "enabled": True
+                },
+                stream_enabled=True if self.replica_regions else None,
+                stream_view_type="NEW_AND_OLD_IMAGES" if self.replica_regions else None,
+                replicas=[
+                    {
+                        "region_name": region,
+                        "point_in_time_recovery": True
+                    }
+                    for region in self.replica_regions
+                ],
+                tags={
+                    "Name": f"{project_name}-{environment}-{table_key}",
+                    **tags
+                },
+                # Autoscaling owns the provisioned capacity of the table and its indexes
+                opts=ResourceOptions.merge(self.opts, ResourceOptions(
+                    ignore_changes=["read_capacity", "write_capacity", "global_secondary_indexes"] if provisioned else None
+                ))
+            )
+
+        # Track read and write utilisation of every table and index
+        if provisioned:
+            for table_key, definition in TABLE_DEFINITIONS.items():
+                table_name = f"{project_name}-{environment}-{table_key}"
+                scaled = [(table_key, f"table/{table_name}", "table")] + [
+                    (f"{table_key}-{index['name']}", f"table/{table_name}/index/{index['name']}", "index")
+                    for index in definition["indexes"]
+                ]
+                for key, resource_id, scope in scaled:
+                    for operation in ["Read", "Write"]:
+                        target = appautoscaling.Target(
+                            f"{name}-{key}-{operation.lower()}-target",
+                            service_namespace="dynamodb",
+                            resource_id=resource_id,
+                            scalable_dimension=f"dynamodb:{scope}:{operation}CapacityUnits",
+                            min_capacity=self.capacity[f"min_{operation.lower()}"],
+                            max_capacity=self.capacity[f"max_{operation.lower()}"],
+                            opts=ResourceOptions.merge(self.opts, ResourceOptions(depends_on=[self.tables[table_key]]))
+                        )
+
+                        appautoscaling.Policy(
+                            f"{name}-{key}-{operation.lower()}-policy",
+                            policy_type="TargetTrackingScaling",
+                            service_namespace=target.service_namespace,
+                            resource_id=target.resource_id,
+                            scalable_dimension=target.scalable_dimension,
+                            target_tracking_scaling_policy_configuration={
+                                "predefined_metric_specification": {
+                                    "predefined_metric_type": f"DynamoDB{operation}CapacityUtilization"
+                                },
+                                "target_value": self.capacity["target_utilization"]
+                            },
+                            opts=self.opts
+                        )
+
+        # Create the DAX cluster in front of the tables for the hot read path
+        self.dax_cluster = None
+        if dax_enabled:
+            self.dax_subnet_group = dax.SubnetGroup(
+                f"{name}-dax-subnet-group",
+                name=f"{project_name}-{environment}-dax",
+                subnet_ids=subnet_ids,
+                opts=self.opts
+            )
+
+            self.dax_security_group = ec2.SecurityGroup(
+                f"{name}-dax-sg",
+                vpc_id=vpc_id,
+                description="Security group for DAX",
+                tags={
+                    "Name": f"{project_name}-{environment}-dax-sg",
+                    **tags
+                },
+                opts=self.opts
+            )
+
+            # Standalone so the DAX cluster does not wait for the source groups
+            for i, source_security_group in enumerate(allowed_security_groups or []):
+                ec2.SecurityGroupRule(
+                    f"{name}-dax-sg-ingress" if i == 0 else f"{name}-dax-sg-ingress-{i}",
+                    type="ingress",
+                    protocol="tcp",
+                    from_port=DAX_PORT,
+                    to_port=DAX_PORT,
+                    security_group_id=self.dax_security_group.id,
+                    source_security_group_id=source_security_group,
+                    opts=self.opts
+                )
+
+            self.dax_role = iam.Role(
+                f"{name}-dax-role",
+                assume_role_policy=json.dumps({
+                    "Version": "2012-10-17",
+                    "Statement": [{
+                        "Action": "sts:AssumeRole",
+                        "Effect": "Allow",
+                        "Principal": {
+                            "Service": "dax.amazonaws.com"
+                        }
+                    }]
+                }),
+                tags=tags,
+                opts=self.opts
+            )
+
+            iam.RolePolicy(
+                f"{name}-dax-role-policy",
+                role=self.dax_role.id,
+                policy=pulumi.Output.all(*[table.arn for table in self.tables.values()]).apply(
+                    lambda arns: json.dumps({
+                        "Version": "2012-10-17",
+                        "Statement": [{
+                            "Effect": "Allow",
+                            "Action": [
+                                "dynamodb:GetItem",
+                                "dynamodb:BatchGetItem",
+                                "dynamodb:Query",
+                                "dynamodb:Scan",
+                                "dynamodb:PutItem",
+                                "dynamodb:UpdateItem",
+                                "dynamodb:DeleteItem",
+                                "dynamodb:BatchWriteItem",
+                                "dynamodb:ConditionCheckItem",
+                                "dynamodb:DescribeTable"
+                            ],
+                            "Resource": arns + [f"{arn}/index/*" for arn in arns]
+                        }]
+                    })
+                ),
+                opts=self.opts
+            )
+
+            self.dax_cluster = dax.Cluster(
+                f"{name}-dax",
+                # DAX cluster names are limited to 20 characters
+                cluster_name=f"{project_name}-{environment}"[:20],
+                node_type=dax_node_type,
+                replication_factor=dax_replication_factor,
+                iam_role_arn=self.dax_role.arn,
+                subnet_group_name=self.dax_subnet_group.name,
+                security_group_ids=[self.dax_security_group.id],
+                cluster_endpoint_encryption_type="TLS",
+                server_side_encryption={
+                    "enabled": True
+                },
+                maintenance_window="mon:05:00-mon:06:00",
+                tags={
+                    "Name": f"{project_name}-{environment}-dax",
+                    **tags
+                },
+                opts=self.opts
+            )
+
+        self.register_outputs({
+            "table_names": self.table_names,
+            "index_names": self.index_names,
+            "dax_endpoint": self.dax_endpoint
+        })
+
+    @property
+    def table_names(self):
+        return {table_key: table.name for table_key, table in self.tables.items()}
+
+    @property
+    def table_arns(self):
+        return {table_key: table.arn for table_key, table in self.tables.items()}
+
+    @property
+    def index_names(self):
+        return {
+            table_key: [index["name"] for index in definition["indexes"]]
+            for table_key, definition in TABLE_DEFINITIONS.items()
+        }
+
+    @property
+    def dax_endpoint(self):
+        return self.dax_cluster.cluster_address if self.dax_cluster else None
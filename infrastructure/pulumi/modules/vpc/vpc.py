@@ -1,14 +1,65 @@
+import ipaddress
 import pulumi
 from pulumi import ResourceOptions
-from pulumi_aws import ec2
+from pulumi_aws import ec2, get_availability_zones, get_region
 
-class Vpc:
-    def __init__(self, name, project_name, environment, vpc_cidr, opts=None):
+# Services reached through gateway endpoints on the private route tables (free, no per-GB charge)
+GATEWAY_ENDPOINT_SERVICES = ["s3", "dynamodb"]
+
+# Services reached through interface endpoints in the private subnets
+INTERFACE_ENDPOINT_SERVICES = ["ecr.api", "ecr.dkr", "logs", "sts", "secretsmanager", "bedrock-runtime"]
+
+# Allocate aligned, non-overlapping subnets of the given prefix lengths from vpc_cidr, in order
+def carve_subnets(vpc_cidr, prefixes):
+    network = ipaddress.ip_network(vpc_cidr)
+    # Allocate the largest blocks first so smaller ones fill the gaps without breaking alignment
+    order = sorted(range(len(prefixes)), key=lambda i: prefixes[i])
+    allocated = [None] * len(prefixes)
+    cursor = int(network.network_address)
+    for i in order:
+        size = 2 ** (32 - prefixes[i])
+        cursor = (cursor + size - 1) // size * size
+        subnet = ipaddress.ip_network((cursor, prefixes[i]))
+        if not subnet.subnet_of(network):
+            raise ValueError(f"{vpc_cidr} is too small for subnets of prefix lengths {prefixes}")
+        allocated[i] = str(subnet)
+        cursor += size
+    return allocated
+
+class Vpc(pulumi.ComponentResource):
+    def __init__(self, name, project_name, environment, vpc_cidr, az_count=2, availability_zones=None,
+                 public_subnet_prefix=24, private_subnet_prefix=19, single_nat_gateway=False,
+                 enable_vpc_endpoints=False, interface_endpoint_services=None, subnet_cidrs=None, opts=None):
+        super().__init__("aidocs:vpc:Vpc", name, None, opts)
         self.name = name
         self.project_name = project_name
         self.environment = environment
         self.vpc_cidr = vpc_cidr
-        self.opts = opts or ResourceOptions()
+        # Resources predate the component, the alias keeps their original top-level URNs
+        self.opts = ResourceOptions(parent=self, aliases=[pulumi.Alias(parent=pulumi.ROOT_STACK_RESOURCE)])
+
+        # Look up the AZs of the provider's region unless they were given explicitly
+        if not availability_zones:
+            availability_zones = get_availability_zones(
+                state="available",
+                opts=pulumi.InvokeOptions(parent=self)
+            ).names[:az_count]
+        if len(availability_zones) < az_count:
+            raise ValueError(f"Requested {az_count} availability zones but only {len(availability_zones)} are available")
+        self.availability_zones = availability_zones[:az_count]
+        self.single_nat_gateway = single_nat_gateway
+
+        # Stacks whose subnets predate carving pin their CIDRs; re-carving them would replace the subnets
+        # and everything placed in them
+        if subnet_cidrs:
+            if len(subnet_cidrs["public"]) != az_count or len(subnet_cidrs["private"]) != az_count:
+                raise ValueError(f"subnet_cidrs must list {az_count} public and {az_count} private CIDRs")
+            self.public_subnet_cidrs = list(subnet_cidrs["public"])
+            self.private_subnet_cidrs = list(subnet_cidrs["private"])
+        else:
+            cidrs = carve_subnets(vpc_cidr, [private_subnet_prefix] * az_count + [public_subnet_prefix] * az_count)
+            self.private_subnet_cidrs = cidrs[:az_count]
+            self.public_subnet_cidrs = cidrs[az_count:]
 
         # Create VPC
         self.vpc = ec2.Vpc(
@@ -27,12 +78,12 @@ class Vpc:
 
         # Create public subnets
         self.public_subnets = []
-        for i in range(2):
+        for i, (az, cidr) in enumerate(zip(self.availability_zones, self.public_subnet_cidrs)):
             subnet = ec2.Subnet(
                 f"{name}-public-subnet-{i}",
                 vpc_id=self.vpc.id,
-                cidr_block=f"10.0.{i}.0/24",
-                availability_zone=f"us-east-1{chr(97 + i)}",
+                cidr_block=cidr,
+                availability_zone=az,
                 map_public_ip_on_launch=True,
                 tags={
                     "Name": f"{project_name}-{environment}-public-subnet-{i}",
@@ -46,12 +97,12 @@ class Vpc:
 
         # Create private subnets
         self.private_subnets = []
-        for i in range(2):
+        for i, (az, cidr) in enumerate(zip(self.availability_zones, self.private_subnet_cidrs)):
             subnet = ec2.Subnet(
                 f"{name}-private-subnet-{i}",
                 vpc_id=self.vpc.id,
-                cidr_block=f"10.0.{i + 2}.0/24",
-                availability_zone=f"us-east-1{chr(97 + i)}",
+                cidr_block=cidr,
+                availability_zone=az,
                 tags={
                     "Name": f"{project_name}-{environment}-private-subnet-{i}",
                     "Project": project_name,
@@ -75,31 +126,42 @@ class Vpc:
             opts=self.opts
         )
 
-        # Create NAT Gateway
-        self.nat_eip = ec2.Eip(
-            f"{name}-nat-eip",
-            vpc=True,
-            tags={
-                "Name": f"{project_name}-{environment}-nat-eip",
-                "Project": project_name,
-                "Environment": environment,
-                "ManagedBy": "Pulumi"
-            },
-            opts=self.opts
-        )
+        # The first NAT gateway and private route table keep the state of the single ones that came before
+        def legacy_alias(i, legacy_name):
+            if i:
+                return self.opts
+            return ResourceOptions.merge(self.opts, ResourceOptions(
+                aliases=[pulumi.Alias(name=legacy_name, parent=pulumi.ROOT_STACK_RESOURCE)]
+            ))
 
-        self.nat_gateway = ec2.NatGateway(
-            f"{name}-nat-gateway",
-            allocation_id=self.nat_eip.id,
-            subnet_id=self.public_subnets[0].id,
-            tags={
-                "Name": f"{project_name}-{environment}-nat-gateway",
-                "Project": project_name,
-                "Environment": environment,
-                "ManagedBy": "Pulumi"
-            },
-            opts=self.opts
-        )
+        # Create NAT Gateways, one per AZ unless a single shared one was requested
+        self.nat_gateways = []
+        for i in range(1 if single_nat_gateway else az_count):
+            nat_eip = ec2.Eip(
+                f"{name}-nat-eip-{i}",
+                domain="vpc",
+                tags={
+                    "Name": f"{project_name}-{environment}-nat-eip-{i}",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=legacy_alias(i, f"{name}-nat-eip")
+            )
+
+            nat_gateway = ec2.NatGateway(
+                f"{name}-nat-gateway-{i}",
+                allocation_id=nat_eip.id,
+                subnet_id=self.public_subnets[i].id,
+                tags={
+                    "Name": f"{project_name}-{environment}-nat-gateway-{i}",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=ResourceOptions.merge(legacy_alias(i, f"{name}-nat-gateway"), ResourceOptions(depends_on=[self.igw]))
+            )
+            self.nat_gateways.append(nat_gateway)
 
         # Create route tables
         self.public_route_table = ec2.RouteTable(
@@ -120,23 +182,27 @@ class Vpc:
             opts=self.opts
         )
 
-        self.private_route_table = ec2.RouteTable(
-            f"{name}-private-rt",
-            vpc_id=self.vpc.id,
-            routes=[
-                {
-                    "cidr_block": "0.0.0.0/0",
-                    "nat_gateway_id": self.nat_gateway.id
-                }
-            ],
-            tags={
-                "Name": f"{project_name}-{environment}-private-rt",
-                "Project": project_name,
-                "Environment": environment,
-                "ManagedBy": "Pulumi"
-            },
-            opts=self.opts
-        )
+        # Each AZ routes egress through its own NAT so traffic never crosses AZs
+        self.private_route_tables = []
+        for i in range(az_count):
+            route_table = ec2.RouteTable(
+                f"{name}-private-rt-{i}",
+                vpc_id=self.vpc.id,
+                routes=[
+                    {
+                        "cidr_block": "0.0.0.0/0",
+                        "nat_gateway_id": self.nat_gateways[i % len(self.nat_gateways)].id
+                    }
+                ],
+                tags={
+                    "Name": f"{project_name}-{environment}-private-rt-{i}",
+                    "Project": project_name,
+                    "Environment": environment,
+                    "ManagedBy": "Pulumi"
+                },
+                opts=legacy_alias(i, f"{name}-private-rt")
+            )
+            self.private_route_tables.append(route_table)
 
         # Associate route tables with subnets
         for i, subnet in enumerate(self.public_subnets):
@@ -147,13 +213,83 @@ class Vpc:
                 opts=self.opts
             )
 
+        self.private_route_table_associations = []
         for i, subnet in enumerate(self.private_subnets):
-            ec2.RouteTableAssociation(
+            self.private_route_table_associations.append(ec2.RouteTableAssociation(
                 f"{name}-private-rt-assoc-{i}",
                 subnet_id=subnet.id,
-                route_table_id=self.private_route_table.id,
+                route_table_id=self.private_route_tables[i].id,
                 opts=self.opts
-            )
+            ))
+
+        # Create VPC endpoints so AWS API traffic bypasses the NAT gateways
+        self.gateway_endpoints = {}
+        self.interface_endpoints = {}
+        if enable_vpc_endpoints:
+            region = get_region(opts=pulumi.InvokeOptions(parent=self)).name
+
+            for service in GATEWAY_ENDPOINT_SERVICES:
+                self.gateway_endpoints[service] = ec2.VpcEndpoint(
+                    f"{name}-{service}-endpoint",
+                    vpc_id=self.vpc.id,
+                    service_name=f"com.amazonaws.{region}.{service}",
+                    vpc_endpoint_type="Gateway",
+                    route_table_ids=self.private_route_table_ids,
+                    tags={
+                        "Name": f"{project_name}-{environment}-{service}-endpoint",
+                        "Project": project_name,
+                        "Environment": environment,
+                        "ManagedBy": "Pulumi"
+                    },
+                    opts=self.opts
+                )
+
+            for service in interface_endpoint_services or INTERFACE_ENDPOINT_SERVICES:
+                resource_name = service.replace(".", "-")
+                security_group = ec2.SecurityGroup(
+                    f"{name}-{resource_name}-endpoint-sg",
+                    vpc_id=self.vpc.id,
+                    description=f"Security group for the {service} VPC endpoint",
+                    ingress=[
+                        {
+                            "protocol": "tcp",
+                            "from_port": 443,
+                            "to_port": 443,
+                            "cidr_blocks": [vpc_cidr]
+                        }
+                    ],
+                    tags={
+                        "Name": f"{project_name}-{environment}-{resource_name}-endpoint-sg",
+                        "Project": project_name,
+                        "Environment": environment,
+                        "ManagedBy": "Pulumi"
+                    },
+                    opts=self.opts
+                )
+
+                self.interface_endpoints[service] = ec2.VpcEndpoint(
+                    f"{name}-{resource_name}-endpoint",
+                    vpc_id=self.vpc.id,
+                    service_name=f"com.amazonaws.{region}.{service}",
+                    vpc_endpoint_type="Interface",
+                    subnet_ids=self.private_subnet_ids,
+                    security_group_ids=[security_group.id],
+                    private_dns_enabled=True,
+                    tags={
+                        "Name": f"{project_name}-{environment}-{resource_name}-endpoint",
+                        "Project": project_name,
+                        "Environment": environment,
+                        "ManagedBy": "Pulumi"
+                    },
+                    opts=self.opts
+                )
+
+        self.register_outputs({
+            "vpc_id": self.vpc_id,
+            "public_subnet_ids": self.public_subnet_ids,
+            "private_subnet_ids": self.private_subnet_ids,
+            "nat_gateway_ids": self.nat_gateway_ids
+        })
 
     @property
     def vpc_id(self):
@@ -165,4 +301,25 @@ class Vpc:
 
     @property
     def private_subnet_ids(self):
-        return [subnet.id for subnet in self.private_subnets] 
\ No newline at end of file
+        return [subnet.id for subnet in self.private_subnets]
+
+    # Private subnet IDs that resolve only once the subnet routes egress through its NAT gateway
+    @property
+    def routed_private_subnet_ids(self):
+        return [
+            pulumi.Output.all(subnet.id, association.id).apply(lambda args: args[0])
+            for subnet, association in zip(self.private_subnets, self.private_route_table_associations)
+        ]
+
+    @property
+    def private_route_table_ids(self):
+        return [route_table.id for route_table in self.private_route_tables]
+
+    @property
+    def nat_gateway_ids(self):
+        return [nat_gateway.id for nat_gateway in self.nat_gateways]
+
+    @property
+    def vpc_endpoint_ids(self):
+        endpoints = {**self.gateway_endpoints, **self.interface_endpoints}
+        return {service: endpoint.id for service, endpoint in endpoints.items()}
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""Measure how long the Pulumi program takes to construct, and how many resources it registers,
+as the number of environments, availability zones and node pools grows.
+
+Runs entirely against the offline mocks: python tests/benchmark.py [--repeat N] [--json]
+"""
+import argparse
+import itertools
+import json
+import statistics
+
+from program import run_program
+
+ENVIRONMENTS = ["dev", "staging", "prod"]
+AZ_COUNTS = [2, 3]
+NODE_POOL_COUNTS = [1, 2, 4]
+
+
+def node_pools(count):
+    return [
+        {
+            "name": "default" if i == 0 else f"pool-{i}",
+            "instance_types": ["m6i.large"],
+            "min_size": 1,
+            "max_size": 4
+        }
+        for i in range(count)
+    ]
+
+
+def benchmark(repeat=3):
+    results = []
+    for environments, az_count, pool_count in itertools.product(range(1, len(ENVIRONMENTS) + 1), AZ_COUNTS, NODE_POOL_COUNTS):
+        seconds = []
+        resources = 0
+        for _ in range(repeat):
+            # Every environment is its own stack, so a full rollout constructs the program once per environment
+            run_seconds = 0
+            run_resources = 0
+            for environment in ENVIRONMENTS[:environments]:
+                graph = run_program({
+                    "environment": environment,
+                    "azCount": az_count,
+                    "eksNodePools": node_pools(pool_count)
+                })
+                run_seconds += graph["seconds"]
+                run_resources += len(graph["resources"])
+            seconds.append(run_seconds)
+            resources = run_resources
+        results.append({
+            "environments": environments,
+            "az_count": az_count,
+            "node_pools": pool_count,
+            "resources": resources,
+            "median_seconds": statistics.median(seconds),
+            "max_seconds": max(seconds)
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="Constructions per configuration")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = benchmark(args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'envs':>4} {'azs':>4} {'pools':>5} {'resources':>9} {'median s':>9} {'max s':>7} {'ms/resource':>11}")
+    for result in results:
+        print(
+            f"{result['environments']:>4} {result['az_count']:>4} {result['node_pools']:>5} {result['resources']:>9} "
+            f"{result['median_seconds']:>9.3f} {result['max_seconds']:>7.3f} "
+            f"{1000 * result['median_seconds'] / result['resources']:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pulumi
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mocks import InfraMocks
+
+# Components look up AZs from the provider region, so anything pinned to us-east-1 shows up here
+MOCKS = InfraMocks(region="eu-west-1")
+pulumi.runtime.set_mocks(MOCKS, project="aidocs-assistant", stack="test", preview=False)
+
+
+@pytest.fixture
+def mocks():
+    MOCKS.resources.clear()
+    return MOCKS
+
+
+# Construct a component and wait until every resource it registers has reached the mocks
+@pytest.fixture
+def build(mocks):
+    def build(factory):
+        components = []
+
+        @pulumi.runtime.test
+        def construct():
+            components.append(factory())
+
+        construct()
+        return components[0]
+
+    return build
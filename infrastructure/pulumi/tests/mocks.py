@@ -0,0 +1,87 @@
+import json
+import pulumi
+from pulumi.runtime.mocks import MockMonitor
+
+
+# Offline stand-in for the Pulumi engine and the AWS provider; records every resource it is asked to create
+class InfraMocks(pulumi.runtime.Mocks):
+    def __init__(self, region="eu-west-1", zone_count=3):
+        self.region = region
+        self.zone_count = zone_count
+        self.resources = []
+
+    def new_resource(self, args):
+        self.resources.append({
+            "type": args.typ,
+            "name": args.name,
+            "inputs": dict(args.inputs)
+        })
+
+        outputs = dict(args.inputs)
+        # Policies built as dicts come back from the provider as JSON documents
+        for key, value in args.inputs.items():
+            if "olicy" in key and isinstance(value, (dict, list)):
+                outputs[key] = json.dumps(value)
+        outputs.setdefault("arn", f"arn:aws:mock:{self.region}:123456789012:{args.name}")
+        outputs.setdefault("name", args.name)
+        outputs.setdefault("endpoint", f"{args.name}.{self.region}.mock.amazonaws.com")
+        outputs.setdefault("readerEndpoint", f"ro.{args.name}.{self.region}.mock.amazonaws.com")
+
+        if args.typ == "aws:eks/cluster:Cluster":
+            outputs["identities"] = [{"oidcs": [{"issuer": f"https://oidc.eks.{self.region}.amazonaws.com/id/MOCK"}]}]
+            outputs["certificateAuthority"] = {"data": "bW9jaw=="}
+            outputs["vpcConfig"] = dict(outputs.get("vpcConfig", {}), clusterSecurityGroupId="sg-cluster")
+        if args.typ == "aws:iam/openIdConnectProvider:OpenIdConnectProvider":
+            outputs["url"] = f"oidc.eks.{self.region}.amazonaws.com/id/MOCK"
+        if args.typ == "aws:ec2/launchTemplate:LaunchTemplate":
+            outputs["latestVersion"] = 1
+        if args.typ == "aws:elasticache/replicationGroup:ReplicationGroup":
+            outputs["primaryEndpointAddress"] = f"master.{args.name}.{self.region}.cache.amazonaws.com"
+            outputs["readerEndpointAddress"] = f"replica.{args.name}.{self.region}.cache.amazonaws.com"
+            outputs["configurationEndpointAddress"] = f"clustercfg.{args.name}.{self.region}.cache.amazonaws.com"
+
+        return [f"{args.name}-id", outputs]
+
+    def call(self, args):
+        if args.token == "aws:index/getAvailabilityZones:getAvailabilityZones":
+            zones = [f"{self.region}{suffix}" for suffix in "abcdef"[:self.zone_count]]
+            return {"names": zones, "zoneIds": zones}
+        if args.token == "aws:index/getRegion:getRegion":
+            return {"name": self.region, "region": self.region}
+        if args.token == "aws:index/getCallerIdentity:getCallerIdentity":
+            return {"accountId": "123456789012", "arn": "arn:aws:iam::123456789012:user/mock", "userId": "mock"}
+        if args.token == "aws:index/getPartition:getPartition":
+            return {"partition": "aws", "dnsSuffix": "amazonaws.com"}
+        return {}
+
+    def of_type(self, resource_type):
+        return [resource["inputs"] for resource in self.resources if resource["type"] == resource_type]
+
+    def named(self, name):
+        return next(resource["inputs"] for resource in self.resources if resource["name"] == name)
+
+
+# Mock monitor that also records what each registration waits on, the way the engine schedules it
+class GraphMonitor(MockMonitor):
+    def __init__(self, mocks):
+        super().__init__(mocks)
+        self.registrations = []
+
+    def RegisterResource(self, request):
+        response = super().RegisterResource(request)
+
+        dependencies = set(request.dependencies)
+        for property_dependencies in request.propertyDependencies.values():
+            dependencies.update(property_dependencies.urns)
+        # Provider references are "<urn>::<id>"
+        if request.provider:
+            dependencies.add(request.provider.rsplit("::", 1)[0])
+
+        self.registrations.append({
+            "urn": response.urn,
+            "type": request.type,
+            "custom": request.custom,
+            "parent": request.parent,
+            "dependencies": sorted(dependencies)
+        })
+        return response
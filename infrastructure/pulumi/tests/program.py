@@ -0,0 +1,75 @@
+"""Construct the full Pulumi program against the offline mocks and print the resource graph as JSON.
+
+Provider configuration (aws:region) is read when the program is imported, so every configuration
+is built in a fresh interpreter: python tests/program.py '<config as JSON>'
+"""
+import json
+import os
+import runpy
+import subprocess
+import sys
+import time
+
+PROGRAM_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT = "aidocs-assistant"
+
+BASE_CONFIG = {
+    "projectName": PROJECT,
+    "environment": "dev",
+    "vpcCidr": "10.0.0.0/16",
+    "allowedCidrBlocks": ["10.0.0.0/16"],
+    "dbName": "aidocs_assistant",
+    "dbUsername": "aidocs_admin",
+    "dbPassword": "mock-password",
+    "alertEmail": "alerts@example.com",
+    "aws:region": "eu-west-1"
+}
+
+
+def build(config):
+    import pulumi
+    from pulumi.runtime.stack import wait_for_rpcs
+    from pulumi.runtime.sync_await import _sync_await
+
+    sys.path.insert(0, PROGRAM_DIR)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from mocks import GraphMonitor, InfraMocks
+
+    config = {**BASE_CONFIG, **config}
+    pulumi.runtime.set_all_config({
+        key if ":" in key else f"{PROJECT}:{key}": value if isinstance(value, str) else json.dumps(value)
+        for key, value in config.items()
+    })
+    mocks = InfraMocks(region=config["aws:region"])
+    monitor = GraphMonitor(mocks)
+    pulumi.runtime.set_mocks(mocks, project=PROJECT, stack=config["environment"], preview=True, monitor=monitor)
+
+    started = time.perf_counter()
+    runpy.run_path(os.path.join(PROGRAM_DIR, "__main__.py"), run_name="__main__")
+    _sync_await(wait_for_rpcs())
+    elapsed = time.perf_counter() - started
+
+    return {
+        "seconds": elapsed,
+        "resources": mocks.resources,
+        "graph": monitor.registrations
+    }
+
+
+# Build the program for the given configuration in a child interpreter and return the graph
+def run_program(config):
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), json.dumps(config)],
+        cwd=PROGRAM_DIR,
+        capture_output=True,
+        text=True,
+        check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Program construction failed for {config}:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    graph = build(json.loads(sys.argv[1]) if len(sys.argv) > 1 else {})
+    print(json.dumps(graph, default=str))
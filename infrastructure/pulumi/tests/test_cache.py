@@ -0,0 +1,41 @@
+import pulumi
+
+from modules.cache import Cache
+
+
+def make_cache(**kwargs):
+    return Cache(
+        "cache",
+        project_name="aidocs-assistant",
+        environment="test",
+        vpc_id="vpc-test",
+        subnet_ids=["subnet-a", "subnet-b"],
+        allowed_security_groups=["sg-nodes"],
+        **kwargs
+    )
+
+
+def resolve(build, factory, output):
+    values = []
+
+    def construct():
+        component = factory()
+        pulumi.Output.all(output(component), pulumi.Output.is_secret(output(component))).apply(values.append)
+        return component
+
+    build(construct)
+    return values[0]
+
+
+def test_redis_url_without_auth_is_plain(build, mocks):
+    url, secret = resolve(build, make_cache, lambda cache: cache.redis_url)
+
+    assert url == "rediss://master.cache-replication-group.eu-west-1.cache.amazonaws.com:6379"
+    assert not secret
+
+
+def test_redis_url_carries_the_auth_token_as_a_secret(build, mocks):
+    url, secret = resolve(build, lambda: make_cache(auth_token=pulumi.Output.secret("to#ken")), lambda cache: cache.redis_url)
+
+    assert url == "rediss://:to%23ken@master.cache-replication-group.eu-west-1.cache.amazonaws.com:6379"
+    assert secret
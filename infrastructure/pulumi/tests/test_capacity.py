@@ -0,0 +1,98 @@
+import pytest
+
+from modules.capacity import plan_capacity, sizing_report
+from modules.capacity.capacity import MAX_NODES_PER_POOL, NODE_TYPES
+from modules.rds.rds import STORAGE_PRESETS
+
+PROD_TARGETS = {
+    "peak_rps": 500,
+    "concurrent_chat_sessions": 2000,
+    "document_count": 1000000,
+    "average_document_mb": 2,
+    "p99_latency_ms": 300
+}
+
+
+def test_dev_defaults_stay_small():
+    plan = plan_capacity(environment="dev")
+
+    assert plan["az_count"] == 2
+    assert plan["single_nat_gateway"] is True
+    assert plan["db_instance_class"] == "db.t4g.medium"
+    assert plan["db_replica_count"] == 0
+    assert plan["cache_node_type"] == "cache.t4g.medium"
+
+
+def test_production_avoids_burstable_and_single_points_of_failure():
+    plan = plan_capacity(PROD_TARGETS, "prod")
+
+    assert plan["az_count"] == 3
+    assert plan["single_nat_gateway"] is False
+    assert not plan["eks_node_pools"][0]["instance_types"][0].startswith("t")
+    assert not plan["db_instance_class"].startswith("db.t")
+    assert not plan["cache_node_type"].startswith("cache.t")
+    assert plan["db_replica_count"] >= 1
+
+
+def test_node_pool_is_balanced_across_azs():
+    plan = plan_capacity(PROD_TARGETS, "prod")
+
+    node_pool = plan["eks_node_pools"][0]
+    assert node_pool["min_size"] % plan["az_count"] == 0
+    assert node_pool["max_size"] == node_pool["min_size"] * 2
+
+
+def test_more_load_never_shrinks_the_plan():
+    small = plan_capacity({"peak_rps": 50}, "prod")
+    large = plan_capacity({"peak_rps": 1000}, "prod")
+
+    node_types = [instance_type for instance_type, _, _ in NODE_TYPES]
+    small_pool, large_pool = small["eks_node_pools"][0], large["eks_node_pools"][0]
+    assert node_types.index(large_pool["instance_types"][0]) >= node_types.index(small_pool["instance_types"][0])
+    assert large["demand"]["api_vcpu"] > small["demand"]["api_vcpu"]
+    assert large["db_replica_count"] >= small["db_replica_count"]
+
+
+def test_tighter_latency_target_buys_headroom():
+    relaxed = plan_capacity({"peak_rps": 500, "p99_latency_ms": 2000}, "prod")
+    strict = plan_capacity({"peak_rps": 500, "p99_latency_ms": 200}, "prod")
+
+    assert strict["demand"]["api_vcpu"] > relaxed["demand"]["api_vcpu"]
+
+
+def test_high_iops_moves_gp3_to_provisioned_size():
+    storage = plan_capacity({"peak_rps": 3000}, "prod")["db_storage"]
+
+    # RDS rejects gp3 IOPS and throughput below 12000 and 500 MiB/s once storage is 400 GB or more
+    assert storage["allocated_storage"] >= 400
+    assert storage["iops"] >= 12000
+    assert storage["storage_throughput"] >= 500
+
+
+def test_node_pools_stay_under_the_pool_size_limit():
+    node_pools = plan_capacity({"peak_rps": 10000}, "prod")["eks_node_pools"]
+
+    assert len(node_pools) > 1
+    assert all(node_pool["max_size"] <= MAX_NODES_PER_POOL for node_pool in node_pools)
+    assert len({node_pool["name"] for node_pool in node_pools}) == len(node_pools)
+
+
+def test_targets_beyond_rds_limits_are_rejected():
+    # 40000 rps needs more IOPS than gp3 provides
+    with pytest.raises(ValueError, match="IOPS"):
+        plan_capacity({"peak_rps": 40000}, "prod")
+
+
+def test_storage_never_drops_below_the_environment_preset():
+    for targets in [None, {"peak_rps": 500}, PROD_TARGETS]:
+        storage = plan_capacity(targets, "prod")["db_storage"]
+        for key, value in STORAGE_PRESETS["prod"].items():
+            if key != "storage_type":
+                assert storage[key] >= value, key
+
+
+def test_sizing_report_lists_every_component():
+    report = sizing_report(plan_capacity(PROD_TARGETS, "prod"), PROD_TARGETS, "prod")
+
+    for heading in ["network:", "nodes:", "db:", "storage:", "cache:"]:
+        assert heading in report
@@ -0,0 +1,66 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools"))
+
+from critical_path import critical_path, load_program, report, schedule
+
+
+def resource(name, resource_type, *dependencies, custom=True):
+    return {
+        "urn": f"urn:pulumi:test::aidocs-assistant::{resource_type}::{name}",
+        "type": resource_type,
+        "custom": custom,
+        "parent": None,
+        "dependencies": [f"urn:pulumi:test::aidocs-assistant::{dependency}" for dependency in dependencies]
+    }
+
+
+GRAPH = [
+    resource("vpc", "aws:ec2/vpc:Vpc"),
+    resource("nat", "aws:ec2/natGateway:NatGateway", "aws:ec2/vpc:Vpc::vpc"),
+    resource("cluster", "aws:eks/cluster:Cluster", "aws:ec2/vpc:Vpc::vpc"),
+    resource("nodes", "aws:eks/nodeGroup:NodeGroup", "aws:eks/cluster:Cluster::cluster", "aws:ec2/natGateway:NatGateway::nat"),
+    resource("database", "aws:rds/instance:Instance", "aws:ec2/vpc:Vpc::vpc")
+]
+DURATIONS = {
+    "aws:ec2/vpc:Vpc": 5,
+    "aws:ec2/natGateway:NatGateway": 120,
+    "aws:eks/cluster:Cluster": 600,
+    "aws:eks/nodeGroup:NodeGroup": 240,
+    "aws:rds/instance:Instance": 600
+}
+
+
+def test_schedule_follows_slowest_dependency():
+    resources, timing, total = schedule(GRAPH, DURATIONS)
+
+    assert total == 5 + 600 + 240
+    assert [urn.rsplit("::", 1)[-1] for urn in critical_path(timing, total)] == ["vpc", "cluster", "nodes"]
+    nat = timing["urn:pulumi:test::aidocs-assistant::aws:ec2/natGateway:NatGateway::nat"]
+    assert nat["slack"] == 600 - 120
+    database = timing["urn:pulumi:test::aidocs-assistant::aws:rds/instance:Instance::database"]
+    assert database["slack"] == 240
+
+
+def test_report_lists_parallel_work():
+    result = report(GRAPH, DURATIONS, slow_threshold=60)
+
+    assert result["serial_seconds"] == sum(DURATIONS.values())
+    assert [step["resource"] for step in result["parallel_slow_resources"]] == [
+        "aws:rds/instance:Instance database",
+        "aws:ec2/natGateway:NatGateway nat"
+    ]
+
+
+def test_stack_graph_is_parented():
+    graph = load_program({})
+
+    top_level = [
+        entry["type"] for entry in graph
+        if entry["custom"] and "pulumi:pulumi:Stack::" in (entry["parent"] or "")
+        and not entry["type"].startswith("pulumi:providers:")
+    ]
+    assert top_level == []
+    node_group = next(entry for entry in graph if entry["type"] == "aws:eks/nodeGroup:NodeGroup")
+    assert any("RouteTableAssociation" in dependency for dependency in node_group["dependencies"])
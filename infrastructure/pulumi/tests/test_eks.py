@@ -0,0 +1,115 @@
+import json
+
+from modules.eks import Eks
+from modules.eks.eks import DEFAULT_NODE_POOLS
+from modules.eks.user_data import node_sysctl_script
+
+NODE_POOLS = [
+    {
+        "name": "general",
+        "capacity_type": "ON_DEMAND",
+        "architecture": "arm64",
+        "instance_types": ["m7g.xlarge"],
+        "min_size": 3,
+        "desired_size": 3,
+        "max_size": 12,
+        "max_pods": 58
+    },
+    {
+        "name": "batch",
+        "capacity_type": "SPOT",
+        "instance_types": ["c6i.2xlarge", "c6a.2xlarge"],
+        "min_size": 0,
+        "max_size": 20,
+        "disk_iops": 6000,
+        "taints": [{"key": "workload", "value": "batch", "effect": "NO_SCHEDULE"}]
+    }
+]
+
+
+def make_eks(**kwargs):
+    return Eks(
+        "eks",
+        project_name="aidocs-assistant",
+        environment="test",
+        vpc_id="vpc-test",
+        subnet_ids=["subnet-a", "subnet-b", "subnet-c"],
+        eks_node_iam_role_arn="arn:aws:iam::123456789012:role/node",
+        **kwargs
+    )
+
+
+def test_default_node_group_scaling_bounds(build, mocks):
+    build(make_eks)
+
+    node_group = mocks.named("eks-node-group")
+    pool = DEFAULT_NODE_POOLS[0]
+    # Replacements create the new group first, so the physical name must not be fixed
+    assert "nodeGroupName" not in node_group
+    assert node_group["nodeGroupNamePrefix"] == "aidocs-assistant-test-ng-"
+    assert node_group["instanceTypes"] == pool["instance_types"]
+    assert node_group["scalingConfig"] == {
+        "minSize": pool["min_size"],
+        "desiredSize": pool["desired_size"],
+        "maxSize": pool["max_size"]
+    }
+    assert node_group["subnetIds"] == ["subnet-a", "subnet-b", "subnet-c"]
+
+
+def test_node_pools(build, mocks):
+    build(lambda: make_eks(node_pools=NODE_POOLS))
+
+    general = mocks.named("eks-node-group-general")
+    assert general["amiType"] == "AL2023_ARM_64_STANDARD"
+    assert general["instanceTypes"] == ["m7g.xlarge"]
+    assert general["scalingConfig"] == {"minSize": 3, "desiredSize": 3, "maxSize": 12}
+
+    batch = mocks.named("eks-node-group-batch")
+    assert batch["capacityType"] == "SPOT"
+    assert batch["amiType"] == "AL2023_x86_64_STANDARD"
+    # Unset desired size starts the pool at its minimum
+    assert batch["scalingConfig"] == {"minSize": 0, "desiredSize": 0, "maxSize": 20}
+    assert batch["taints"] == [{"key": "workload", "value": "batch", "effect": "NO_SCHEDULE"}]
+
+    assert len(mocks.of_type("aws:eks/nodeGroup:NodeGroup")) == len(NODE_POOLS)
+
+
+def test_launch_template_root_volume(build, mocks):
+    build(lambda: make_eks(node_pools=NODE_POOLS))
+
+    launch_template = mocks.named("eks-launch-template-batch")
+    ebs = launch_template["blockDeviceMappings"][0]["ebs"]
+    assert ebs["volumeType"] == "gp3"
+    assert ebs["iops"] == 6000
+    assert ebs["throughput"] == 125
+    assert launch_template["metadataOptions"]["httpTokens"] == "required"
+
+
+def test_vpc_cni_prefix_delegation(build, mocks):
+    build(make_eks)
+
+    addons = {addon["addonName"]: addon for addon in mocks.of_type("aws:eks/addon:Addon")}
+    assert "ENABLE_PREFIX_DELEGATION" in addons["vpc-cni"]["configurationValues"]
+    assert "amazon-cloudwatch-observability" in addons
+
+
+def test_container_insights_can_be_disabled(build, mocks):
+    build(lambda: make_eks(container_insights_enabled=False))
+
+    addons = [addon["addonName"] for addon in mocks.of_type("aws:eks/addon:Addon")]
+    assert "amazon-cloudwatch-observability" not in addons
+
+
+def test_containerd_restarts_to_pick_up_its_file_limit():
+    script = node_sysctl_script()
+
+    drop_in = script.index("LimitNOFILE=1048576")
+    assert drop_in < script.index("systemctl daemon-reload") < script.index("systemctl restart containerd")
+    assert "limits.d" not in script
+
+
+def test_kubeconfig_requests_tokens_from_the_cluster_region(build, mocks):
+    build(make_eks)
+
+    kubeconfig = json.loads(mocks.named("eks-k8s-provider")["kubeconfig"])
+    assert kubeconfig["users"][0]["user"]["exec"]["args"][-2:] == ["--region", "eu-west-1"]
@@ -0,0 +1,89 @@
+import json
+
+from modules.monitoring import Monitoring
+from modules.rds.rds import storage_settings
+from test_rds import make_rds
+
+
+def make_monitoring(**kwargs):
+    return Monitoring(
+        "monitoring",
+        project_name="aidocs-assistant",
+        environment="test",
+        aws_region="eu-west-1",
+        alert_email="alerts@example.com",
+        eks_cluster_name="aidocs-assistant-test",
+        **kwargs
+    )
+
+
+def alarms_by_name(mocks):
+    return {alarm["name"]: alarm for alarm in mocks.of_type("aws:cloudwatch/metricAlarm:MetricAlarm")}
+
+
+def test_eks_alarm_thresholds(build, mocks):
+    build(make_monitoring)
+
+    alarms = alarms_by_name(mocks)
+    expected = {
+        "aidocs-assistant-test-eks-cpu": ("node_cpu_utilization", 80, 5),
+        "aidocs-assistant-test-eks-memory": ("node_memory_utilization", 85, 5),
+        "aidocs-assistant-test-eks-pending-pods": ("pod_status_pending", 0, 5),
+        "aidocs-assistant-test-eks-failed-nodes": ("cluster_failed_node_count", 0, 3)
+    }
+    for alarm_name, (metric_name, threshold, evaluation_periods) in expected.items():
+        alarm = alarms[alarm_name]
+        assert alarm["namespace"] == "ContainerInsights"
+        assert alarm["metricName"] == metric_name
+        assert alarm["threshold"] == threshold
+        assert alarm["period"] == 60
+        assert alarm["evaluationPeriods"] == evaluation_periods
+        assert alarm["dimensions"] == {"ClusterName": "aidocs-assistant-test"}
+
+
+def test_rds_alarms_feed_composite_alarm(build, mocks):
+    build(lambda: make_monitoring(rds=make_rds(instance_class="db.r6g.xlarge", replica_count=1)))
+
+    rds_alarms = {name: alarm for name, alarm in alarms_by_name(mocks).items() if "-rds-" in name}
+    assert {
+        "aidocs-assistant-test-rds-cpu",
+        "aidocs-assistant-test-rds-read-latency",
+        "aidocs-assistant-test-rds-write-latency",
+        "aidocs-assistant-test-rds-connections",
+        "aidocs-assistant-test-rds-replica-lag-0"
+    } <= set(rds_alarms)
+    # Individual alarms stay quiet, only the composite alarm pages
+    assert not any(alarm.get("alarmActions") for alarm in rds_alarms.values())
+
+    connections = rds_alarms["aidocs-assistant-test-rds-connections"]["metricQueries"][0]
+    assert connections["expression"] == "100 * connections / 3604"
+
+    # An absolute floor, since storage autoscaling moves the allocation
+    free_storage = rds_alarms["aidocs-assistant-test-rds-free-storage"]
+    assert free_storage["metricName"] == "FreeStorageSpace"
+    assert free_storage["threshold"] == storage_settings("test")["allocated_storage"] * 1024 ** 3 // 10
+
+    composite = mocks.of_type("aws:cloudwatch/compositeAlarm:CompositeAlarm")[0]
+    assert composite["alarmRule"].count("ALARM(") == len(rds_alarms)
+    assert composite["alarmActions"]
+
+
+def test_bedrock_alarms(build, mocks):
+    build(lambda: make_monitoring(bedrock_models=[
+        {"model_id": "anthropic.claude-v2", "tokens_per_minute_quota": 200000, "p99_latency_threshold_ms": 20000}
+    ]))
+
+    alarms = alarms_by_name(mocks)
+    latency = alarms["aidocs-assistant-test-bedrock-anthropic-claude-v2-p99-latency"]
+    assert latency["extendedStatistic"] == "p99"
+    assert latency["threshold"] == 20000
+    assert latency["period"] == 60
+    assert "aidocs-assistant-test-bedrock-anthropic-claude-v2-tpm-quota" in alarms
+
+
+def test_dashboard_is_valid_json(build, mocks):
+    build(lambda: make_monitoring(bedrock_models=[{"model_id": "anthropic.claude-v2"}]))
+
+    dashboard = json.loads(mocks.of_type("aws:cloudwatch/dashboard:Dashboard")[0]["dashboardBody"])
+    titles = [widget["properties"]["title"] for widget in dashboard["widgets"]]
+    assert "anthropic.claude-v2: Invocation Latency" in titles
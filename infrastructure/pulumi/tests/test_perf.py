@@ -0,0 +1,70 @@
+import json
+
+from modules.perf import Perf
+from test_eks import make_eks
+
+
+def make_perf(**kwargs):
+    return Perf(
+        "perf",
+        project_name="aidocs-assistant",
+        environment="test",
+        eks=make_eks(load_generator_pool={}),
+        target_url="https://api.example.com",
+        release="v1.2.0",
+        **kwargs
+    )
+
+
+def test_load_generator_pool_is_tainted(build, mocks):
+    build(lambda: make_eks(load_generator_pool={"max_size": 8}))
+
+    node_group = mocks.named("eks-node-group-loadgen")
+    assert node_group["taints"] == [{"key": "dedicated", "value": "load-generator", "effect": "NO_SCHEDULE"}]
+    assert node_group["scalingConfig"]["maxSize"] == 8
+    assert not mocks.named("eks-node-group").get("taints")
+
+
+def test_scenario_jobs_run_on_load_generators(build, mocks):
+    build(make_perf)
+
+    jobs = {job["metadata"]["name"]: job["spec"]["template"]["spec"] for job in mocks.of_type("kubernetes:batch/v1:Job")}
+    assert sorted(jobs) == ["k6-chat-v1-2-0", "k6-crud-v1-2-0", "k6-search-v1-2-0"]
+    for spec in jobs.values():
+        assert spec["nodeSelector"] == {"node-pool": "loadgen"}
+        assert spec["tolerations"][0]["key"] == "dedicated"
+        assert spec["tolerations"][0]["effect"] == "NoSchedule"
+        assert spec["initContainers"][0]["image"].startswith("grafana/k6")
+
+    scripts = mocks.named("perf-scripts")["data"]
+    assert {"lib.js", "crud.js", "search.js", "chat.js"} <= set(scripts)
+
+
+def test_failed_thresholds_fail_the_job_after_the_upload(build, mocks):
+    build(make_perf)
+
+    # Failed checks breach the threshold, and the k6 exit code outlives the init container
+    assert 'checks: ["rate>0.99"]' in mocks.named("perf-scripts")["data"]["lib.js"]
+    for job in mocks.of_type("kubernetes:batch/v1:Job"):
+        spec = job["spec"]["template"]["spec"]
+        assert spec["initContainers"][0]["args"][0].endswith("echo $? > /results/exit-code")
+        assert spec["containers"][0]["args"][0].endswith('exit "$(cat /results/exit-code)"')
+
+
+def test_runner_can_only_write_results(build, mocks):
+    build(make_perf)
+
+    statements = json.loads(mocks.named("perf-runner-policy")["policy"])["Statement"]
+    assert statements[0] == {
+        "Effect": "Allow",
+        "Action": ["s3:PutObject"],
+        "Resource": "arn:aws:mock:eu-west-1:123456789012:perf-results-bucket/*"
+    }
+    assert statements[1]["Condition"]["StringEquals"]["cloudwatch:namespace"] == "aidocs-assistant-test/LoadTest"
+
+
+def test_bedrock_mock_is_optional(build, mocks):
+    build(lambda: make_perf(bedrock_mock=False))
+
+    assert mocks.of_type("kubernetes:apps/v1:Deployment") == []
+    assert len(mocks.of_type("aws:cloudwatch/dashboard:Dashboard")) == 1
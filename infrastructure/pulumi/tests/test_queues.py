@@ -0,0 +1,88 @@
+import json
+
+from modules.monitoring import Monitoring
+from modules.queues import Queues
+from test_eks import make_eks
+
+
+def make_queues(**kwargs):
+    return Queues(
+        "queues",
+        project_name="aidocs-assistant",
+        environment="test",
+        eks=make_eks(),
+        **kwargs
+    )
+
+
+def test_queues_have_dead_letter_redrive(build, mocks):
+    build(make_queues)
+
+    queue = mocks.named("queues-summarisation-queue")
+    assert queue["kmsMasterKeyId"] == "arn:aws:mock:eu-west-1:123456789012:queues-kms-key"
+    assert queue["receiveWaitTimeSeconds"] == 20
+    assert json.loads(queue["redrivePolicy"]) == {
+        "deadLetterTargetArn": "arn:aws:mock:eu-west-1:123456789012:queues-summarisation-dlq",
+        "maxReceiveCount": 3
+    }
+
+
+def test_workers_scale_to_zero_on_depth_and_age(build, mocks):
+    build(lambda: make_queues(queue_definitions=[
+        {"name": "summarisation", "deployment": "summarisation-worker", "messages_per_replica": 10, "max_age_seconds": 60}
+    ]))
+
+    scaled_object = mocks.named("queues-summarisation-scaled-object")["spec"]
+    assert scaled_object["scaleTargetRef"] == {"name": "summarisation-worker"}
+    assert scaled_object["minReplicaCount"] == 0
+    triggers = {trigger["type"]: trigger["metadata"] for trigger in scaled_object["triggers"]}
+    assert triggers["aws-sqs-queue"]["queueLength"] == "10"
+    assert triggers["aws-cloudwatch"]["metricName"] == "ApproximateAgeOfOldestMessage"
+    assert triggers["aws-cloudwatch"]["targetMetricValue"] == "60"
+
+
+def test_queues_without_a_deployment_are_not_scaled(build, mocks):
+    build(make_queues)
+
+    # Nothing ships the default workers, so a ScaledObject would point at a missing Deployment
+    assert mocks.of_type("kubernetes:apiextensions.k8s.io:ScaledObject") == []
+    assert mocks.named("queues-summarisation-worker-sa")
+
+
+def test_api_service_account_can_enqueue(build, mocks):
+    build(make_queues)
+
+    role = mocks.named("eks-api-queue-producer-irsa-role")
+    condition = json.loads(role["assumeRolePolicy"])["Statement"][0]["Condition"]["StringEquals"]
+    assert "system:serviceaccount:aidocs-assistant:aidocs-assistant-sa" in condition.values()
+    attachment = mocks.named("eks-api-queue-producer-irsa-policy-0")
+    assert attachment["policyArn"] == "arn:aws:mock:eu-west-1:123456789012:queues-producer-policy"
+
+
+def test_worker_policy_is_scoped_to_its_queue(build, mocks):
+    build(make_queues)
+
+    statements = json.loads(mocks.named("queues-generation-worker-policy")["policy"])["Statement"]
+    assert statements[0]["Resource"] == "arn:aws:mock:eu-west-1:123456789012:queues-generation-queue"
+    assert "sqs:SendMessage" not in statements[0]["Action"]
+
+
+def test_queue_alarms(build, mocks):
+    def construct():
+        return Monitoring(
+            "monitoring",
+            project_name="aidocs-assistant",
+            environment="test",
+            aws_region="eu-west-1",
+            alert_email="alerts@example.com",
+            queues=make_queues()
+        )
+
+    build(construct)
+
+    alarms = {alarm["name"]: alarm for alarm in mocks.of_type("aws:cloudwatch/metricAlarm:MetricAlarm")}
+    assert alarms["aidocs-assistant-test-queue-summarisation-depth"]["threshold"] == 5 * 20
+    assert alarms["aidocs-assistant-test-queue-generation-age"]["threshold"] == 240
+    assert alarms["aidocs-assistant-test-queue-generation-dlq"]["dimensions"] == {
+        "QueueName": "aidocs-assistant-test-generation-dlq"
+    }
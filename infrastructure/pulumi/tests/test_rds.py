@@ -0,0 +1,144 @@
+import pytest
+
+from modules.rds import Rds
+from modules.rds.rds import default_max_connections, postgres_parameters, storage_settings
+
+
+def make_rds(**kwargs):
+    return Rds(
+        "rds",
+        project_name="aidocs-assistant",
+        environment=kwargs.pop("environment", "test"),
+        vpc_id="vpc-test",
+        subnet_ids=["subnet-a", "subnet-b"],
+        allowed_security_groups=["sg-eks"],
+        db_name="aidocs_assistant",
+        db_username="aidocs_admin",
+        db_password="mock-password",
+        **kwargs
+    )
+
+
+def test_memory_parameters_follow_instance_class():
+    parameters = postgres_parameters("db.r6g.xlarge")
+
+    # 32 GiB: a quarter for shared_buffers and three quarters for the cache estimate, in 8 kB pages
+    assert parameters["shared_buffers"] == str(32 * 1024 * 1024 // 4 // 8)
+    assert parameters["effective_cache_size"] == str(32 * 1024 * 1024 * 3 // 4 // 8)
+    assert default_max_connections(32) == 3604
+
+
+def test_parameter_overrides_win():
+    assert postgres_parameters("db.r6g.large", {"random_page_cost": 1.5})["random_page_cost"] == "1.5"
+
+
+def test_prod_storage_is_provisioned():
+    settings = storage_settings("prod")
+
+    assert settings["storage_type"] == "gp3"
+    assert settings["allocated_storage"] >= 400
+    assert settings["iops"] == 12000
+
+
+def test_small_gp3_volumes_drop_iops():
+    assert "iops" not in storage_settings("prod", {"allocated_storage": 100})
+
+
+def test_io_volumes_require_iops():
+    with pytest.raises(ValueError):
+        storage_settings("dev", {"storage_type": "io2"})
+
+
+def test_instance_is_multi_az(build, mocks):
+    rds = build(lambda: make_rds(instance_class="db.r6g.xlarge"))
+
+    instance = mocks.named("rds-instance")
+    assert instance["instanceClass"] == "db.r6g.xlarge"
+    assert instance["multiAz"] is True
+    assert instance["performanceInsightsEnabled"] is True
+    assert instance["monitoringInterval"] == 60
+    assert rds.max_connections == 3604
+
+
+def test_read_replicas(build, mocks):
+    build(lambda: make_rds(
+        instance_class="db.r6g.xlarge",
+        replica_count=2,
+        replica_instance_class="db.r6g.large",
+        replica_availability_zones=["eu-west-1b", "eu-west-1c"]
+    ))
+
+    replicas = [
+        instance for instance in mocks.of_type("aws:rds/instance:Instance")
+        if instance.get("replicateSourceDb")
+    ]
+    assert [replica["instanceClass"] for replica in replicas] == ["db.r6g.large"] * 2
+    assert sorted(replica["availabilityZone"] for replica in replicas) == ["eu-west-1b", "eu-west-1c"]
+
+
+def test_aurora_serverless_capacity(build, mocks):
+    rds = build(lambda: make_rds(engine_mode="aurora-serverless-v2", serverless_min_capacity=2, serverless_max_capacity=32))
+
+    cluster = mocks.of_type("aws:rds/cluster:Cluster")[0]
+    assert cluster["serverlessv2ScalingConfiguration"] == {"minCapacity": 2, "maxCapacity": 32}
+    assert rds.is_aurora
+
+
+def test_cross_region_read_replica(build, mocks):
+    def construct():
+        source = make_rds()
+        return Rds(
+            "rds-us-east-1",
+            project_name="aidocs-assistant",
+            environment="test",
+            vpc_id="vpc-replica",
+            subnet_ids=["subnet-c", "subnet-d"],
+            allowed_security_groups=["sg-eks-replica"],
+            db_name="aidocs_assistant",
+            db_username="aidocs_admin",
+            db_password="mock-password",
+            source_db=source
+        )
+
+    replica = build(construct)
+
+    instance = mocks.named("rds-us-east-1-instance")
+    assert instance["replicateSourceDb"] == "arn:aws:mock:eu-west-1:123456789012:rds-instance"
+    assert "password" not in instance
+    assert instance["backupRetentionPeriod"] == 0
+    assert replica.is_cross_region_replica
+
+
+def test_aurora_secondary_requires_global_database(build):
+    with pytest.raises(ValueError):
+        build(lambda: make_rds(
+            engine_mode="aurora-serverless-v2",
+            source_db=make_rds(environment="source", engine_mode="aurora-serverless-v2")
+        ))
+
+
+def test_security_group_rules_are_standalone(build, mocks):
+    build(lambda: make_rds(enable_proxy=True))
+
+    # Inline rules would fight the standalone proxy rules, so neither group declares any
+    assert "ingress" not in mocks.named("rds-sg")
+    assert "ingress" not in mocks.named("rds-proxy-sg")
+    rules = mocks.of_type("aws:ec2/securityGroupRule:SecurityGroupRule")
+    database_sources = {rule["sourceSecurityGroupId"] for rule in rules if rule["securityGroupId"] == "rds-sg-id"}
+    assert database_sources == {"sg-eks", "rds-proxy-sg-id"}
+
+
+def test_smaller_replicas_get_their_own_parameter_group(build, mocks):
+    build(lambda: make_rds(instance_class="db.r6g.2xlarge", replica_count=1, replica_instance_class="db.r6g.large"))
+
+    parameters = {parameter["name"]: parameter["value"] for parameter in mocks.named("rds-replica-parameter-group")["parameters"]}
+    assert parameters["shared_buffers"] == postgres_parameters("db.r6g.large")["shared_buffers"]
+    assert parameters["max_connections"] == str(default_max_connections(64))
+    assert mocks.named("rds-replica-0")["parameterGroupName"] == "aidocs-assistant-test-postgres-replica"
+
+
+def test_same_class_replicas_share_the_primary_parameter_group(build, mocks):
+    build(lambda: make_rds(instance_class="db.r6g.large", replica_count=1))
+
+    assert mocks.of_type("aws:rds/parameterGroup:ParameterGroup") == [mocks.named("rds-parameter-group")]
+    assert mocks.named("rds-replica-0")["parameterGroupName"] == "aidocs-assistant-test-postgres"
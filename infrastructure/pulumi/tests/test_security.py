@@ -0,0 +1,73 @@
+from modules.security import Security
+
+
+def make_security(**kwargs):
+    return Security(
+        "security",
+        project_name="aidocs-assistant",
+        environment="test",
+        vpc_id="vpc-test",
+        allowed_cidr_blocks=["10.0.0.0/16"],
+        **kwargs
+    )
+
+
+def test_regional_web_acl_rate_limit(build, mocks):
+    build(make_security)
+
+    web_acls = mocks.of_type("aws:wafv2/webAcl:WebAcl")
+    assert [web_acl["scope"] for web_acl in web_acls] == ["REGIONAL"]
+    rate_limit = web_acls[0]["rules"][0]["statement"]["rateBasedStatement"]
+    assert rate_limit == {"limit": 2000, "aggregateKeyType": "IP"}
+
+
+def test_cloudfront_web_acl_mirrors_rules(build, mocks):
+    build(lambda: make_security(enable_cloudfront_waf=True))
+
+    regional = mocks.named("security-waf-acl")
+    cloudfront = mocks.named("security-cloudfront-waf-acl")
+    assert cloudfront["scope"] == "CLOUDFRONT"
+    assert [rule["statement"] for rule in cloudfront["rules"]] == [rule["statement"] for rule in regional["rules"]]
+
+
+def test_bedrock_routes_have_tighter_limits(build, mocks):
+    build(make_security)
+
+    rules = {rule["name"]: rule for rule in mocks.named("security-waf-acl")["rules"]}
+    ai_limit = rules["AiRateLimit"]["statement"]["rateBasedStatement"]
+    assert ai_limit["limit"] == 100
+    assert ai_limit["scopeDownStatement"]["byteMatchStatement"]["searchString"] == "/api/ai/"
+    assert rules["AiRateLimit"]["action"] == {"block": {"customResponse": {"responseCode": 429}}}
+
+    for prefix, rule_name in [("/api/ai/", "AiUserRateLimit"), ("/api/chat/", "ChatUserRateLimit")]:
+        user_limit = rules[rule_name]["statement"]["rateBasedStatement"]
+        assert user_limit["scopeDownStatement"]["byteMatchStatement"]["searchString"] == prefix
+        assert user_limit["aggregateKeyType"] == "CUSTOM_KEYS"
+        assert user_limit["customKeys"][0]["header"]["name"] == "authorization"
+
+    chat_limit = rules["ChatRateLimit"]["statement"]["rateBasedStatement"]
+    assert chat_limit["scopeDownStatement"]["byteMatchStatement"]["searchString"] == "/api/chat/"
+
+
+def test_every_rule_has_its_own_metric(build, mocks):
+    build(make_security)
+
+    rules = mocks.named("security-waf-acl")["rules"]
+    metrics = [rule["visibilityConfig"]["metricName"] for rule in rules]
+    assert len(set(metrics)) == len(rules)
+    assert [rule["priority"] for rule in rules] == list(range(1, len(rules) + 1))
+
+
+def test_managed_rule_groups_toggle_between_count_and_block(build, mocks):
+    build(lambda: make_security(waf_rule_config={
+        "managed_rule_groups": [
+            {"name": "AWSManagedRulesKnownBadInputsRuleSet", "action": "block"},
+            {"name": "AWSManagedRulesCommonRuleSet", "action": "count"}
+        ]
+    }))
+
+    rules = {rule["name"]: rule for rule in mocks.named("security-waf-acl")["rules"]}
+    assert rules["AWSManagedRulesKnownBadInputsRuleSet"]["overrideAction"] == {"none": {}}
+    assert rules["AWSManagedRulesCommonRuleSet"]["overrideAction"] == {"count": {}}
+    assert "AWSManagedRulesAmazonIpReputationList" not in rules
+    assert rules["RateLimit"]["statement"]["rateBasedStatement"]["limit"] == 2000
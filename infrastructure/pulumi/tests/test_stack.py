@@ -0,0 +1,207 @@
+import glob
+import os
+
+import pytest
+import yaml
+
+from program import PROGRAM_DIR, PROJECT, run_program
+
+PRODUCTION_ENVIRONMENTS = {"prod", "production"}
+
+# Burstable families run out of CPU credits under sustained load
+BURSTABLE_PREFIXES = ("t2.", "t3.", "t3a.", "t4g.", "db.t", "cache.t")
+
+PROD_SIZED_CONFIG = {
+    "environment": "prod",
+    "azCount": 3,
+    "eksNodePools": [
+        {"name": "default", "instance_types": ["m6i.xlarge"], "min_size": 3, "desired_size": 3, "max_size": 12}
+    ],
+    "dbInstanceClass": "db.r6g.xlarge",
+    "dbReplicaCount": 1,
+    "cacheNodeType": "cache.r7g.large"
+}
+
+
+def stack_configs():
+    configs = {}
+    for path in sorted(glob.glob(os.path.join(PROGRAM_DIR, "Pulumi.*.yaml"))):
+        with open(path) as stack_file:
+            stack = yaml.safe_load(stack_file) or {}
+        configs[os.path.basename(path)] = {
+            key.split(":", 1)[1] if key.startswith(f"{PROJECT}:") else key: value["value"] if isinstance(value, dict) and "value" in value else value
+            for key, value in (stack.get("config") or {}).items()
+            if not (isinstance(value, dict) and "secure" in value)
+        }
+    return configs
+
+
+def resources_of(graph, resource_type):
+    return [resource["inputs"] for resource in graph["resources"] if resource["type"] == resource_type]
+
+
+# Everything that would quietly size a production stack down
+def production_sizing_violations(graph):
+    violations = []
+    for node_group in resources_of(graph, "aws:eks/nodeGroup:NodeGroup"):
+        burstable = [instance_type for instance_type in node_group["instanceTypes"] if instance_type.startswith(BURSTABLE_PREFIXES)]
+        if burstable and node_group.get("capacityType") != "SPOT":
+            violations.append(f"node group {node_group['nodeGroupNamePrefix']} uses burstable {burstable}")
+    for instance in resources_of(graph, "aws:rds/instance:Instance"):
+        if instance["instanceClass"].startswith(BURSTABLE_PREFIXES):
+            violations.append(f"database {instance['identifier']} uses burstable {instance['instanceClass']}")
+        if not instance.get("replicateSourceDb") and not instance.get("multiAz"):
+            violations.append(f"database {instance['identifier']} is single-AZ")
+    for replication_group in resources_of(graph, "aws:elasticache/replicationGroup:ReplicationGroup"):
+        if replication_group["nodeType"].startswith(BURSTABLE_PREFIXES):
+            violations.append(f"cache {replication_group['replicationGroupId']} uses burstable {replication_group['nodeType']}")
+    zones = {subnet["availabilityZone"] for subnet in resources_of(graph, "aws:ec2/subnet:Subnet")}
+    if len(zones) < 3:
+        violations.append(f"subnets span only {len(zones)} availability zones")
+    if len(resources_of(graph, "aws:ec2/natGateway:NatGateway")) < len(zones):
+        violations.append("private subnets share a NAT gateway across availability zones")
+    return violations
+
+
+@pytest.mark.parametrize("stack_file", sorted(stack_configs()))
+def test_stack_config(stack_file):
+    config = stack_configs()[stack_file]
+    graph = run_program(config)
+
+    assert resources_of(graph, "aws:eks/cluster:Cluster")
+    # Physical names must be unique, or the second create fails on a fresh stack
+    log_group_names = [log_group["name"] for log_group in resources_of(graph, "aws:cloudwatch/logGroup:LogGroup")]
+    assert len(log_group_names) == len(set(log_group_names))
+    zones = {subnet["availabilityZone"] for subnet in resources_of(graph, "aws:ec2/subnet:Subnet")}
+    assert zones <= {f"eu-west-1{suffix}" for suffix in "abc"}
+    if config.get("environment") in PRODUCTION_ENVIRONMENTS:
+        assert production_sizing_violations(graph) == []
+
+
+def test_default_sizing_is_not_production_ready():
+    violations = production_sizing_violations(run_program({"environment": "prod"}))
+
+    assert any("node group" in violation for violation in violations)
+    assert any("database" in violation for violation in violations)
+
+
+def test_production_sizing():
+    graph = run_program(PROD_SIZED_CONFIG)
+
+    assert production_sizing_violations(graph) == []
+    assert len(resources_of(graph, "aws:ec2/natGateway:NatGateway")) == 3
+
+
+def test_resource_count_scales_with_topology():
+    small = run_program({"azCount": 2})
+    large = run_program({
+        "azCount": 3,
+        "eksNodePools": [
+            {"name": "default", "instance_types": ["m6i.large"], "min_size": 2, "max_size": 4},
+            {"name": "batch", "instance_types": ["c6i.large"], "min_size": 0, "max_size": 4}
+        ]
+    })
+
+    # Each AZ adds two subnets, two route table associations, a NAT gateway with its EIP and a private
+    # route table; each node pool adds a launch template and a node group. Nothing else may grow.
+    assert len(large["resources"]) - len(small["resources"]) == 7 + 2
+
+
+def test_multi_region_stack():
+    graph = run_program({
+        "dbEngineMode": "aurora-serverless-v2",
+        "regions": [
+            {"region": "eu-west-1", "ingress_hostname": "ingress.eu-west-1.example.com"},
+            {"region": "us-east-1", "vpc_cidr": "10.1.0.0/16", "ingress_hostname": "ingress.us-east-1.example.com"}
+        ],
+        "dnsZoneId": "Z0EXAMPLE",
+        "apiDomainName": "api.example.com"
+    })
+
+    # The secondary region joins the global database and gets its own copy of every regional component
+    clusters = {
+        resource["name"]: resource["inputs"]
+        for resource in graph["resources"] if resource["type"] == "aws:rds/cluster:Cluster"
+    }
+    assert "globalClusterIdentifier" not in clusters["rds-cluster"]
+    assert clusters["rds-us-east-1-cluster"]["globalClusterIdentifier"] == "rds-global-cluster-id"
+    assert len(resources_of(graph, "aws:eks/cluster:Cluster")) == 2
+
+    records = resources_of(graph, "aws:route53/record:Record")
+    latency_records = [record for record in records if record.get("latencyRoutingPolicies")]
+    assert sorted(record["setIdentifier"] for record in latency_records) == ["eu-west-1", "us-east-1"]
+    assert all(record["healthCheckId"] for record in latency_records)
+
+
+def test_load_targets_size_production():
+    graph = run_program({
+        "environment": "prod",
+        "loadTargets": {"peak_rps": 500, "concurrent_chat_sessions": 2000, "p99_latency_ms": 300}
+    })
+
+    assert production_sizing_violations(graph) == []
+
+
+def test_perf_stack_is_production_sized_and_disposable():
+    graph = run_program({
+        "stackMode": "perf",
+        "perfTargetUrl": "https://perf.example.com",
+        "loadTargets": {"peak_rps": 500, "concurrent_chat_sessions": 2000, "p99_latency_ms": 300}
+    })
+
+    # A dev-named perf stack still gets the production plan, plus a load-generator pool the app cannot land on
+    assert production_sizing_violations(graph) == []
+    node_groups = {node_group["nodeGroupNamePrefix"]: node_group for node_group in resources_of(graph, "aws:eks/nodeGroup:NodeGroup")}
+    assert node_groups["aidocs-assistant-dev-perf-ng-loadgen-"]["taints"][0]["value"] == "load-generator"
+    assert all(instance["skipFinalSnapshot"] for instance in resources_of(graph, "aws:rds/instance:Instance"))
+
+    # It shares the account with the dev stack it copies, so nothing keeps dev's physical names
+    assert all(instance["identifier"].startswith("aidocs-assistant-dev-perf") for instance in resources_of(graph, "aws:rds/instance:Instance"))
+    bucket = next(bucket for bucket in resources_of(graph, "aws:s3/bucketV2:BucketV2") if bucket["bucket"].endswith("-documents"))
+    assert bucket["bucket"] == "aidocs-assistant-dev-perf-documents"
+    assert bucket["forceDestroy"]
+    assert len(resources_of(graph, "kubernetes:batch/v1:Job")) == 3
+
+
+def test_data_stores_admit_the_nodes_security_group():
+    graph = run_program({"dbProxyEnabled": True, "dynamodbEnabled": True, "daxEnabled": True})
+
+    # Nodes carry the security group EKS creates for the cluster, not the control-plane group we add to it
+    sources = {}
+    for rule in resources_of(graph, "aws:ec2/securityGroupRule:SecurityGroupRule"):
+        if rule["type"] == "ingress":
+            sources.setdefault(rule["securityGroupId"], set()).add(rule["sourceSecurityGroupId"])
+    for security_group in ["rds-sg-id", "cache-sg-id", "tables-dax-sg-id", "rds-proxy-sg-id"]:
+        assert "sg-cluster" in sources[security_group]
+
+
+def test_data_stores_do_not_wait_for_the_cluster():
+    graph = run_program({"dbProxyEnabled": True, "dynamodbEnabled": True, "daxEnabled": True})
+
+    # Only the ingress rules need the cluster's security group; the slow creates start alongside the cluster
+    cluster = next(entry["urn"] for entry in graph["graph"] if entry["type"] == "aws:eks/cluster:Cluster")
+    registrations = {entry["urn"]: entry for entry in graph["graph"]}
+
+    def depends_on_cluster(urn, seen=None):
+        seen = seen if seen is not None else set()
+        if urn in seen or urn not in registrations:
+            return False
+        seen.add(urn)
+        return any(dependency == cluster or depends_on_cluster(dependency, seen)
+                   for dependency in registrations[urn]["dependencies"])
+
+    for resource_type in ["aws:rds/instance:Instance", "aws:elasticache/replicationGroup:ReplicationGroup", "aws:dax/cluster:Cluster"]:
+        for entry in graph["graph"]:
+            if entry["type"] == resource_type:
+                assert not depends_on_cluster(entry["urn"]), entry["urn"]
+
+
+def test_karpenter_nodes_wait_for_private_routes():
+    graph = run_program({"eksKarpenterEnabled": True})
+
+    # Like the node groups, Karpenter launches into the private subnets only once they route through NAT
+    node_class = next(entry for entry in graph["graph"] if entry["type"].endswith(":EC2NodeClass"))
+    associations = [entry["urn"] for entry in graph["graph"] if entry["type"] == "aws:ec2/routeTableAssociation:RouteTableAssociation"
+                    and "private" in entry["urn"]]
+    assert associations
+    assert set(associations) <= set(node_class["dependencies"])
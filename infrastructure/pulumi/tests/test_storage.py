@@ -0,0 +1,44 @@
+import json
+
+from modules.storage import Storage
+
+
+def make_storage(**kwargs):
+    return Storage(
+        "storage",
+        project_name="aidocs-assistant",
+        environment="test",
+        **kwargs
+    )
+
+
+def test_bucket_keys_and_lifecycle(build, mocks):
+    build(make_storage)
+
+    rule = mocks.named("storage-documents-encryption")["rules"][0]
+    assert rule["bucketKeyEnabled"] is True
+    assert rule["applyServerSideEncryptionByDefault"]["sseAlgorithm"] == "aws:kms"
+
+    rules = {rule["id"]: rule for rule in mocks.named("storage-documents-lifecycle")["rules"]}
+    assert rules["abort-incomplete-multipart-uploads"]["abortIncompleteMultipartUpload"] == {"daysAfterInitiation": 1}
+    assert rules["intelligent-tiering"]["transitions"] == [{"days": 30, "storageClass": "INTELLIGENT_TIERING"}]
+    assert mocks.of_type("aws:s3/bucketAccelerateConfigurationV2:BucketAccelerateConfigurationV2") == []
+
+
+def test_direct_accelerated_uploads(build, mocks):
+    storage = build(lambda: make_storage(transfer_acceleration=True, cors_allowed_origins=["https://app.example.com"]))
+
+    assert mocks.named("storage-documents-acceleration")["status"] == "Enabled"
+    cors_rule = mocks.named("storage-documents-cors")["corsRules"][0]
+    assert "PUT" in cors_rule["allowedMethods"]
+    assert cors_rule["exposeHeaders"] == ["ETag"]
+    assert storage.transfer_acceleration
+
+
+def test_uploads_are_published_to_eventbridge(build, mocks):
+    build(make_storage)
+
+    assert mocks.named("storage-documents-notifications")["eventbridge"] is True
+    pattern = json.loads(mocks.named("storage-document-uploaded")["eventPattern"])
+    assert pattern["detail-type"] == ["Object Created"]
+    assert pattern["detail"]["bucket"]["name"] == ["aidocs-assistant-test-documents"]
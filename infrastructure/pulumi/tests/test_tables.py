@@ -0,0 +1,54 @@
+import pytest
+
+from modules.tables import Tables
+
+
+def make_tables(**kwargs):
+    return Tables(
+        "tables",
+        project_name="aidocs-assistant",
+        environment="test",
+        **kwargs
+    )
+
+
+def test_listing_indexes_replace_scans(build, mocks):
+    tables = build(make_tables)
+
+    resources = mocks.named("tables-resources")
+    assert resources["billingMode"] == "PAY_PER_REQUEST"
+    assert resources["pointInTimeRecovery"] == {"enabled": True}
+    indexes = {index["name"]: index for index in resources["globalSecondaryIndexes"]}
+    assert indexes["TypeIndex"]["hashKey"] == "type"
+    assert indexes["TypeIndex"]["rangeKey"] == "createdAt"
+    assert mocks.named("tables-resource-tags")["hashKey"] == "tag"
+    assert "CollectionIndex" in tables.index_names["resources"]
+
+
+def test_provisioned_tables_autoscale_indexes(build, mocks):
+    build(lambda: make_tables(billing_mode="PROVISIONED", capacity={"max_read": 500}))
+
+    targets = {target["resourceId"]: target for target in mocks.of_type("aws:appautoscaling/target:Target")
+               if target["scalableDimension"].endswith("ReadCapacityUnits")}
+    assert targets["table/aidocs-assistant-test-resources/index/TypeIndex"]["maxCapacity"] == 500
+    assert targets["table/aidocs-assistant-test-resources"]["scalableDimension"] == "dynamodb:table:ReadCapacityUnits"
+
+
+def test_dax_runs_in_private_subnets(build, mocks):
+    tables = build(lambda: make_tables(
+        dax_enabled=True,
+        vpc_id="vpc-test",
+        subnet_ids=["subnet-a", "subnet-b"],
+        allowed_security_groups=["sg-eks"]
+    ))
+
+    assert mocks.named("tables-dax-subnet-group")["subnetIds"] == ["subnet-a", "subnet-b"]
+    cluster = mocks.named("tables-dax")
+    assert cluster["clusterEndpointEncryptionType"] == "TLS"
+    assert len(cluster["clusterName"]) <= 20
+    assert tables.dax_cluster is not None
+
+
+def test_dax_needs_a_vpc():
+    with pytest.raises(ValueError):
+        make_tables(dax_enabled=True)
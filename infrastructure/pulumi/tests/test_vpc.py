@@ -0,0 +1,68 @@
+import ipaddress
+
+import pytest
+
+from modules.vpc import Vpc
+from modules.vpc.vpc import carve_subnets
+
+
+def make_vpc(**kwargs):
+    return Vpc("vpc", project_name="aidocs-assistant", environment="test", vpc_cidr="10.0.0.0/16", **kwargs)
+
+
+def test_carve_subnets_are_aligned_and_disjoint():
+    cidrs = carve_subnets("10.0.0.0/16", [19, 19, 19, 24, 24, 24])
+    networks = [ipaddress.ip_network(cidr) for cidr in cidrs]
+
+    assert [network.prefixlen for network in networks] == [19, 19, 19, 24, 24, 24]
+    for i, network in enumerate(networks):
+        assert network.subnet_of(ipaddress.ip_network("10.0.0.0/16"))
+        assert not any(network.overlaps(other) for other in networks[i + 1:])
+
+
+def test_carve_subnets_rejects_small_vpc():
+    with pytest.raises(ValueError):
+        carve_subnets("10.0.0.0/20", [19, 19])
+
+
+def test_subnets_use_provider_region_zones(build, mocks):
+    vpc = build(lambda: make_vpc(az_count=3))
+
+    assert vpc.availability_zones == ["eu-west-1a", "eu-west-1b", "eu-west-1c"]
+    subnets = mocks.of_type("aws:ec2/subnet:Subnet")
+    assert sorted(subnet["availabilityZone"] for subnet in subnets) == sorted(vpc.availability_zones * 2)
+
+
+def test_nat_gateway_per_az(build, mocks):
+    build(lambda: make_vpc(az_count=3))
+
+    assert len(mocks.of_type("aws:ec2/natGateway:NatGateway")) == 3
+    nat_ids = [mocks.named(f"vpc-private-rt-{i}")["routes"][0]["natGatewayId"] for i in range(3)]
+    assert nat_ids == [f"vpc-nat-gateway-{i}-id" for i in range(3)]
+
+
+def test_single_nat_gateway_is_shared(build, mocks):
+    build(lambda: make_vpc(az_count=3, single_nat_gateway=True))
+
+    assert len(mocks.of_type("aws:ec2/natGateway:NatGateway")) == 1
+    assert len(mocks.of_type("aws:ec2/routeTable:RouteTable")) == 4
+
+
+def test_more_zones_than_available_fails(build):
+    with pytest.raises(ValueError):
+        build(lambda: make_vpc(az_count=4))
+
+
+def test_pinned_subnet_cidrs_are_kept(build, mocks):
+    vpc = build(lambda: make_vpc(subnet_cidrs={
+        "public": ["10.0.0.0/24", "10.0.1.0/24"],
+        "private": ["10.0.2.0/24", "10.0.3.0/24"]
+    }))
+
+    assert mocks.named("vpc-private-subnet-1")["cidrBlock"] == "10.0.3.0/24"
+    assert vpc.public_subnet_cidrs == ["10.0.0.0/24", "10.0.1.0/24"]
+
+
+def test_pinned_subnets_must_cover_every_zone(build):
+    with pytest.raises(ValueError):
+        build(lambda: make_vpc(az_count=3, subnet_cidrs={"public": ["10.0.0.0/24"], "private": ["10.0.2.0/24"]}))
@@ -0,0 +1,199 @@
+"""Report the deployment critical path of the stack: the dependency chain that bounds `pulumi up` wall-clock time.
+
+The resource graph comes either from a stack checkpoint or from constructing the program against the offline mocks:
+
+    python tools/critical_path.py                              # offline, default dev config
+    python tools/critical_path.py --config '{"azCount": 3}'    # offline, with stack config overrides
+    pulumi stack export | python tools/critical_path.py --state -
+
+The engine creates a resource as soon as everything it depends on (inputs, depends_on, its provider) exists,
+so with unbounded --parallel the deploy takes as long as the slowest chain of create times.
+"""
+import argparse
+import json
+import os
+import sys
+
+# Typical create times in seconds; everything else is assumed to be a quick API call
+CREATE_SECONDS = {
+    "aws:eks/cluster:Cluster": 600,
+    "aws:eks/nodeGroup:NodeGroup": 240,
+    "aws:eks/addon:Addon": 90,
+    "aws:ec2/natGateway:NatGateway": 120,
+    "aws:ec2/vpcEndpoint:VpcEndpoint": 90,
+    "aws:rds/instance:Instance": 600,
+    "aws:rds/cluster:Cluster": 180,
+    "aws:rds/clusterInstance:ClusterInstance": 480,
+    "aws:rds/proxy:Proxy": 300,
+    "aws:rds/proxyTarget:ProxyTarget": 120,
+    "aws:elasticache/replicationGroup:ReplicationGroup": 720,
+    "aws:cloudfront/distribution:Distribution": 300,
+    "aws:dynamodb/table:Table": 30,
+    "aws:dax/cluster:Cluster": 600,
+    "kubernetes:helm.sh/v3:Release": 120,
+}
+DEFAULT_CREATE_SECONDS = 5
+
+
+def load_state(path):
+    with (sys.stdin if path == "-" else open(path)) as state_file:
+        state = json.load(state_file)
+    graph = []
+    for resource in state.get("deployment", state).get("resources", []):
+        dependencies = set(resource.get("dependencies", []))
+        for urns in (resource.get("propertyDependencies") or {}).values():
+            dependencies.update(urns)
+        # Provider references are "<urn>::<id>"
+        if resource.get("provider"):
+            dependencies.add(resource["provider"].rsplit("::", 1)[0])
+        graph.append({
+            "urn": resource["urn"],
+            "type": resource["type"],
+            "custom": resource.get("custom", False),
+            "parent": resource.get("parent"),
+            "dependencies": sorted(dependencies)
+        })
+    return graph
+
+
+def load_program(config):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+    from program import run_program
+    return run_program(config)["graph"]
+
+
+def create_seconds(resource, durations):
+    if not resource["custom"] or resource["type"].startswith("pulumi:providers:"):
+        return 0
+    return durations.get(resource["type"], DEFAULT_CREATE_SECONDS)
+
+
+def schedule(graph, durations):
+    resources = {resource["urn"]: resource for resource in graph}
+    order = []
+    visited = set()
+
+    def visit(urn):
+        if urn in visited or urn not in resources:
+            return
+        visited.add(urn)
+        for dependency in resources[urn]["dependencies"]:
+            visit(dependency)
+        order.append(urn)
+
+    for urn in resources:
+        visit(urn)
+
+    # Forward pass: earliest start and finish, remembering which dependency gated the start
+    timing = {}
+    for urn in order:
+        resource = resources[urn]
+        gates = [dependency for dependency in resource["dependencies"] if dependency in timing]
+        gate = max(gates, key=lambda dependency: timing[dependency]["finish"], default=None)
+        start = timing[gate]["finish"] if gate else 0
+        timing[urn] = {
+            "start": start,
+            "finish": start + create_seconds(resource, durations),
+            "gate": gate
+        }
+
+    # Backward pass: how late each resource could finish without delaying the deploy
+    total = max((entry["finish"] for entry in timing.values()), default=0)
+    latest = {urn: total for urn in timing}
+    for urn in reversed(order):
+        for dependency in resources[urn]["dependencies"]:
+            if dependency in latest:
+                latest_start = latest[urn] - create_seconds(resources[urn], durations)
+                latest[dependency] = min(latest[dependency], latest_start)
+    for urn, entry in timing.items():
+        entry["slack"] = latest[urn] - entry["finish"]
+
+    return resources, timing, total
+
+
+def critical_path(timing, total):
+    urn = next((urn for urn, entry in timing.items() if entry["finish"] == total), None)
+    path = []
+    while urn:
+        path.append(urn)
+        urn = timing[urn]["gate"]
+    return list(reversed(path))
+
+
+def describe(urn):
+    qualified_type, name = urn.rsplit("::", 2)[-2:]
+    return f"{qualified_type.split('$')[-1]} {name}"
+
+
+def report(graph, durations, slow_threshold):
+    resources, timing, total = schedule(graph, durations)
+    path = critical_path(timing, total)
+    serial = sum(create_seconds(resource, durations) for resource in resources.values())
+
+    return {
+        "critical_path_seconds": total,
+        "serial_seconds": serial,
+        "parallel_speedup": round(serial / total, 2) if total else 1.0,
+        "critical_path": [
+            {
+                "resource": describe(urn),
+                "start": timing[urn]["start"],
+                "finish": timing[urn]["finish"]
+            }
+            for urn in path if create_seconds(resources[urn], durations)
+        ],
+        "parallel_slow_resources": sorted(
+            [
+                {
+                    "resource": describe(urn),
+                    "start": entry["start"],
+                    "finish": entry["finish"],
+                    "slack": entry["slack"]
+                }
+                for urn, entry in timing.items()
+                if urn not in path and create_seconds(resources[urn], durations) >= slow_threshold
+            ],
+            key=lambda entry: entry["slack"]
+        )
+    }
+
+
+def print_report(result):
+    print(
+        f"Critical path: {result['critical_path_seconds']}s ({result['critical_path_seconds'] / 60:.1f} min) "
+        f"of {result['serial_seconds']}s serial work, {result['parallel_speedup']}x from parallelism"
+    )
+    print()
+    print(f"{'start':>7} {'finish':>7}  critical path (serialised)")
+    for step in result["critical_path"]:
+        print(f"{step['start']:>7} {step['finish']:>7}  {step['resource']}")
+    print()
+    print(f"{'start':>7} {'finish':>7} {'slack':>7}  slow resources running in parallel")
+    for step in result["parallel_slow_resources"]:
+        print(f"{step['start']:>7} {step['finish']:>7} {step['slack']:>7}  {step['resource']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--state", help="Stack checkpoint from `pulumi stack export`, or - for stdin")
+    parser.add_argument("--config", default="{}", help="Stack config overrides (JSON) for the offline graph")
+    parser.add_argument("--durations", help="JSON file of create seconds by resource type, merged over the defaults")
+    parser.add_argument("--slow-threshold", type=int, default=60, help="Report parallel resources slower than this")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    durations = dict(CREATE_SECONDS)
+    if args.durations:
+        with open(args.durations) as durations_file:
+            durations.update(json.load(durations_file))
+
+    graph = load_state(args.state) if args.state else load_program(json.loads(args.config))
+    result = report(graph, durations, args.slow_threshold)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()